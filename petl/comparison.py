@@ -1,7 +1,9 @@
 from __future__ import absolute_import, print_function, division
 
 
+import numbers
 import operator
+from decimal import Decimal
 from functools import partial
 
 from petl.compat import text_type, binary_type, numeric_types
@@ -116,6 +118,23 @@ def comparable_itemgetter(*args):
     return g
 
 
+# types whose values compare natively in the same order as when wrapped in
+# Comparable, given that all values of a field are of one such type
+_native_types = (numbers.Real, Decimal, text_type, binary_type)
+
+
+def _typed_itemgetter(types, *args):
+    # like comparable_itemgetter(), but if the types of the selected fields
+    # are known (see petl.util.base.fieldtypes()) and compare natively,
+    # return a plain itemgetter, avoiding wrapping every key in Comparable
+    if types is not None and all(
+            i < len(types) and types[i] is not None
+            and issubclass(types[i], _native_types)
+            for i in args):
+        return operator.itemgetter(*args)
+    return comparable_itemgetter(*args)
+
+
 def _itemgetter_with_default(*args):
     """ itemgetter compatible with `operator.itemgetter` behavior, filling missing
     values with default instead of raising IndexError or KeyError """
@@ -32,6 +32,7 @@ if PY2:
     except ImportError:
         import pickle
     maxint = sys.maxint
+    import Queue as queue
     long = long
     xrange = xrange
     reduce = reduce
@@ -56,6 +57,7 @@ else:
     from urllib.request import urlopen
     from io import StringIO, BytesIO
     import pickle
+    import queue
     maxint = sys.maxsize
 
 try:
@@ -45,3 +45,5 @@ from petl.io.remotes import RemoteSource
 from petl.io.remotes import SMBSource
 
 from petl.io.gsheet import fromgsheet, togsheet, appendgsheet
+
+from petl.io.fanout import fanout
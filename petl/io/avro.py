@@ -239,6 +239,19 @@ def appendavro(table, target, schema=None, sample=9, **avro_args):
 # region Implementation
 
 
+# python types of values read from fields of primitive avro types, see
+# fieldtypes(); nullable (union) and logical types are not declared
+_PRIMITIVE_TYPES = {
+    'int': int,
+    'long': int,
+    'float': float,
+    'double': float,
+    'boolean': bool,
+    'string': text_type,
+    'bytes': bytes,
+}
+
+
 class AvroView(Table):
     '''Read rows from avro file with their types and logical types'''
 
@@ -253,6 +266,17 @@ class AvroView(Table):
         '''gets the schema stored in avro file header'''
         return self.avro_schema
 
+    def _fieldtypes(self):
+        if self.avro_args.get('reader_schema') is not None:
+            return None  # values are resolved against another schema
+        with self.source.open('rb') as source_file:
+            schema = self._open_reader(source_file).writer_schema
+        if schema is None:
+            return None
+        return [_PRIMITIVE_TYPES.get(col['type'])
+                if isinstance(col['type'], string_types) else None
+                for col in schema['fields']]
+
     def __iter__(self):
         with self.source.open('rb') as source_file:
             avro_reader = self._open_reader(source_file)
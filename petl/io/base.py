@@ -6,7 +6,7 @@ import locale
 import codecs
 from petl.compat import izip_longest
 
-from petl.util.base import Table
+from petl.util.base import Table, asindices, rowgetter
 
 
 def getcodec(encoding):
@@ -16,6 +16,26 @@ def getcodec(encoding):
     return codec
 
 
+def _iterprojection(rows, fields, complement=False):
+    # yield only the values of the given fields, or of all but the given
+    # fields if complement is true, padding short rows with None
+    it = iter(rows)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        return
+    indices = asindices(hdr, fields)
+    if complement:
+        indices = [i for i in range(len(hdr)) if i not in indices]
+    getter = rowgetter(*indices)
+    yield getter(hdr)
+    for row in it:
+        try:
+            yield getter(row)
+        except IndexError:
+            yield tuple(row[i] if i < len(row) else None for i in indices)
+
+
 def fromcolumns(cols, header=None, missing=None):
     """View a sequence of columns as a table, e.g.::
 
@@ -9,7 +9,7 @@ import cStringIO
 
 # internal dependencies
 from petl.util.base import Table, data
-from petl.io.base import getcodec
+from petl.io.base import getcodec, _iterprojection
 
 
 def fromcsv_impl(source, **kwargs):
@@ -25,7 +25,17 @@ class CSVView(Table):
         self.csvargs = csvargs
         self.header = header
 
+    # set by petl.transform.plan.optimize to a pair of field names and a
+    # complement flag, restricting the fields read from the file
+    projection = None
+
     def __iter__(self):
+        rows = self._iterrows()
+        if self.projection is None:
+            return rows
+        return _iterprojection(rows, *self.projection)
+
+    def _iterrows(self):
         if self.header is not None:
             yield tuple(self.header)
 
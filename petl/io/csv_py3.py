@@ -2,9 +2,11 @@
 import io
 import csv
 import logging
+from itertools import islice
 
 
-from petl.util.base import Table, data
+from petl.util.base import Table, iterbatches, _batched, _itertuples
+from petl.io.base import _iterprojection
 
 
 logger = logging.getLogger(__name__)
@@ -19,6 +21,8 @@ def fromcsv_impl(source, **kwargs):
 
 class CSVView(Table):
 
+    _tuplerows = True
+
     def __init__(self, source, encoding, errors, header, **csvargs):
         self.source = source
         self.encoding = encoding
@@ -26,7 +30,43 @@ class CSVView(Table):
         self.csvargs = csvargs
         self.header = header
 
+    # set by petl.transform.plan.optimize to a pair of field names and a
+    # complement flag, restricting the fields read from the file
+    projection = None
+
     def __iter__(self):
+        rows = self._iterrows()
+        if self.projection is None:
+            return rows
+        return _iterprojection(rows, *self.projection)
+
+    def _iterbatches(self, size):
+        if self.projection is not None:
+            return _batched(iter(self), size)
+        return self._iterrowbatches(size)
+
+    def _iterrowbatches(self, size):
+        with self.source.open('rb') as buf:
+            csvfile = io.TextIOWrapper(buf, encoding=self.encoding,
+                                       errors=self.errors, newline='')
+            try:
+                reader = csv.reader(csvfile, **self.csvargs)
+                if self.header is not None:
+                    yield tuple(self.header)
+                else:
+                    try:
+                        yield tuple(next(reader))
+                    except StopIteration:
+                        return
+                while True:
+                    batch = list(map(tuple, islice(reader, size)))
+                    if not batch:
+                        return
+                    yield batch
+            finally:
+                csvfile.detach()
+
+    def _iterrows(self):
         if self.header is not None:
             yield tuple(self.header)
         with self.source.open('rb') as buf:
@@ -49,15 +89,19 @@ def appendcsv_impl(table, source, **kwargs):
 
 
 def _writecsv(table, source, mode, write_header, encoding, errors, **csvargs):
-    rows = table if write_header else data(table)
+    it = iterbatches(table)
     with source.open(mode) as buf:
         # wrap buffer for text IO
         csvfile = io.TextIOWrapper(buf, encoding=encoding, errors=errors,
                                    newline='')
         try:
             writer = csv.writer(csvfile, **csvargs)
-            for row in rows:
-                writer.writerow(row)
+            for hdr in it:
+                if write_header:
+                    writer.writerow(hdr)
+                break
+            for batch in it:
+                writer.writerows(batch)
             csvfile.flush()
         finally:
             csvfile.detach()
@@ -69,6 +113,8 @@ def teecsv_impl(table, source, **kwargs):
 
 class TeeCSVView(Table):
 
+    _tuplerows = True
+
     def __init__(self, table, source=None, encoding=None,
                  errors='strict', write_header=True, **csvargs):
         self.table = table
@@ -85,17 +131,17 @@ class TeeCSVView(Table):
                                        errors=self.errors, newline='')
             try:
                 writer = csv.writer(csvfile, **self.csvargs)
-                it = iter(self.table)
+                it = _itertuples(self.table)
                 try:
                     hdr = next(it)
                 except StopIteration:
                     return
                 if self.write_header:
                     writer.writerow(hdr)
-                yield tuple(hdr)
+                yield hdr
                 for row in it:
                     writer.writerow(row)
-                    yield tuple(row)
+                    yield row
                 csvfile.flush()
             finally:
                 csvfile.detach()
@@ -9,7 +9,7 @@ from petl.compat import next, text_type, string_types
 
 # internal dependencies
 from petl.errors import ArgumentError
-from petl.util.base import Table
+from petl.util.base import Table, iterbatches
 from petl.io.db_utils import _is_dbapi_connection, _is_dbapi_cursor, \
     _is_sqlalchemy_connection, _is_sqlalchemy_engine, _is_sqlalchemy_session, \
     _is_clikchouse_dbapi_connection, _quote, _placeholders
@@ -308,34 +308,13 @@ def todb(table, dbo, tablename, schema=None, commit=True,
     .. note::
 
         This function is in principle compatible with any DB-API 2.0
-        compliant database driver. However, at the time of writing some DB-API
-        2.0 implementations, including cx_Oracle and MySQL's
-        Connector/Python, are not compatible with this function, because they
-        only accept a list argument to the cursor.executemany() function
-        called internally by :mod:`petl`. This can be worked around by
-        proxying the cursor objects, e.g.::
-
-            >>> import cx_Oracle
-            >>> connection = cx_Oracle.Connection(...)
-            >>> class CursorProxy(object):
-            ...     def __init__(self, cursor):
-            ...         self._cursor = cursor
-            ...     def executemany(self, statement, parameters, **kwargs):
-            ...         # convert parameters to a list
-            ...         parameters = list(parameters)
-            ...         # pass through to proxied cursor
-            ...         return self._cursor.executemany(statement, parameters, **kwargs)
-            ...     def __getattr__(self, item):
-            ...         return getattr(self._cursor, item)
-            ...
-            >>> def get_cursor():
-            ...     return CursorProxy(connection.cursor())
-            ...
-            >>> import petl as etl
-            >>> etl.todb(tbl, get_cursor, ...)
-
-        Note however that this does imply loading the entire table into
-        memory as a list prior to inserting into the database.
+        compliant database driver. Rows are inserted by calling
+        cursor.executemany() once for each batch of rows (see
+        :func:`petl.util.base.iterbatches`), with the batch given as a list,
+        so drivers which only accept a list argument (e.g., cx_Oracle and
+        MySQL's Connector/Python) are supported without loading the entire
+        table into memory. The number of rows per batch is given by
+        `petl.config.batchsize`.
 
     """
 
@@ -432,7 +411,7 @@ def _todb_dbapi_connection(table, connection, tablename, schema=None,
     debug('tablename: %r', tablename)
 
     # sanitise field names
-    it = iter(table)
+    it = iterbatches(table)
     hdr = next(it)
     flds = list(map(text_type, hdr))
     colnames = [_quote(n) for n in flds]
@@ -458,7 +437,8 @@ def _todb_dbapi_connection(table, connection, tablename, schema=None,
     insertcolnames = ', '.join(colnames)
     insertquery = SQL_INSERT_QUERY % (tablename, insertcolnames, placeholders)
     debug('insert data via query %r' % insertquery)
-    cursor.executemany(insertquery, it)
+    for batch in it:
+        cursor.executemany(insertquery, batch)
 
     # finish up
     debug('close the cursor')
@@ -479,7 +459,7 @@ def _todb_clikchouse_dbapi_connection(table, connection, tablename, schema=None,
     debug('tablename: %r', tablename)
 
     # sanitise field names
-    it = iter(table)
+    it = iterbatches(table)
     hdr = next(it)
     flds = list(map(text_type, hdr))
     colnames = [_quote(n) for n in flds]
@@ -505,7 +485,8 @@ def _todb_clikchouse_dbapi_connection(table, connection, tablename, schema=None,
     insertcolnames = ', '.join(colnames)
     insertquery = 'INSERT INTO %s (%s) VALUES' % (tablename, insertcolnames)
     debug('insert data via query %r' % insertquery)
-    cursor.executemany(insertquery, it)
+    for batch in it:
+        cursor.executemany(insertquery, batch)
 
     # finish up
     debug('close the cursor')
@@ -526,7 +507,7 @@ def _todb_dbapi_mkcurs(table, mkcurs, tablename, schema=None, commit=True,
     debug('tablename: %r', tablename)
 
     # sanitise field names
-    it = iter(table)
+    it = iterbatches(table)
     hdr = next(it)
     flds = list(map(text_type, hdr))
     colnames = [_quote(n) for n in flds]
@@ -556,7 +537,8 @@ def _todb_dbapi_mkcurs(table, mkcurs, tablename, schema=None, commit=True,
     insertcolnames = ', '.join(colnames)
     insertquery = SQL_INSERT_QUERY % (tablename, insertcolnames, placeholders)
     debug('insert data via query %r' % insertquery)
-    cursor.executemany(insertquery, it)
+    for batch in it:
+        cursor.executemany(insertquery, batch)
     cursor.close()
 
     if commit:
@@ -574,7 +556,7 @@ def _todb_dbapi_cursor(table, cursor, tablename, schema=None, commit=True,
     debug('tablename: %r', tablename)
 
     # sanitise field names
-    it = iter(table)
+    it = iterbatches(table)
     hdr = next(it)
     flds = list(map(text_type, hdr))
     colnames = [_quote(n) for n in flds]
@@ -600,7 +582,8 @@ def _todb_dbapi_cursor(table, cursor, tablename, schema=None, commit=True,
     insertcolnames = ', '.join(colnames)
     insertquery = SQL_INSERT_QUERY % (tablename, insertcolnames, placeholders)
     debug('insert data via query %r' % insertquery)
-    cursor.executemany(insertquery, it)
+    for batch in it:
+        cursor.executemany(insertquery, batch)
 
     # N.B., don't close the cursor, leave that to the application
 
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, division
+
+
+import threading
+from petl.compat import next, queue
+
+
+from petl.errors import ArgumentError
+from petl.util.base import Table, iterbatches, _sourcetypes
+
+
+def fanout(table, *consumers, **kwargs):
+    """
+    Iterate over a table once, feeding its rows to several consumers at the
+    same time. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar'],
+        ...           ['a', 1],
+        ...           ['b', 2],
+        ...           ['c', 2]]
+        >>> table2 = etl.convert(table1, 'bar', lambda v: v * 10)
+        >>> n, _, total = etl.fanout(
+        ...     table2,
+        ...     etl.nrows,
+        ...     lambda t: etl.tocsv(t, 'example.csv'),
+        ...     lambda t: sum(etl.values(t, 'bar'))
+        ... )
+        >>> n
+        3
+        >>> total
+        50
+        >>> print(open('example.csv').read())
+        foo,bar
+        a,10
+        b,20
+        c,20
+        <BLANKLINE>
+
+    Each consumer is a function accepting a table, e.g., one of the
+    "to..." functions or a function computing statistics. Consumers are run
+    on separate threads and all read the rows of `table` as it is iterated,
+    so an expensive pipeline is only evaluated once. The values returned by
+    the consumers are returned as a tuple.
+
+    Rows are passed to the consumers in batches of `batchsize` rows
+    (`petl.config.batchsize` by default, see
+    :func:`petl.util.base.iterbatches`), and at most `queuesize` batches are
+    held for each consumer. A consumer falling behind only holds up the
+    others once its queue is full; set `queuesize=None` to never hold up the
+    other consumers, at the expense of memory. A consumer may stop reading
+    before the end of the table.
+
+    The table given to each consumer can only be iterated once, although its
+    header is available up front. If a consumer fails, or reading `table`
+    fails, the remaining consumers are stopped and the error is raised.
+
+    """
+
+    batchsize = kwargs.get('batchsize', None)
+    queuesize = kwargs.get('queuesize', 2)
+    it = iterbatches(table, batchsize)
+    try:
+        hdr = tuple(next(it))
+    except StopIteration:
+        hdr = None
+    types = _sourcetypes(table)
+    feeds = [_FeedView(hdr, types, queuesize or 0) for _ in consumers]
+    threads = [threading.Thread(target=feed._consume, args=(consumer,))
+               for feed, consumer in zip(feeds, consumers)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    end = _END
+    try:
+        for batch in it:
+            for feed in feeds:
+                feed._put(batch)
+            if any(feed.error is not None for feed in feeds):
+                end = _ABORT
+                break
+    except BaseException:
+        end = _ABORT
+        raise
+    finally:
+        for feed in feeds:
+            feed._put(end, force=True)
+        for thread in threads:
+            thread.join()
+
+    for feed in feeds:
+        if feed.error is not None:
+            raise feed.error
+    return tuple(feed.result for feed in feeds)
+
+
+Table.fanout = fanout
+
+
+# markers put on a queue after the last batch, when the table is complete or
+# when the consumer should stop because of an error elsewhere
+_END = object()
+_ABORT = object()
+
+
+class _Aborted(Exception):
+    pass
+
+
+class _FeedView(Table):
+
+    _oneshot = True
+
+    def __init__(self, hdr, types, queuesize):
+        self.hdr = hdr
+        self.types = types
+        self.queue = queue.Queue(queuesize)
+        self.iterated = False
+        self.finished = False  # consumer has returned
+        self.closed = False  # end marker taken from the queue
+        self.result = None
+        self.error = None
+
+    def _staticheader(self):
+        return self.hdr
+
+    def _fieldtypes(self):
+        return self.types
+
+    def __iter__(self):
+        if self.iterated:
+            raise ArgumentError('the rows of a fanout can only be iterated '
+                                'once')
+        self.iterated = True
+        return self._iterrows()
+
+    def _iterrows(self):
+        if self.hdr is None:
+            self._get()  # wait for the end marker
+            return
+        yield self.hdr
+        while True:
+            batch = self._get()
+            if batch is _END:
+                return
+            for row in batch:
+                yield row
+
+    def _get(self):
+        batch = self.queue.get()
+        if batch is _END or batch is _ABORT:
+            self.closed = True
+        if batch is _ABORT:
+            raise _Aborted()
+        return batch
+
+    def _put(self, batch, force=False):
+        # nothing more is needed by a consumer which has returned, but end
+        # markers are always put so it can stop draining the queue
+        if force or not self.finished:
+            self.queue.put(batch)
+
+    def _consume(self, consumer):
+        try:
+            self.result = consumer(self)
+        except _Aborted:
+            pass  # stopped because of an error raised elsewhere
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.finished = True
+            # keep taking batches from the queue, so a consumer which has
+            # returned early never holds up the others
+            while not self.closed:
+                try:
+                    self._get()
+                except _Aborted:
+                    pass
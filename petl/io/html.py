@@ -10,7 +10,7 @@ from petl.compat import text_type, numeric_types, next, PY2, izip_longest, \
 
 # internal dependencies
 from petl.errors import ArgumentError
-from petl.util.base import Table, Record
+from petl.util.base import Table, _recordclass
 from petl.io.base import getcodec
 from petl.io.sources import write_source_from_arg
 
@@ -85,7 +85,8 @@ def tohtml(table, source=None, encoding=None, errors='strict', caption=None,
             # write body
             if tr_style and callable(tr_style):
                 # wrap as records
-                it = (Record(row, hdr) for row in it)
+                record = _recordclass(hdr)
+                it = (record(row) for row in it)
             for row in it:
                 _write_row(f, hdr, row, lineterminator, vrepr,
                            tr_style, td_styles, truncate)
@@ -180,7 +181,8 @@ class TeeHTMLView(Table):
                 # write body
                 if tr_style and callable(tr_style):
                     # wrap as records
-                    it = (Record(row, hdr) for row in it)
+                    record = _recordclass(hdr)
+                    it = (record(row) for row in it)
                 for row in it:
                     _write_row(f, hdr, row, lineterminator, vrepr,
                                tr_style, td_styles, truncate)
@@ -3,7 +3,8 @@ from __future__ import division, print_function, absolute_import
 
 
 from petl.compat import next, string_types
-from petl.util.base import iterpeek, ValuesView, Table
+from petl.util.base import iterpeek, ValuesView, Table, header, data, \
+    _sourcetypes
 from petl.util.materialise import columns
 
 
@@ -19,6 +20,36 @@ def infer_dtype(table):
     return dtype
 
 
+def _dtypetypes(dtype):
+    # types of the values in each field of a structured dtype, i.e., the
+    # numpy scalar types, except for object and nested fields
+    types = []
+    for name in dtype.names:
+        dt = dtype.fields[name][0]
+        types.append(None if dt.kind in 'OV' or dt.shape else dt.type)
+    return types
+
+
+def _typesdtype(flds, types):
+    # a dtype for fields of known numeric types, or None if any field is of
+    # another or unknown type, e.g., strings which need a length
+    import numpy as np
+    formats = []
+    for t in types:
+        if t is None:
+            return None
+        try:
+            dt = np.dtype(t)
+        except TypeError:
+            return None
+        if dt.kind not in 'biuf':
+            return None
+        formats.append(dt)
+    if len(formats) != len(flds):
+        return None
+    return list(zip(flds, formats))
+
+
 def construct_dtype(flds, peek, dtype):
     import numpy as np
 
@@ -83,6 +114,17 @@ def toarray(table, dtype=None, count=-1, sample=1000):
     """
 
     import numpy as np
+    if dtype is None:
+        # no need to sample rows if the types of all fields are known
+        types = _sourcetypes(table)
+        if types is not None:
+            flds = list(map(str, header(table)))
+            dtype = _typesdtype(flds, types)
+            if dtype is not None:
+                it = data(table)
+                it = (tuple(row) for row in it)
+                return np.fromiter(it, dtype=dtype, count=count)
+
     it = iter(table)
     peek, it = iterpeek(it, sample)
     hdr = next(it)
@@ -145,6 +187,9 @@ class ArrayView(Table):
     def __init__(self, a):
         self.a = a
 
+    def _fieldtypes(self):
+        return _dtypetypes(self.a.dtype)
+
     def __iter__(self):
         yield tuple(self.a.dtype.names)
         for row in self.a:
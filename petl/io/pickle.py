@@ -7,7 +7,7 @@ from petl.compat import pickle, next
 
 
 # internal dependencies
-from petl.util.base import Table
+from petl.util.base import Table, _itertuples
 from petl.io.sources import read_source_from_arg, write_source_from_arg
 
 
@@ -47,6 +47,8 @@ def frompickle(source=None):
 
 class PickleView(Table):
 
+    _tuplerows = True
+
     def __init__(self, source):
         self.source = source
 
@@ -145,6 +147,8 @@ Table.teepickle = teepickle
 
 class TeePickleView(Table):
 
+    _tuplerows = True
+
     def __init__(self, table, source=None, protocol=-1, write_header=True):
         self.table = table
         self.source = source
@@ -155,14 +159,14 @@ class TeePickleView(Table):
         protocol = self.protocol
         source = write_source_from_arg(self.source)
         with source.open('wb') as f:
-            it = iter(self.table)
+            it = _itertuples(self.table)
             try:
                 hdr = next(it)
             except StopIteration:
                 return
             if self.write_header:
                 pickle.dump(hdr, f, protocol)
-            yield tuple(hdr)
+            yield hdr
             for row in it:
                 pickle.dump(row, f, protocol)
-                yield tuple(row)
+                yield row
@@ -8,7 +8,7 @@ from petl.compat import string_types
 
 from petl.errors import ArgumentError
 from petl.util.base import Table, iterpeek, data
-from petl.io.numpy import infer_dtype
+from petl.io.numpy import infer_dtype, _dtypetypes
 
 
 def fromhdf5(source, where=None, name=None, condition=None,
@@ -98,6 +98,10 @@ class HDF5View(Table):
         self.stop = stop
         self.step = step
 
+    def _fieldtypes(self):
+        with _get_hdf5_table(self.source, self.where, self.name) as h5tbl:
+            return _dtypetypes(h5tbl.dtype)
+
     def __iter__(self):
         return iterhdf5(self.source, self.where, self.name, self.condition,
                         self.condvars, self.start, self.stop, self.step)
@@ -264,6 +268,10 @@ class HDF5SortedView(Table):
         self.stop = stop
         self.step = step
 
+    def _fieldtypes(self):
+        with _get_hdf5_table(self.source, self.where, self.name) as h5tbl:
+            return _dtypetypes(h5tbl.dtype)
+
     def __iter__(self):
         return iterhdf5sorted(self.source, self.where, self.name, self.sortby,
                               self.checkCSI, self.start, self.stop, self.step)
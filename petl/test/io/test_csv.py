@@ -11,6 +11,7 @@ from petl.compat import PY2
 
 from petl.test.helpers import ieq, eq_
 from petl.io.csv import fromcsv, fromtsv, tocsv, appendcsv, totsv, appendtsv
+from petl.util.base import iterbatches
 
 
 logger = logging.getLogger(__name__)
@@ -308,4 +309,27 @@ def test_fromcsv_header():
     actual = fromcsv(f.name, encoding='ascii', header=header)
     debug(actual)
     ieq(expect, actual)
-    ieq(expect, actual)  # verify can iterate twice
\ No newline at end of file
+    ieq(expect, actual)  # verify can iterate twice
+
+
+def test_fromcsv_tocsv_batches():
+
+    f = NamedTemporaryFile(delete=False, mode='wb')
+    f.write(b'foo,bar\na,1\nb,2\nc\nd,4\n')
+    f.close()
+    table = fromcsv(f.name, encoding='ascii')
+    it = iterbatches(table, 3)
+    eq_(('foo', 'bar'), next(it))
+    eq_([('a', '1'), ('b', '2'), ('c',)], next(it))
+    eq_([('d', '4')], next(it))
+    ieq(table, fromcsv(f.name, encoding='ascii', header=['foo', 'bar'])
+        .skip(1))
+    eq_([('x', 'y')],
+        list(iterbatches(fromcsv(f.name, header=['x', 'y']), 10))[:1])
+
+    f2 = NamedTemporaryFile(delete=False)
+    f2.close()
+    tocsv(table, f2.name, encoding='ascii', lineterminator='\n')
+    ieq(table, fromcsv(f2.name, encoding='ascii'))
+    tocsv(table, f2.name, encoding='ascii', write_header=False)
+    ieq(table.skip(1), fromcsv(f2.name, encoding='ascii'))
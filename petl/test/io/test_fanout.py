@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, division
+
+
+import pytest
+
+
+from petl.errors import ArgumentError
+from petl.test.helpers import ieq, eq_
+from petl.util.base import wrap, header, dicts
+from petl.transform.basics import head
+from petl.util.counting import nrows
+from petl.io.fanout import fanout
+
+
+table1 = (('foo', 'bar'),
+          ('a', 1),
+          ('b', 2),
+          ('c', 3),
+          ('d', 4))
+
+
+def test_fanout():
+
+    evaluated = []
+
+    def bar(v):
+        evaluated.append(v)
+        return v * 10
+
+    table2 = wrap(table1).convert('bar', bar)
+    actual = fanout(table2, list, nrows, header,
+                    lambda t: sum(t.values('bar')),
+                    batchsize=2, queuesize=1)
+    eq_([1, 2, 3, 4], evaluated)  # table was iterated once
+    ieq(table2, actual[0])
+    eq_((4, ('foo', 'bar'), 100), actual[1:])
+
+    # method form
+    eq_((4,), wrap(table1).fanout(nrows))
+    # no rows
+    eq_(([('foo', 'bar')], 0), fanout([('foo', 'bar')], list, nrows))
+    eq_(([], ), fanout([], list))
+
+
+def test_fanout_early_stop():
+
+    table2 = wrap(table1).convert('bar', lambda v: v * 10)
+    actual = fanout(table2, lambda t: [row for row in t.head(1)], list,
+                    lambda t: None, batchsize=1, queuesize=1)
+    ieq([('foo', 'bar'), ('a', 10)], actual[0])
+    ieq(table2, actual[1])
+    eq_(None, actual[2])
+
+
+def test_fanout_wrapped():
+
+    # views over the tables given to consumers do not count rows up front
+    actual = fanout(table1,
+                    lambda t: list(t.cut('foo')),
+                    lambda t: list(head(t, 2)),
+                    lambda t: list(dicts(t)),
+                    batchsize=2, queuesize=1)
+    eq_([('foo',), ('a',), ('b',), ('c',), ('d',)], actual[0])
+    eq_([('foo', 'bar'), ('a', 1), ('b', 2)], actual[1])
+    eq_([{'foo': 'a', 'bar': 1}, {'foo': 'b', 'bar': 2},
+         {'foo': 'c', 'bar': 3}, {'foo': 'd', 'bar': 4}], actual[2])
+    with pytest.raises(TypeError):
+        fanout(table1, lambda t: len(t.cut('foo')))
+
+
+def test_fanout_errors():
+
+    seen = []
+
+    def fails(t):
+        for row in t.data():
+            if row[1] == 3:
+                raise ValueError(row)
+
+    table2 = [('foo', 'bar')] + [('x', i) for i in range(1000)]
+
+    def collects(t):
+        for row in t.data():
+            seen.append(row)
+
+    with pytest.raises(ValueError):
+        fanout(table2, collects, fails, batchsize=1, queuesize=1)
+    assert len(seen) < 1000  # stopped early
+
+    # error raised by the source table
+    table2 = wrap(table1).convert('bar', lambda v: 1 // (v - 3),
+                                  failonerror=True)
+    with pytest.raises(ZeroDivisionError):
+        fanout(table2, list, nrows, batchsize=1)
+
+    # rows can only be iterated once
+    with pytest.raises(ArgumentError):
+        fanout(table1, lambda t: (list(t), list(t)))
@@ -173,3 +173,17 @@ else:
         actual = etl.wrap(t).values('bar').array(dtype='i2')
         eq_(expect.dtype, actual.dtype)
         assert np.all(expect == actual)
+
+    def test_fieldtypes():
+        a = np.array([('apples', 1, 2.5),
+                      ('oranges', 3, 4.4),
+                      ('pears', 7, .1)],
+                     dtype='U8, i4, f4')
+        t = fromarray(a)
+        eq_((np.str_, np.int32, np.float32), etl.fieldtypes(t))
+        # numeric fields do not need sampling
+        u = t.cut('f2', 'f1').sort('f1', reverse=True)
+        eq_((np.float32, np.int32), etl.fieldtypes(u))
+        b = toarray(u, sample=0)
+        eq_(np.dtype([('f2', np.float32), ('f1', np.int32)]), b.dtype)
+        eq_([7, 3, 1], list(b['f1']))
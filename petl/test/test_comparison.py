@@ -7,7 +7,8 @@ from decimal import Decimal
 import pytest
 
 from petl.test.helpers import eq_, ieq
-from petl.comparison import Comparable
+from petl.compat import text_type
+from petl.comparison import Comparable, _typed_itemgetter
 
 
 def test_comparable():
@@ -201,3 +202,15 @@ def test_comparable_ieq_missing():
         ieq(x, y)
     with pytest.raises(AssertionError):
         ieq(y, x)
+
+
+def test_typed_itemgetter():
+    rows = [(2, 'b', None), (1, 'a', 'x')]
+    getkey = _typed_itemgetter((int, text_type, None), 0, 1)
+    eq_((2, 'b'), getkey(rows[0]))
+    # falls back to comparable keys where a type is not known
+    getkey = _typed_itemgetter((int, text_type, None), 0, 2)
+    assert isinstance(getkey(rows[0]), Comparable)
+    assert getkey(rows[0]) > getkey(rows[1])
+    getkey = _typed_itemgetter(None, 0)
+    assert isinstance(getkey(rows[0]), Comparable)
@@ -0,0 +1,279 @@
+from __future__ import absolute_import, print_function, division
+
+
+import asyncio
+import threading
+
+
+import pytest
+
+
+from petl.test.helpers import ieq, eq_
+from petl.test.failonerror import assert_failonerror
+from petl.util.base import wrap, header
+from petl.transform.asyncmaps import aconvert, aaddfield, amap
+
+
+class StubServer(object):
+    # a local server, run on its own event loop in a background thread,
+    # replying to each line with the line in upper case, after a delay
+    # given by the client (in milliseconds), so replies can come out of order
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.active = 0
+        self.maxactive = 0
+        self.requests = 0
+        self.handlers = set()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self.handle, '127.0.0.1', 0)
+            )
+            self.port = self.server.sockets[0].getsockname()[1]
+            started.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run)
+        self.thread.daemon = True
+        self.thread.start()
+        started.wait()
+
+    async def handle(self, reader, writer):
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        self.requests += 1
+        self.active += 1
+        self.maxactive = max(self.maxactive, self.active)
+        try:
+            line = await reader.readline()
+            delay, value = line.decode().strip().split(' ', 1)
+            await asyncio.sleep(int(delay) / 1000)
+            writer.write(value.upper().encode() + b'\n')
+            await writer.drain()
+        finally:
+            self.active -= 1
+            self.handlers.discard(task)
+            writer.close()
+            await writer.wait_closed()
+
+    async def request(self, value, delay=0):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        try:
+            writer.write(('%s %s\n' % (delay, value)).encode())
+            await writer.drain()
+            line = await reader.readline()
+            return line.decode().strip()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def shutdown(self):
+        # stop accepting connections and cancel any handlers still running,
+        # e.g., for requests abandoned by a client which stopped early, before
+        # waiting for the server to close
+        self.server.close()
+        handlers = list(self.handlers)
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+@pytest.fixture
+def server():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+def test_aconvert(server):
+
+    table1 = [['foo', 'bar'],
+              ['a', 1],
+              ['b', 2],
+              ['c', 3],
+              ['d', 4]]
+
+    async def upper(v):
+        # earlier rows are slower
+        return await server.request(v, delay=10 * (ord('e') - ord(v)))
+
+    table2 = aconvert(table1, 'foo', upper)
+    expect2 = (('foo', 'bar'),
+               ('A', 1),
+               ('B', 2),
+               ('C', 3),
+               ('D', 4))
+    ieq(expect2, table2)
+    ieq(expect2, table2)
+    eq_(('foo', 'bar'), header(table2))
+
+    # multiple fields, short rows
+    table3 = [['foo', 'bar'],
+              ['a', 'x'],
+              ['b']]
+
+    async def upper3(v):
+        return await server.request(v)
+
+    table4 = aconvert(table3, ('foo', 'bar'), upper3)
+    expect4 = (('foo', 'bar'),
+               ('A', 'X'),
+               ('B',))
+    ieq(expect4, table4)
+
+    # method form, empty tables
+    ieq((('foo', 'bar'),), aconvert([['foo', 'bar']], 'foo', upper3))
+    ieq((), aconvert([], 'foo', upper3))
+    ieq(expect2, wrap(table1).aconvert('foo', upper))
+
+
+def test_aconvert_concurrency(server):
+
+    table1 = [['foo']] + [['x%s' % i] for i in range(20)]
+
+    async def upper(v):
+        return await server.request(v, delay=5)
+
+    expect = [['foo']] + [['X%s' % i] for i in range(20)]
+    for concurrency, window in (1, None), (3, None), (5, 2), (50, None):
+        server.maxactive = 0
+        table2 = aconvert(table1, 'foo', upper, concurrency=concurrency,
+                          window=window)
+        ieq(expect, table2)
+        assert 1 <= server.maxactive <= min(concurrency, window or 20)
+    # calls do run concurrently
+    assert server.maxactive > 1
+
+
+def test_aconvert_stops_early(server):
+
+    table1 = [['foo']] + [['x%s' % i] for i in range(100)]
+    started = []
+
+    async def upper(v):
+        started.append(v)
+        return await server.request(v, delay=5)
+
+    table2 = aconvert(table1, 'foo', upper, concurrency=2, window=4)
+    ieq([['foo'], ['X0'], ['X1']], table2.head(2))
+    # no more than the window of rows were read ahead
+    assert len(started) <= 6
+
+
+def test_aconvert_failonerror():
+
+    async def f(v):
+        await asyncio.sleep(0)
+        return int(v)
+
+    input_  = (('foo',), (1,), ('A',))
+    expect_ = (('foo',), (1,), (None,))
+
+    assert_failonerror(
+        input_fn=lambda failonerror=None: aconvert(input_, 'foo', f,
+                                                   failonerror=failonerror),
+        expected_output=expect_)
+
+    # errorvalue
+    ieq((('foo',), (1,), ('bad',)),
+        aconvert(input_, 'foo', f, errorvalue='bad'))
+
+
+def test_aaddfield(server):
+
+    table1 = [['foo', 'bar'],
+              ['a', 1],
+              ['b', 2]]
+
+    async def upper(rec):
+        return await server.request(rec.foo, delay=10 * rec.bar)
+
+    table2 = aaddfield(table1, 'baz', upper)
+    expect2 = (('foo', 'bar', 'baz'),
+               ('a', 1, 'A'),
+               ('b', 2, 'B'))
+    ieq(expect2, table2)
+    ieq(expect2, table2)
+    eq_(('foo', 'bar', 'baz'), header(table2))
+
+    table3 = aaddfield(table1, 'baz', upper, index=0)
+    expect3 = (('baz', 'foo', 'bar'),
+               ('A', 'a', 1),
+               ('B', 'b', 2))
+    ieq(expect3, table3)
+
+    # empty table
+    ieq((('baz',),), aaddfield([], 'baz', upper))
+
+
+def test_aaddfield_failonerror():
+
+    async def f(rec):
+        await asyncio.sleep(0)
+        return int(rec.foo)
+
+    table1 = (('foo',), (1,), ('A',))
+
+    ieq((('foo', 'bar'), (1, 1), ('A', None)), aaddfield(table1, 'bar', f))
+    ieq((('foo', 'bar'), (1, 1), ('A', 'bad')),
+        aaddfield(table1, 'bar', f, errorvalue='bad'))
+
+    with pytest.raises(ValueError):
+        aaddfield(table1, 'bar', f, failonerror=True).nrows()
+
+    actual = list(aaddfield(table1, 'bar', f, failonerror='inline'))
+    assert isinstance(actual[2][1], ValueError)
+
+
+def test_amap(server):
+
+    table1 = [['id', 'sex'],
+              [1, 'male'],
+              [2, 'female'],
+              [3, 'female']]
+
+    async def rowmapper(rec):
+        sex = await server.request(rec.sex[0], delay=10 * (4 - rec.id))
+        return [rec.id, sex]
+
+    table2 = amap(table1, rowmapper, header=['id', 'gender'], concurrency=2)
+    expect2 = (('id', 'gender'),
+               (1, 'M'),
+               (2, 'F'),
+               (3, 'F'))
+    ieq(expect2, table2)
+    ieq(expect2, table2)
+    eq_(('id', 'gender'), header(table2))
+
+    # empty table
+    ieq((), amap([], rowmapper, header=['id', 'gender']))
+
+
+def test_amap_failonerror():
+
+    async def rowmapper(rec):
+        await asyncio.sleep(0)
+        return [rec.id * 2]
+
+    table1 = [['id'], [1], [None], [3]]
+
+    # rows for which the function fails are skipped by default
+    ieq([['id'], [2], [6]], amap(table1, rowmapper, header=['id']))
+
+    with pytest.raises(TypeError):
+        amap(table1, rowmapper, header=['id'], failonerror=True).nrows()
+
+    actual = list(amap(table1, rowmapper, header=['id'],
+                       failonerror='inline'))
+    eq_(4, len(actual))
+    assert isinstance(actual[2][0], TypeError)
@@ -3,11 +3,11 @@ from __future__ import absolute_import, print_function, division
 import pytest
 
 from petl.errors import FieldSelectionError
-from petl.test.helpers import ieq
-from petl.util import expr, empty, coalesce
+from petl.test.helpers import ieq, eq_
+from petl.util import expr, empty, coalesce, iterbatches
 from petl.transform.basics import cut, cat, addfield, rowslice, head, tail, \
     cutout, skipcomments, annex, addrownumbers, addcolumn, \
-    addfieldusingcontext, movefield, stack, addfields
+    addfieldusingcontext, movefield, stack, addfields, addrowdigest
 
 
 def test_cut():
@@ -660,6 +660,27 @@ def test_addrownumbers():
     ieq(expect, actual)
 
 
+def test_addrowdigest():
+
+    table1 = (('foo', 'bar'),
+              ('A', 1),
+              ('B', 2),
+              ('A', 1.0),
+              ('B',))
+    actual = addrowdigest(table1, fields='foo')
+    digests = [row[-1] for row in actual.data()]
+    assert digests[0] == digests[2]
+    assert digests[1] == digests[3]
+    assert digests[0] != digests[1]
+    assert len(digests[0]) == 32
+    actual = addrowdigest(table1, field='d', binary=True)
+    ieq(('foo', 'bar', 'd'), actual.header())
+    digests = [row[-1] for row in actual.data()]
+    assert digests[0] == digests[2]
+    assert digests[1] != digests[3]
+    assert len(digests[0]) == 16
+
+
 def test_addrownumbers_field_name():
 
     table1 = (('foo', 'bar'),
@@ -849,3 +870,59 @@ def test_movefield():
     actual = movefield(table1, 'foo', 1)
     ieq(expect, actual)
     ieq(expect, actual)
+
+
+def _unbatched(table, size):
+    it = iterbatches(table, size)
+    for hdr in it:
+        yield hdr
+        break
+    for batch in it:
+        assert 0 < len(batch) <= size
+        for row in batch:
+            yield row
+
+
+def test_batches():
+
+    table1 = (('foo', 'bar', 'baz'),
+              ('A', '1', 2),
+              ('B', '2', 3.4),
+              (u'B', u'3', u'7.8', True),
+              ('D', 'xyz', 9.0),
+              ('E', None),
+              ('F',))
+    table2 = (('bar', 'quux'),
+              ('4', 'a'),
+              ('5',))
+    tables = [
+        cut(table1, 'baz', 'foo'),
+        cutout(table1, 'bar'),
+        cat(table1, table2),
+        cat(table1, table2, header=['quux', 'foo']),
+        stack(table1, table2),
+        addfield(table1, 'quux', 42, index=1),
+        addfield(table1, 'quux', lambda rec: rec.foo * 2),
+        cut(table1, 'bar').convert('bar', int),
+        cut(table1, 'foo', 'bar').convert('bar', int, errorvalue='X'),
+        cut(table1, 'foo', 'bar').convert({'bar': int, 'foo': 'lower'},
+                                          where=lambda r: r.foo != 'A'),
+        cut(table1, 'foo', 'bar').convert('bar', 'upper').selecteq('foo', 'B'),
+        cut(table1, 'foo', 'bar').select(lambda rec: rec.foo != 'B'),
+        cut(table1, 'foo', 'bar').selecteq('bar', '2', complement=True),
+        cut(table1, 'foo', 'bar').rename('foo', 'qux').prefixheader('x'),
+        cut(table1, 'foo', 'bar').setheader(['a', 'b']).suffixheader('y'),
+        cut(table1, 'foo', 'bar').convert('bar', int, errorvalue=0)
+                                 .select('{bar} > 1'),
+        empty().addfield('foo', 1),
+    ]
+    for table in tables:
+        for size in 1, 2, 100:
+            ieq(table, _unbatched(table, size))
+
+    # errors returned inline
+    table = cut(table1, 'foo', 'bar').convert('bar', int, failonerror='inline')
+    eq_(list(map(repr, table)), list(map(repr, _unbatched(table, 2))))
+
+    with pytest.raises(FieldSelectionError):
+        list(iterbatches(cut(table1, 'quux')))
@@ -7,6 +7,8 @@ from petl.test.failonerror import assert_failonerror
 from petl.test.helpers import ieq
 from petl.transform.conversions import convert, convertall, convertnumbers, \
     replace, update, format, interpolate
+from petl.transform.basics import addfield, head, stack
+from petl.transform.sorts import sort
 
 from functools import partial
 
@@ -315,6 +317,45 @@ def test_convert_where():
     ieq(expect, actual)
 
 
+def test_convert_where_downstream():
+
+    tbl1 = (('foo', 'bar'),
+            ('a', 1),
+            ('b', 3))
+    tbl2 = convert(tbl1, 'bar', lambda v: v*2, where=lambda r: r.bar > 2)
+
+    # rows not converted are passed on as plain tuples
+    ieq((('foo', 'bar'), ('a', 1), ('b', 6)), stack(tbl2))
+    expect = (('foo', 'baz', 'bar'),
+              ('a', 7, 1),
+              ('b', 7, 6))
+    ieq(expect, addfield(tbl2, 'baz', 7, index=1))
+    ieq(expect, addfield(sort(tbl2, 'foo'), 'baz', 7, index=1))
+    ieq(expect, addfield(head(tbl2), 'baz', 7, index=1))
+    tbl3 = convert(tbl1, 'bar', lambda v: v*2, where=lambda r: r.bar > 2,
+                   workers=2, chunksize=1)
+    ieq(expect, addfield(tbl3, 'baz', 7, index=1))
+
+
+def test_convert_where_short_rows():
+
+    tbl1 = (('foo', 'bar', 'baz'),
+            ('a', 1, True),
+            ('b', 2),
+            ('c', 3, None))
+
+    expect = (('foo', 'bar', 'baz'),
+              ('a', 1, True),
+              ('b', 4),
+              ('c', 6, None))
+
+    actual = convert(tbl1, 'bar', lambda v: v*2, where="not {baz}")
+    ieq(expect, actual)
+    actual = convert(tbl1, 'bar', lambda v: v*2, where="{quux}")
+    with pytest.raises(KeyError):
+        list(actual)
+
+
 def test_convert_failonerror():
     input_  = (('foo',), ('A',), (1,))
     cvt_    = {'foo': 'lower'}
@@ -323,6 +364,23 @@ def test_convert_failonerror():
     assert_failonerror(
             input_fn=partial(convert, input_, cvt_),
             expected_output=expect_)
+    assert_failonerror(
+            input_fn=partial(convert, input_, cvt_, workers=2, chunksize=1),
+            expected_output=expect_)
+
+
+def test_convert_workers():
+
+    table1 = [('foo', 'bar')] + [(str(i), i) for i in range(30)]
+    expect = convert(table1, {'foo': int, 'bar': 'bit_length'},
+                     where="{bar} % 2")
+    actual = convert(table1, {'foo': int, 'bar': 'bit_length'},
+                     where="{bar} % 2", workers=2, chunksize=4)
+    ieq(expect, actual)
+    ieq(expect.head(2), actual.head(2))
+    actual = convert(table1, 'foo', int, workers=2, chunksize=4,
+                     ordered=False)
+    ieq(convert(table1, 'foo', int), actual.sort('bar'))
 
 
 def test_replace_where():
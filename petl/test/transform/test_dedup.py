@@ -2,10 +2,11 @@ from __future__ import absolute_import, print_function, division
 
 import pytest
 
-from petl.errors import FieldSelectionError
+from petl.errors import FieldSelectionError, ArgumentError
 from petl.test.helpers import ieq
+from petl.transform.sorts import sort
 from petl.transform.dedup import duplicates, unique, conflicts, distinct, \
-    isunique
+    isunique, _hashgroups
 
 
 def test_duplicates():
@@ -277,6 +278,147 @@ def test_key_distinct_count():
     ieq(expect, result)
 
 
+def test_distinct_hash():
+
+    table = (('foo', 'bar', 'baz'),
+             ('B', '2', '3.4'),
+             ('A', 1, 2),
+             ('B', '2', '3.4'),
+             ('D', 4, 12.3),
+             ('A', 1, 2),
+             ('B', 3, 7))
+
+    # rows are output in order of first occurrence
+    result = distinct(table, strategy='hash')
+    expect = (('foo', 'bar', 'baz'),
+              ('B', '2', '3.4'),
+              ('A', 1, 2),
+              ('D', 4, 12.3),
+              ('B', 3, 7))
+    ieq(expect, result)
+    ieq(expect, result)
+
+    result = distinct(table, key='foo', count='count', strategy='hash')
+    expect = (('foo', 'bar', 'baz', 'count'),
+              ('B', '2', '3.4', 3),
+              ('A', 1, 2, 2),
+              ('D', 4, 12.3, 1))
+    ieq(expect, result)
+
+    with pytest.raises(ArgumentError):
+        distinct(table, strategy='foo')
+
+
+def test_distinct_hash_digest():
+
+    table = (('foo', 'bar'),
+             ('A', 1),
+             ('B', 2),
+             ('A', 1.0),
+             ('A', 2))
+    expect = (('foo', 'bar'),
+              ('A', 1),
+              ('B', 2),
+              ('A', 2))
+    ieq(expect, distinct(table, strategy='hash', digest=True))
+    expect = (('foo', 'bar', 'n'),
+              ('A', 1, 3),
+              ('B', 2, 1))
+    ieq(expect, distinct(table, key='foo', count='n', strategy='hash',
+                         digest=True))
+
+
+def test_distinct_hash_spill():
+
+    table = [('foo', 'bar')]
+    table.extend((i % 41, i) for i in range(400))
+    for buffersize in 1, 7, 100:
+        result = distinct(table, key='foo', strategy='hash',
+                          buffersize=buffersize)
+        ieq(distinct(table, key='foo'), sort(result, 'foo'))
+        result = distinct(table, key='foo', count='n', strategy='hash',
+                          buffersize=buffersize)
+        ieq(distinct(table, key='foo', count='n'), sort(result, 'foo'))
+
+
+def test_unique_hash():
+
+    table = (('foo', 'bar', 'baz'),
+             ('F', 7, 2.3),
+             ('A', 1, 2),
+             ('B', '2', '3.4'),
+             ('D', 'xyz', 9.0),
+             ('B', u'3', u'7.8'),
+             ('E', None, None),
+             ('D', 4, 12.3))
+    expect = (('foo', 'bar', 'baz'),
+              ('F', 7, 2.3),
+              ('A', 1, 2),
+              ('E', None, None))
+    ieq(expect, unique(table, 'foo', strategy='hash'))
+    ieq(sort(expect, 'foo'),
+        sort(unique(table, 'foo', strategy='hash', buffersize=1), 'foo'))
+
+
+def test_duplicates_hash():
+
+    table = (('foo', 'bar', 'baz'),
+             ('D', 'xyz', 9.0),
+             ('A', 1, 2),
+             ('B', '2', '3.4'),
+             ('B', u'3', u'7.8', True),
+             ('D', 4, 12.3),
+             ('B', '2', 42))
+
+    # groups are output in order of first appearance
+    expect = (('foo', 'bar', 'baz'),
+              ('D', 'xyz', 9.0),
+              ('D', 4, 12.3),
+              ('B', '2', '3.4'),
+              ('B', u'3', u'7.8', True),
+              ('B', '2', 42))
+    ieq(expect, duplicates(table, 'foo', strategy='hash'))
+    ieq(duplicates(table, 'foo'),
+        sort(duplicates(table, 'foo', strategy='hash', buffersize=1), 'foo'))
+
+
+def test_duplicates_hash_spill(tmpdir):
+
+    # few keys, so most rows are duplicates
+    table = [('foo', 'bar')]
+    table.extend((i % 3, i) for i in range(300))
+    table.append((3, 300))
+    result = duplicates(table, 'foo', strategy='hash', buffersize=10,
+                        tempdir=str(tmpdir))
+    ieq(duplicates(table, 'foo'), sort(result, 'foo'))
+    # rows held in memory are bounded by buffersize, not by the number of rows
+    groups = list(_hashgroups(iter(table[1:]), lambda row: row[0], 10,
+                              str(tmpdir)))
+    assert [4, 3] == [len(groups), len(tmpdir.listdir())]
+    assert sum(rows.held() for _, rows in groups) <= 10
+    assert table[1:4] + [(3, 300)] == [list(rows)[0] for _, rows in groups]
+
+
+def test_conflicts_hash():
+
+    table = (('foo', 'bar', 'baz'),
+             ('D', 3, 9.4),
+             ('A', 1, 2.7),
+             ('B', 2, None),
+             ('B', None, 7.8, True),
+             ('E', None),
+             ('D', 3, 12.3),
+             ('A', 2, None))
+    expect = (('foo', 'bar', 'baz'),
+              ('D', 3, 9.4),
+              ('D', 3, 12.3),
+              ('A', 1, 2.7),
+              ('A', 2, None))
+    ieq(expect, conflicts(table, 'foo', strategy='hash'))
+    ieq(conflicts(table, 'foo'),
+        sort(conflicts(table, 'foo', strategy='hash', buffersize=1), 'foo'))
+
+
 def test_isunique():
 
     table = (('foo', 'bar'), ('a', 1), ('b',), ('b', 2), ('c', 3, True))
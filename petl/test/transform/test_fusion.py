@@ -0,0 +1,103 @@
+from __future__ import absolute_import, print_function, division
+
+import pytest
+
+from petl.errors import FieldSelectionError
+from petl.test.helpers import ieq, eq_
+from petl.util.base import wrap
+from petl.transform.fusion import fuse, FusedView
+from petl.transform.sorts import sort
+
+
+table1 = (('foo', 'bar', 'baz'),
+          ('a', '4', 9.3),
+          ('b', '2', 88.2),
+          ('b', 'x', 23.3),
+          ('c', '8'),
+          ('d', '7', 100.9, True))
+
+
+def test_fuse_chain():
+
+    pipelines = [
+        wrap(table1).cut('baz', 'foo'),
+        wrap(table1).cutout('bar'),
+        wrap(table1).cut('bar').cut('bar'),
+        wrap(table1).convert('bar', int),
+        wrap(table1).convert('bar', int, errorvalue=-1),
+        wrap(table1).convert('bar', int, failonerror='inline')
+            .convert('bar', lambda v: isinstance(v, Exception)),
+        wrap(table1).convert({'foo': 'upper', 'baz': lambda v: v * 2}),
+        wrap(table1).convert('baz', lambda v, row: row.foo + str(v),
+                             pass_row=True),
+        wrap(table1).convert('foo', 'upper', where=lambda r: r.bar == '2'),
+        wrap(table1).convert('foo', 'upper', where="{bar} == '2'"),
+        wrap(table1).select(lambda rec: rec.baz is not None),
+        wrap(table1).select("{baz} is None", complement=True),
+        wrap(table1).selecteq('foo', 'b'),
+        wrap(table1).selectne('foo', 'b'),
+        wrap(table1).select(('foo', 'bar'), lambda v: v[1] == '2'),
+        wrap(table1).addfield('quux', 42),
+        wrap(table1).addfield('quux', lambda rec: rec.foo * 2, index=0),
+        wrap(table1).addfield('quux', 1, index=-1),
+        wrap(table1).stack(),
+        wrap(table1).rename('foo', 'spong').prefixheader('x_')
+            .suffixheader('_y'),
+        wrap(table1).setheader(['a', 'b']).cut('b'),
+        wrap(table1).convert('bar', int, errorvalue=None)
+            .selectnotnone('bar')
+            .addfield('quux', lambda rec: rec.bar * 2)
+            .cutout('baz')
+            .rename({'quux': 'double'})
+            .selectgt('double', 8),
+    ]
+    for table in pipelines:
+        fused = fuse(table)
+        assert isinstance(fused, FusedView)
+        ieq(table, fused)
+        ieq(table, fused)  # check can iterate twice
+
+
+def test_fuse_nested():
+
+    table = (
+        wrap(table1)
+        .convert('bar', int, errorvalue=0)
+        .cut('foo', 'bar')
+        .sort('bar')
+        .addfield('baz', lambda rec: rec.bar + 1)
+        .selectgt('baz', 1)
+    )
+    fused = table.fuse()
+    assert isinstance(fused, FusedView)
+    ieq(table, fused)
+    # chain below the sort is fused too
+    assert isinstance(fused.source.source, FusedView)
+
+
+def test_fuse_unchanged():
+
+    table = sort(table1, 'foo')
+    assert fuse(table) is table
+    assert fuse(table1) is table1
+
+
+def test_fuse_empty():
+
+    table = wrap([]).cut('foo')
+    with pytest.raises(FieldSelectionError):
+        fuse(table).header()
+    table = wrap([['foo', 'bar']]).cut('foo').selecteq('foo', 'a')
+    ieq([('foo',)], fuse(table))
+
+
+def test_fuse_errors():
+
+    table = wrap(table1).cut('quux')
+    with pytest.raises(FieldSelectionError):
+        fuse(table).header()
+    table = wrap(table1).convert('bar', int, failonerror=True)
+    with pytest.raises(ValueError):
+        fuse(table).nrows()
+    eq_(('foo', 'bar', 'baz'), fuse(wrap(table1).convert('foo', 'upper'))
+        .header())
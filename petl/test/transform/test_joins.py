@@ -1290,6 +1290,24 @@ def test_hashantijoin():
     _test_antijoin(hashantijoin)
 
 
+def test_hashantijoin_sort():
+
+    table1 = (('id', 'colour'),
+              (3, 'purple'),
+              (0, 'black'),
+              (1, 'blue'),
+              (5, 'yellow'))
+    table2 = (('id', 'shape'),
+              (1, 'circle'),
+              (3, 'square'))
+    expect = (('id', 'colour'),
+              (0, 'black'),
+              (5, 'yellow'))
+    actual = sort(hashantijoin(table1, table2, key='id'), 'id')
+    ieq(expect, actual)
+    ieq(expect, actual)
+
+
 def test_hashlookupjoin():
     _test_lookupjoin(hashlookupjoin)
 
@@ -342,3 +342,56 @@ def test_fieldmap_untrusted():
     actual['subject_id'] = 'id'
     actual['bmi'] = '{weight} / {height}**2'
     ieq(expect, actual)
+
+
+def _bmi(rec):
+    return [rec.id, rec.weight / rec.height ** 2]
+
+
+def _melt(rec):
+    yield [rec.id, 'age', rec.age]
+    yield [rec.id, 'height', rec.height]
+
+
+def test_maps_workers():
+    table = [('id', 'age', 'height', 'weight')]
+    table += [(i, 20 + i % 7, 1.5 + i % 3 / 10, 50.0 + i) for i in range(50)]
+
+    expect = rowmap(table, _bmi, header=['id', 'bmi'])
+    actual = rowmap(table, _bmi, header=['id', 'bmi'], workers=2,
+                    chunksize=3)
+    ieq(expect, actual)
+    actual = rowmap(table, _bmi, header=['id', 'bmi'], workers=2,
+                    chunksize=3, ordered=False)
+    ieq(sorted(expect.data()), sorted(actual.data()))
+
+    # consumer stops early, pool is shut down
+    ieq(expect.head(4), actual.sort().head(4))
+    ieq(expect.head(4), rowmap(table, _bmi, header=['id', 'bmi'], workers=2,
+                               chunksize=1).head(4))
+
+    expect = rowmapmany(table, _melt, header=['id', 'variable', 'value'])
+    actual = rowmapmany(table, _melt, header=['id', 'variable', 'value'],
+                        workers=3, chunksize=7)
+    ieq(expect, actual)
+
+    mappings = OrderedDict([('id', 'id'), ('bmi', _bmi)])
+    ieq(fieldmap(table, mappings), fieldmap(table, mappings, workers=2))
+
+    ieq([], rowmap([], _bmi, header=['id', 'bmi'], workers=2))
+    ieq([('id', 'bmi')], rowmap([table[0]], _bmi, header=['id', 'bmi'],
+                                workers=2))
+
+
+def test_rowmap_workers_failonerror():
+    input_ = (('foo',), ('A',), (1,), ('B',))
+    expect_ = (('foo',), ('a',), ('b',))
+
+    assert_failonerror(
+            input_fn=partial(rowmap, input_, _lower, header=('foo',),
+                             workers=2, chunksize=1),
+            expected_output=expect_)
+
+
+def _lower(row):
+    return [row[0].lower()]
@@ -0,0 +1,166 @@
+from __future__ import absolute_import, print_function, division
+
+
+import sqlite3
+import pytest
+from tempfile import NamedTemporaryFile
+
+
+from petl.errors import FieldSelectionError
+from petl.test.helpers import ieq, eq_
+from petl.util.base import wrap
+from petl.io.db import fromdb
+from petl.io.csv import fromcsv
+from petl.io.bcolz import BcolzView
+from petl.io.pytables import HDF5View
+from petl.transform.joins import join
+from petl.transform.plan import plan, optimize, explain
+
+
+def test_plan():
+
+    left = wrap([['id', 'foo'], [1, 'a']]).cut('id', 'foo')
+    right = wrap([['id', 'bar'], [1, 'b']]).selecteq('bar', 'b')
+    table = join(left, right, key='id').convert('foo', 'upper')
+    p = plan(table)
+    eq_('FieldConvertView', p.op)
+    ops = [n.op for n in p.walk()]
+    eq_(['FieldConvertView', 'JoinView'], ops[:2])
+    assert 'CutView' in ops and 'FieldSelectView' in ops
+    eq_(1, len(p.inputs))
+    eq_(2, len(p.inputs[0].inputs))
+    eq_('id', p.inputs[0].params['lkey'])
+    assert "CutView(missing=None, spec=('id', 'foo'))" in repr(p)
+
+
+def test_explain():
+
+    left = [['id', 'foo'], [1, 'a'], [2, 'b']]
+    right = [['id', 'bar'], [1, 'x'], [1, 'y']]
+    table = (wrap(left)
+             .hashjoin(right, key='id')
+             .aggregate('foo', len, strategy='hash', buffersize=10)
+             .tail(5))
+    report = explain(table)
+    eq_(('stage', 'key', 'sorts', 'spills', 'buffers', 'reiterates',
+         'memory'), report.header())
+    rows = list(report.data())
+    eq_(['TailView', '  SimpleAggregateView', '    HashJoinView'],
+        [r[0] for r in rows[:3]])
+    eq_((False, False, True, False, '<= 5 rows'), rows[0][2:])
+    eq_(('foo', False, True, True, False, '<= 10 groups'), rows[1][1:])
+    eq_(('id', False, False, True, False, 'all rows'), rows[2][1:])
+
+    report = explain(table, sample=1)
+    eq_(('rows', 'seconds', 'bytes'), report.header()[-3:])
+    rows = list(report.data())
+    eq_(1, rows[0][7])
+    assert rows[0][9] > 0
+    eq_(None, rows[3][9])  # stack view does not buffer
+
+    # keys of joins and hidden sorts
+    table = wrap(left).join(right, lkey='id', rkey='id').recast(key='id')
+    rows = list(explain(table).data())
+    eq_(('RecastView', True), (rows[0][0], rows[0][2]))
+    eq_('id', rows[1][1])
+
+
+def _exampledb():
+    connection = sqlite3.connect(':memory:')
+    connection.execute('CREATE TABLE example (foo, bar, baz)')
+    connection.executemany('INSERT INTO example VALUES (?, ?, ?)',
+                           [('a', 1, 2.5),
+                            ('b', 2, None),
+                            ('c', None, 7.0),
+                            ("d'", 3, 1.5)])
+    return connection
+
+
+def test_optimize_db():
+
+    connection = _exampledb()
+    base = fromdb(connection, 'SELECT * FROM example;')
+    pipelines = [
+        (base.selecteq('foo', "d'").cut('bar'),
+         'SELECT "bar", "foo" FROM (SELECT * FROM example) _petl '
+         'WHERE "foo" = \'d\'\'\''),
+        (base.selectlt('bar', 2),
+         'SELECT * FROM (SELECT * FROM example) _petl '
+         'WHERE ("bar" < 2 OR "bar" IS NULL)'),
+        (base.selectne('bar', 2).cutout('baz'),
+         'SELECT * FROM (SELECT * FROM example) _petl '
+         'WHERE ("bar" <> 2 OR "bar" IS NULL)'),
+        (base.cut('foo', 'baz').selectrangeopenleft('baz', 2, 7.0),
+         'SELECT "foo", "baz" FROM (SELECT * FROM example) _petl '
+         'WHERE "baz" >= 2 AND ("baz" < 7.0 OR "baz" IS NULL)'),
+        (base.cut('foo', 'baz').selectge('foo', 'b'),
+         'SELECT "foo", "baz" FROM (SELECT * FROM example) _petl '
+         'WHERE "foo" >= \'b\''),
+    ]
+    for table, query in pipelines:
+        optimized = optimize(table)
+        eq_(query, optimized.source.query if hasattr(optimized.source, 'query')
+            else optimized.source.source.query)
+        ieq(table, optimized)
+
+    # nothing to push down
+    for table in (base, base.cut(0),
+                  base.selecteq('foo', 'a', complement=True),
+                  base.select('foo', lambda v: v == 'a')):
+        assert optimize(table) is table
+
+
+def test_optimize_csv():
+
+    f = NamedTemporaryFile(delete=False, mode='wb')
+    f.write(b'foo,bar,baz\na,1,2\nb,2\nc,3,4,5\n')
+    f.close()
+    base = fromcsv(f.name)
+    for table in (base.cut('baz', 'foo'),
+                  base.cutout('bar'),
+                  base.selecteq('bar', '2').cut('foo'),
+                  base.selecteq('bar', '2').cutout('foo'),
+                  base.cutout('baz').cut('foo')):
+        optimized = optimize(table)
+        assert optimized is not table
+        ieq(table, optimized)
+    optimized = optimize(base.selecteq('bar', '2').cut('foo'))
+    eq_((['foo', 'bar'], False), optimized.source.source.projection)
+    table = base.cut('foo', missing='X')
+    assert optimize(table) is table
+    table = base.selecteq('bar', '2').cutout('bar')
+    assert optimize(table) is table
+    with pytest.raises(FieldSelectionError):
+        optimize(base.cut('quux')).header()
+
+
+def test_optimize_numexpr():
+
+    table = (HDF5View('example.h5', '/foo', condition='bar > 1')
+             .selectrangeopen('bar', 2, 5)
+             .selecteq('foo', 'a')
+             .cut('foo'))
+    eq_('(bar > 1) & (bar >= 2) & (bar <= 5)',
+        optimize(table).source.source.source.condition)
+
+    table = (BcolzView('example.bcolz')
+             .selectgt('bar', 2)
+             .cut('foo'))
+    optimized = optimize(table)
+    eq_(['foo', 'bar'], optimized.source.source.outcols)
+    eq_('(bar > 2)', optimized.source.source.expression)
+
+    table = BcolzView('example.bcolz', limit=10).selectgt('bar', 2)
+    assert optimize(table) is table
+
+
+def test_optimize_nested():
+
+    connection = _exampledb()
+    table = (fromdb(connection, 'SELECT * FROM example')
+             .selectgt('bar', 1)
+             .sort('foo', reverse=True)
+             .cut('foo'))
+    optimized = optimize(table)
+    ieq(table, optimized)
+    assert 'WHERE' in optimized.source.source.source.query
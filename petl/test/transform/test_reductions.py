@@ -4,11 +4,14 @@ from __future__ import absolute_import, print_function, division
 import operator
 
 
+import pytest
 from collections import OrderedDict
+from petl.errors import ArgumentError
 from petl.test.helpers import ieq
 from petl.util import strjoin
+from petl.transform.sorts import sort
 from petl.transform.reductions import rowreduce, aggregate, \
-    mergeduplicates, Conflict, fold
+    mergeduplicates, Conflict, fold, groupingsets, rollup, cube
 
 
 def test_rowreduce():
@@ -494,3 +497,161 @@ def test_fold():
     expect = (('key', 'value'), (1, 8), (2, 12))
     ieq(expect, t2)
     ieq(expect, t2)
+
+
+def test_aggregate_hash():
+
+    table1 = (('foo', 'bar', 'baz'),
+              ('b', 3, True),
+              ('a', 7, False),
+              ('b', 2, True),
+              ('a', 2, False),
+              ('c', 9, False))
+
+    # groups are output in order of first appearance
+    table2 = aggregate(table1, 'foo', sum, 'bar', strategy='hash')
+    expect2 = (('foo', 'value'),
+               ('b', 5),
+               ('a', 9),
+               ('c', 9))
+    ieq(expect2, table2)
+    ieq(expect2, table2)
+
+    aggregation = OrderedDict()
+    aggregation['count'] = len
+    aggregation['minbar'] = 'bar', min
+    aggregation['maxbar'] = 'bar', max
+    aggregation['bars'] = 'bar', strjoin(', ')
+    aggregation['first'] = lambda rows: rows[0].baz
+    table3 = aggregate(table1, ('foo', 'baz'), aggregation, strategy='hash')
+    expect3 = (('foo', 'baz', 'count', 'minbar', 'maxbar', 'bars', 'first'),
+               ('b', True, 2, 2, 3, '3, 2', True),
+               ('a', False, 2, 2, 7, '7, 2', False),
+               ('c', False, 1, 9, 9, '9', False))
+    ieq(expect3, table3)
+
+
+def test_aggregate_hash_spill():
+
+    table1 = [('foo', 'bar')]
+    table1.extend((i % 37, i) for i in range(500))
+    for buffersize in 1, 5, 100:
+        table2 = aggregate(table1, 'foo', sum, 'bar', strategy='hash',
+                           buffersize=buffersize)
+        ieq(aggregate(table1, 'foo', sum, 'bar'), sort(table2, 'foo'))
+        table3 = aggregate(table1, 'foo', list, 'bar', strategy='hash',
+                           buffersize=buffersize)
+        ieq(aggregate(table1, 'foo', list, 'bar'), sort(table3, 'foo'))
+
+
+def test_aggregate_hash_empty():
+
+    table1 = (('foo', 'bar'),)
+    table2 = aggregate(table1, 'foo', sum, 'bar', strategy='hash')
+    ieq((('foo', 'value'),), table2)
+
+
+def test_aggregate_strategy_invalid():
+
+    with pytest.raises(ArgumentError):
+        aggregate((('foo', 'bar'),), 'foo', sum, 'bar', strategy='foo')
+
+
+def test_mergeduplicates_hash():
+
+    table = (('foo', 'bar', 'baz'),
+             ('A', 1, 2),
+             ('B', '2', None),
+             ('D', 'xyz', 9.4),
+             ('B', None, u'7.8', True),
+             ('E', None, 42.),
+             ('D', 'xyz', 12.3),
+             ('A', 2, None))
+    result = mergeduplicates(table, 'foo', strategy='hash')
+    expectation = (('foo', 'bar', 'baz'),
+                   ('A', Conflict([1, 2]), 2),
+                   ('B', '2', u'7.8'),
+                   ('D', 'xyz', Conflict([9.4, 12.3])),
+                   ('E', None, 42.))
+    ieq(expectation, result)
+    ieq(expectation, sort(mergeduplicates(table, 'foo', strategy='hash',
+                                          buffersize=1), 'foo'))
+
+
+def test_fold_hash():
+
+    t1 = (('id', 'count'), (2, 4), (1, 3), (2, 8), (1, 5), (3, 1))
+    t2 = fold(t1, 'id', operator.add, 'count', strategy='hash')
+    ieq((('key', 'value'), (2, 12), (1, 8), (3, 1)), t2)
+    t3 = fold(t1, 'id', operator.add, 'count', strategy='hash', buffersize=1)
+    ieq((('key', 'value'), (1, 8), (2, 12), (3, 1)), sort(t3, 'key'))
+
+
+def test_groupingsets():
+
+    table1 = (('foo', 'bar', 'baz'),
+              ('a', 'x', 3),
+              ('b', 'y', 2),
+              ('a', 'y', 7),
+              ('a', 'x', 4))
+    aggregation = OrderedDict()
+    aggregation['count'] = len
+    aggregation['sum'] = 'baz', sum
+    aggregation['min'] = 'baz', min
+    aggregation['max'] = 'baz', max
+    aggregation['list'] = 'baz'
+    table2 = groupingsets(table1, [('foo', 'bar'), 'bar', ()], aggregation,
+                          groupingid='gid')
+    expect2 = (('foo', 'bar', 'gid', 'count', 'sum', 'min', 'max', 'list'),
+               ('a', 'x', 0, 2, 7, 3, 4, [3, 4]),
+               ('a', 'y', 0, 1, 7, 7, 7, [7]),
+               ('b', 'y', 0, 1, 2, 2, 2, [2]),
+               (None, 'x', 2, 2, 7, 3, 4, [3, 4]),
+               (None, 'y', 2, 2, 9, 2, 7, [2, 7]),
+               (None, None, 3, 4, 16, 2, 7, [3, 2, 7, 4]))
+    ieq(expect2, table2)
+    ieq(expect2, table2)
+
+
+def test_rollup():
+
+    table1 = (('foo', 'bar', 'baz'),
+              ('a', 'x', 3),
+              ('b', 'y', 2),
+              ('a', 'y', 7),
+              ('a', 'x', 4))
+    table2 = rollup(table1, ('foo', 'bar'), sum, 'baz', missing='*')
+    expect2 = (('foo', 'bar', 'value'),
+               ('a', 'x', 7),
+               ('a', 'y', 7),
+               ('b', 'y', 2),
+               ('a', '*', 14),
+               ('b', '*', 2),
+               ('*', '*', 16))
+    ieq(expect2, table2)
+
+
+def test_cube():
+
+    table1 = (('foo', 'bar', 'baz'),
+              ('a', 'x', 3),
+              ('b', 'y', 2))
+    table2 = cube(table1, ('foo', 'bar'), len, groupingid='gid',
+                  field='count')
+    expect2 = (('foo', 'bar', 'gid', 'count'),
+               ('a', 'x', 0, 1),
+               ('b', 'y', 0, 1),
+               ('a', None, 1, 1),
+               ('b', None, 1, 1),
+               (None, 'x', 2, 1),
+               (None, 'y', 2, 1),
+               (None, None, 3, 2))
+    ieq(expect2, table2)
+
+
+def test_groupingsets_empty():
+
+    table1 = (('foo', 'bar'),)
+    table2 = rollup(table1, 'foo', sum, 'bar')
+    expect2 = (('foo', 'value'),)
+    ieq(expect2, table2)
@@ -6,7 +6,8 @@ from datetime import datetime
 import pytest
 
 from petl.errors import FieldSelectionError
-from petl.test.helpers import ieq
+from petl.test.helpers import ieq, eq_
+from petl.util.base import header
 from petl.transform.reshape import melt, recast, transpose, pivot, flatten, \
     unflatten
 from petl.transform.regex import split, capture
@@ -256,6 +257,29 @@ def test_recast4():
     ieq(expect, result)
 
 
+def test_recast_spill():
+
+    table = [('id', 'variable', 'value')]
+    table.extend((i % 10, 'v%s' % (i % 3), i) for i in range(30))
+    # variable only seen late in the table
+    table.append((4, 'late', 'x'))
+    result = recast(table, buffersize=3, reducers={'v0': sum, 'v1': sum,
+                                                   'v2': sum})
+    expect = [('id', 'late', 'v0', 'v1', 'v2'),
+              (0, None, 0, 10, 20),
+              (1, None, 21, 1, 11),
+              (2, None, 12, 22, 2),
+              (3, None, 3, 13, 23),
+              (4, 'x', 24, 4, 14),
+              (5, None, 15, 25, 5),
+              (6, None, 6, 16, 26),
+              (7, None, 27, 7, 17),
+              (8, None, 18, 28, 8),
+              (9, None, 9, 19, 29)]
+    ieq(expect, result)
+    ieq(expect, result)
+
+
 def test_recast_empty():
     table = (('foo', 'variable', 'value'),)
     expect = (('foo',),)
@@ -391,6 +415,18 @@ def test_pivot():
     ieq(expect2, table2)
 
 
+def test_pivot_spill():
+
+    table1 = [('key', 'var', 'val')]
+    table1.extend((k, 'v%s' % (k % 7), k) for k in range(50))
+    table1.append((3, 'v99', 1))
+    table2 = pivot(table1, 'key', 'var', 'val', sum, buffersize=4)
+    expect2 = pivot(table1, 'key', 'var', 'val', sum, buffersize=None)
+    ieq(expect2, table2)
+    ieq(expect2, table2)
+    eq_(9, len(header(table2)))
+
+
 def test_pivot_empty():
 
     table1 = (('region', 'gender', 'style', 'units'),)
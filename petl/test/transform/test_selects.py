@@ -6,7 +6,7 @@ from petl.errors import FieldSelectionError
 from petl.test.helpers import ieq, eq_
 from petl.comparison import Comparable
 from petl.transform.selects import select, selectin, selectcontains, \
-    rowlenselect, selectusingcontext, facet, selectgt, selectlt
+    rowlenselect, selectusingcontext, facet, selectgt, selectlt, biselect
 
 
 def test_select():
@@ -339,6 +339,100 @@ def test_facet_empty():
     table = (('foo', 'bar'),)
     actual = facet(table, 'foo')
     eq_(list(), list(actual.keys()))
+    actual = facet(table, 'foo', onepass=True)
+    eq_(list(), list(actual.keys()))
+
+
+def test_facet_onepass():
+
+    table = (('foo', 'bar', 'baz'),
+             ('a', 4, 9.3),
+             ('a', 2, 88.2),
+             ('b', 1, 23.3),
+             ('c', 8, 42.0),
+             ('d', 7, 100.9),
+             ('c', 2))
+    expect_fcta = (('foo', 'bar', 'baz'),
+                   ('a', 4, 9.3),
+                   ('a', 2, 88.2))
+    expect_fctc = (('foo', 'bar', 'baz'),
+                   ('c', 8, 42.0),
+                   ('c', 2))
+    # also with buffers spilled to disk
+    for buffersize in None, 1:
+        fct = facet(table, 'foo', onepass=True, buffersize=buffersize)
+        assert set(fct.keys()) == {'a', 'b', 'c', 'd'}
+        ieq(expect_fcta, fct['a'])
+        ieq(expect_fcta, fct['a'])  # check can iterate twice
+        ieq(expect_fctc, fct['c'])
+        ieq(expect_fctc, fct['c'])
+
+    fct = facet(table, ('foo', 'bar'), onepass=True)
+    assert set(fct.keys()) == {('a', 4), ('a', 2), ('b', 1), ('c', 8),
+                               ('d', 7), ('c', 2)}
+    ieq((('foo', 'bar', 'baz'), ('c', 2)), fct[('c', 2)])
+
+
+def test_facet_onepass_spill(tmpdir):
+
+    table = [('foo', 'bar')]
+    table.extend(('a', i) for i in range(50))
+    table.extend([('b', 1), ('c', 2), ('a', 50)])
+    fct = facet(table, 'foo', onepass=True, buffersize=10,
+                tempdir=str(tmpdir))
+    eq_(['a', 'b', 'c'], list(fct.keys()))
+    ieq([('foo', 'bar')] + [('a', i) for i in range(51)], fct['a'])
+    ieq([('foo', 'bar'), ('b', 1)], fct['b'])
+    # only the largest buffer was spilled, to a single file
+    eq_(1, len(tmpdir.listdir()))
+
+
+def test_biselect_onepass():
+
+    table = (('foo', 'bar', 'baz'),
+             ('a', 4, 9.3),
+             ('a', 2, 88.2),
+             ('b', 1, 23.3),
+             ('c', 8, 42.0),
+             ('c', 2))
+    expect1 = (('foo', 'bar', 'baz'),
+               ('a', 4, 9.3),
+               ('c', 8, 42.0))
+    expect2 = (('foo', 'bar', 'baz'),
+               ('a', 2, 88.2),
+               ('b', 1, 23.3),
+               ('c', 2))
+    for buffersize in None, 1:
+        t1, t2 = biselect(table, lambda rec: rec.bar > 3, onepass=True,
+                          buffersize=buffersize)
+        ieq(expect1, t1)
+        ieq(expect2, t2)
+        ieq(expect1, t1)
+    t1, t2 = biselect(table, 'bar', lambda v: v > 3, onepass=True)
+    ieq(expect1, t1)
+    ieq(expect2, t2)
+    t1, t2 = biselect(table, '{bar} > 3', onepass=True)
+    ieq(expect1, t1)
+    ieq(expect2, t2)
+
+
+def test_select_expr_short_rows():
+
+    table = (('foo', 'bar', 'baz'),
+             ('a', 4, 9.3),
+             ('b', 1),
+             ('c',))
+
+    actual = select(table, "{baz} is None")
+    expect = (('foo', 'bar', 'baz'),
+              ('b', 1),
+              ('c',))
+    ieq(expect, actual)
+    actual = select(table, "{baz} == 'x' or {bar} == 'x'", missing='x')
+    ieq(expect, actual)
+    actual = select(table, "{quux} is None")
+    with pytest.raises(KeyError):
+        list(actual)
 
 
 def test_select_untrusted():
@@ -6,7 +6,8 @@ from datetime import datetime
 
 from petl.test.helpers import ieq
 from petl.transform.setops import complement, intersection, diff, \
-    recordcomplement, recorddiff, hashcomplement, hashintersection
+    recordcomplement, recorddiff, hashcomplement, hashintersection, keydiff
+from petl.transform.sorts import sort
 
 
 def _test_complement_1(complement_impl):
@@ -429,3 +430,162 @@ def test_hashcomplement():
 
 def test_hashintersection():
     _test_intersection(hashintersection)
+
+
+def _partitioned(impl, **kwargs):
+    # sort output, as partitioning does not preserve row order
+    def _impl(a, b, **kw):
+        kw.update(kwargs)
+        return sort(impl(a, b, buffersize=1, **kw))
+    return _impl
+
+
+def test_hashcomplement_partitioned():
+    _test_complement(_partitioned(hashcomplement))
+
+
+def test_hashcomplement_partitioned_strict():
+    table1 = (('foo', 'bar'),
+              ('A', 1),
+              ('B', 2),
+              ('B', 2),
+              ('C', 7))
+    table2 = (('foo', 'bar'),
+              ('B', 2),
+              ('A', 9))
+    expectation = (('foo', 'bar'),
+                   ('A', 1),
+                   ('C', 7))
+    ieq(expectation, _partitioned(hashcomplement, strict=True)(table1, table2))
+    expectation = (('foo', 'bar'),
+                   ('A', 1),
+                   ('B', 2),
+                   ('C', 7))
+    ieq(expectation, _partitioned(hashcomplement)(table1, table2))
+
+
+def test_hashintersection_partitioned():
+    _test_intersection(_partitioned(hashintersection))
+
+
+def test_hash_setops_digest():
+    _test_complement(lambda a, b, **kw: hashcomplement(a, b, digest=True,
+                                                       **kw))
+    _test_complement(_partitioned(hashcomplement, digest=True))
+    _test_intersection(lambda a, b: hashintersection(a, b, digest=True))
+    _test_intersection(_partitioned(hashintersection, digest=True))
+
+
+def test_keydiff():
+
+    old = (('id', 'name', 'score'),
+           (3, 'Cat', 30),
+           (1, 'Ann', 10),
+           (2, 'Bob', 20),
+           (5, 'Eve'))
+    new = (('id', 'name', 'score'),
+           (4, 'Dan', 40),
+           (1, 'Ann', 10),
+           (3, 'Cat', 35),
+           (5, 'Eve', None))
+    expect = (('change', 'id', 'name', 'score'),
+              ('unchanged', 1, 'Ann', 10),
+              ('delete', 2, 'Bob', 20),
+              ('update', 3, 'Cat', 35),
+              ('insert', 4, 'Dan', 40),
+              ('unchanged', 5, 'Eve', None))
+    actual = keydiff(old, new, 'id')
+    ieq(expect, actual)
+    ieq(expect, actual)
+
+    # rows in order of new, then deletes
+    expect = (('change', 'id', 'name', 'score'),
+              ('insert', 4, 'Dan', 40),
+              ('unchanged', 1, 'Ann', 10),
+              ('update', 3, 'Cat', 35),
+              ('unchanged', 5, 'Eve', None),
+              ('delete', 2, 'Bob', 20))
+    actual = keydiff(old, new, 'id', strategy='hash')
+    ieq(expect, actual)
+    ieq(expect, actual)
+
+
+def test_keydiff_compare():
+
+    old = (('id', 'name', 'score'),
+           (1, 'Ann', 10),
+           (2, 'Bob', 20))
+    new = (('score', 'name', 'id', 'extra'),
+           (11, 'Ann', 1, True),
+           (20, 'Rob', 2, False))
+    expect = (('change', 'score', 'name', 'id', 'extra'),
+              ('unchanged', 11, 'Ann', 1, True),
+              ('update', 20, 'Rob', 2, False))
+    for strategy in 'sort', 'hash':
+        actual = keydiff(old, new, 'id', compare='name', strategy=strategy)
+        ieq(expect, actual)
+
+    # deleted rows are matched to fields of new by name
+    expect = (('change', 'score', 'name', 'id', 'extra'),
+              ('delete', 10, 'Ann', 1, None),
+              ('delete', 20, 'Bob', 2, None))
+    for strategy in 'sort', 'hash':
+        actual = keydiff(old, [new[0]], 'id', strategy=strategy)
+        ieq(expect, actual)
+
+
+def test_keydiff_duplicate_keys():
+
+    old = (('id', 'v'),
+           ('a', 1),
+           ('a', 2),
+           ('b', 1))
+    new = (('id', 'v'),
+           ('a', 1),
+           ('b', 1),
+           ('b', 2))
+    expect = (('change', 'id', 'v'),
+              ('unchanged', 'a', 1),
+              ('delete', 'a', 2),
+              ('unchanged', 'b', 1),
+              ('insert', 'b', 2))
+    ieq(expect, keydiff(old, new, 'id'))
+    expect = (('change', 'id', 'v'),
+              ('unchanged', 'a', 1),
+              ('unchanged', 'b', 1),
+              ('insert', 'b', 2),
+              ('delete', 'a', 2))
+    ieq(expect, keydiff(old, new, 'id', strategy='hash'))
+
+
+def test_keydiff_hash_repeated_keys():
+
+    old = (('id', 'v'),
+           ('a', 1),
+           ('b', 1),
+           ('a', 2),
+           ('c', 1),
+           ('a', 3),
+           ('b', 2),
+           ('d', 1))
+    new = (('id', 'v'),
+           ('a', 1),
+           ('b', 1),
+           ('b', 3),
+           ('a', 5),
+           ('c', 1),
+           ('c', 2))
+    expect = (('change', 'id', 'v'),
+              ('unchanged', 'a', 1),
+              ('unchanged', 'b', 1),
+              ('update', 'b', 3),
+              ('update', 'a', 5),
+              ('unchanged', 'c', 1),
+              ('insert', 'c', 2),
+              ('delete', 'a', 3),
+              ('delete', 'd', 1))
+    actual = keydiff(old, new, 'id', strategy='hash')
+    ieq(expect, actual)
+    ieq(expect, actual)
+    # same changes as with the sort strategy
+    assert sorted(expect[1:]) == sorted(keydiff(old, new, 'id').data())
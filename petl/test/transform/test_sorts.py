@@ -15,7 +15,8 @@ from petl.errors import FieldSelectionError
 from petl.test.helpers import ieq, eq_
 from petl.util import nrows
 from petl.transform.basics import cat
-from petl.transform.sorts import sort, mergesort, issorted
+from petl.transform.sorts import sort, mergesort, issorted, _SpillBuffer, \
+    _iterhashgroups
 
 
 logger = logging.getLogger(__name__)
@@ -559,3 +560,33 @@ def test_sort_missing_cell_text():
 
     tbl_sorted = sort(tbl)
     ieq(expect, tbl_sorted)
+
+
+def test_spillbuffer(tmpdir):
+
+    buf = _SpillBuffer(buffersize=3, tempdir=str(tmpdir))
+    for i in range(10):
+        buf.append(i)
+    eq_(10, len(buf))
+    eq_(1, buf.held())
+    eq_(list(range(10)), list(buf))
+    # a single file is used for all spills
+    eq_(1, len(tmpdir.listdir()))
+
+    # items appended while iterating are not yielded
+    it = iter(buf)
+    eq_(0, next(it))
+    for i in range(10, 15):
+        buf.append(i)
+    eq_(list(range(1, 10)), list(it))
+    eq_(list(range(15)), list(buf))
+    eq_(1, len(tmpdir.listdir()))
+
+
+def test_hashpartitions_small_buffer(tmpdir):
+
+    items = [i % 300 for i in range(3000)]
+    groups = _iterhashgroups(iter(items), lambda v: v, int,
+                             lambda n, v: n + 1, buffersize=1,
+                             tempdir=str(tmpdir))
+    eq_(dict((i, 10) for i in range(300)), dict(groups))
@@ -0,0 +1,88 @@
+from __future__ import absolute_import, print_function, division
+
+
+import pytest
+
+
+from petl.test.helpers import ieq, eq_
+from petl.util.base import wrap
+from petl.transform.fusion import fuse
+
+
+try:
+    import numpy as np
+except ImportError as e:
+    pytest.skip('SKIP vectorized tests: %s' % e, allow_module_level=True)
+else:
+
+    table1 = (('foo', 'bar', 'baz'),
+              ('a', 4, 9.0),
+              ('b', 1, 16.0),
+              ('c', 9, 1.0),
+              ('d', 16, 4.0))
+
+    def _counted(f):
+        # count calls to f, to tell whether it is called on whole columns
+        def wrapper(v):
+            wrapper.calls += 1
+            return f(v)
+        wrapper.calls = 0
+        return wrapper
+
+    def test_convert_vectorized():
+        sqrt = _counted(np.sqrt)
+        table2 = wrap(table1).convert('bar', sqrt, vectorized=True)
+        expect = (('foo', 'bar', 'baz'),
+                  ('a', 2.0, 9.0),
+                  ('b', 1.0, 16.0),
+                  ('c', 3.0, 1.0),
+                  ('d', 4.0, 4.0))
+        ieq(expect, table2)
+        eq_(1, sqrt.calls)
+        assert type(list(table2)[1][1]) is float  # not a numpy scalar
+        assert fuse(table2) is table2
+
+        # non-numeric columns and methods fall back to the row path
+        upper = _counted(lambda v: v.upper())
+        table3 = wrap(table1).convert({'foo': upper, 'baz': 'is_integer'},
+                                      vectorized=True)
+        ieq(wrap(table1).convert({'foo': 'upper', 'baz': 'is_integer'}),
+            table3)
+        eq_(4, upper.calls)
+
+        # errors are handled one value at a time
+        table4 = wrap(table1).convert('bar', lambda v: v // (v - 1),
+                                      vectorized=True, errorvalue='X')
+        ieq(wrap(table1).convert('bar', lambda v: v // (v - 1),
+                                 errorvalue='X'),
+            table4)
+
+    def test_select_vectorized():
+        where = _counted(lambda c: c > 4)
+        table2 = wrap(table1).select('bar', where, vectorized=True)
+        ieq(wrap(table1).select('bar', lambda v: v > 4), table2)
+        eq_(1, where.calls)
+        ieq(wrap(table1).select('bar', lambda v: v > 4, complement=True),
+            wrap(table1).select('bar', lambda c: c > 4, complement=True,
+                                vectorized=True))
+        ieq(wrap(table1).select('{bar} > {baz}'),
+            wrap(table1).select('{bar} > {baz}', vectorized=True))
+        ieq(wrap(table1).select(lambda rec: rec.foo in 'ab'),
+            wrap(table1).select(lambda rec: rec.foo in 'ab',
+                                vectorized=True))
+        # uneven rows
+        table3 = table1 + (('e',),)
+        ieq(wrap(table3).select('bar', lambda v: v is None or v > 4),
+            wrap(table3).select('bar', lambda c: c is None or c > 4,
+                                vectorized=True))
+
+    def test_addfield_vectorized():
+        value = _counted(lambda rec: rec.bar * rec.baz)
+        table2 = wrap(table1).addfield('quux', value, vectorized=True)
+        ieq(wrap(table1).addfield('quux', lambda rec: rec.bar * rec.baz),
+            table2)
+        eq_(1, value.calls)
+        table3 = wrap(table1).addfield('quux', lambda rec: rec.foo * 2,
+                                       index=0, vectorized=True)
+        ieq(wrap(table1).addfield('quux', lambda rec: rec.foo * 2, index=0),
+            table3)
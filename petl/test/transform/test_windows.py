@@ -0,0 +1,97 @@
+from __future__ import absolute_import, print_function, division
+
+
+import pytest
+
+
+from petl.errors import ArgumentError
+from petl.test.helpers import ieq
+from petl.transform.windows import window, rownumber, rank, denserank, lag, \
+    lead, cumsum, cumcount, movingsum, movingavg, movingmin, movingmax
+
+
+def test_window_partition_order():
+
+    table1 = (('foo', 'bar'),
+              ('b', 3),
+              ('a', 7),
+              ('a', 2),
+              ('b', 1),
+              ('a', 2),
+              ('a', 9))
+    functions = [('n', rownumber()),
+                 ('rank', rank()),
+                 ('dense', denserank()),
+                 ('prev', lag('bar')),
+                 ('next', lead('bar')),
+                 ('total', cumsum('bar'))]
+    table2 = window(table1, functions, partition='foo', order='bar')
+    expect2 = (('foo', 'bar', 'n', 'rank', 'dense', 'prev', 'next', 'total'),
+               ('a', 2, 1, 1, 1, None, 2, 2),
+               ('a', 2, 2, 1, 1, 2, 7, 4),
+               ('a', 7, 3, 3, 2, 2, 9, 11),
+               ('a', 9, 4, 4, 3, 7, None, 20),
+               ('b', 1, 1, 1, 1, None, 3, 1),
+               ('b', 3, 2, 2, 2, 1, None, 4))
+    ieq(expect2, table2)
+    ieq(expect2, table2)  # check can iterate twice
+
+
+def test_window_no_partition():
+
+    table1 = (('foo', 'bar'),
+              ('a', 1),
+              ('b', 4),
+              ('c', None),
+              ('d', 6))
+    functions = [('lag2', lag('bar', 2, default=0)),
+                 ('lead2', lead('bar', 2)),
+                 ('count', cumcount('bar')),
+                 ('rows', cumcount())]
+    table2 = window(table1, functions)
+    expect2 = (('foo', 'bar', 'lag2', 'lead2', 'count', 'rows'),
+               ('a', 1, 0, None, 1, 1),
+               ('b', 4, 0, 6, 2, 2),
+               ('c', None, 1, None, 2, 3),
+               ('d', 6, 4, None, 3, 4))
+    ieq(expect2, table2)
+
+
+def test_window_moving():
+
+    table1 = (('foo', 'bar'),
+              ('a', 1),
+              ('a', 4),
+              ('a', 2),
+              ('a', 8),
+              ('b', 3))
+    functions = [('sum', movingsum('bar', 3)),
+                 ('avg', movingavg('bar', 2)),
+                 ('min', movingmin('bar', 3)),
+                 ('max', movingmax('bar', 3))]
+    table2 = window(table1, functions, partition='foo', presorted=True)
+    expect2 = (('foo', 'bar', 'sum', 'avg', 'min', 'max'),
+               ('a', 1, 1, 1., 1, 1),
+               ('a', 4, 5, 2.5, 1, 4),
+               ('a', 2, 7, 3., 1, 4),
+               ('a', 8, 14, 5., 2, 8),
+               ('b', 3, 3, 3., 3, 3))
+    ieq(expect2, table2)
+
+
+def test_window_empty():
+
+    table1 = (('foo', 'bar'),)
+    table2 = window(table1, [('n', rownumber())], partition='foo')
+    expect2 = (('foo', 'bar', 'n'),)
+    ieq(expect2, table2)
+
+
+def test_window_invalid_offset():
+
+    for f in lag, lead:
+        for n in 0, -1:
+            with pytest.raises(ArgumentError):
+                f('bar', n)
+    with pytest.raises(ArgumentError):
+        movingsum('bar', 0)
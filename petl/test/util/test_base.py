@@ -4,9 +4,10 @@ import pytest
 
 from petl.errors import FieldSelectionError
 from petl.test.helpers import ieq, eq_
-from petl.compat import PY3, next
+from petl.compat import PY3, next, text_type
 from petl.util.base import header, fieldnames, data, dicts, records, \
-    namedtuples, itervalues, values, rowgroupby, expr
+    namedtuples, itervalues, values, rowgroupby, expr, _rowexpr, Record, \
+    fieldtypes, Table, iterbatches, wrap, _itertuples
 
 
 def test_header():
@@ -19,6 +20,74 @@ def test_header():
     eq_(expect, actual)
 
 
+class _HeaderOnly(object):
+    # a table which fails if any data row is read
+
+    def __init__(self, hdr):
+        self.hdr = hdr
+
+    def __iter__(self):
+        yield self.hdr
+        raise AssertionError('data rows read')
+
+
+def test_header_static():
+    import petl as etl
+    pipelines = [
+        lambda a, b: etl.sort(a, 'foo').cut('baz', 'foo').rename('foo', 'x'),
+        lambda a, b: etl.cutout(a, 'bar').addfield('n', 1, index=0)
+            .movefield('n', 2),
+        lambda a, b: etl.convert(a, 'foo', int).selecteq('bar', 1)
+            .select('{baz} > 0'),
+        lambda a, b: etl.head(a, 2).tail(1).distinct(count='n')
+            .duplicates('foo'),
+        lambda a, b: etl.unique(a, 'foo').conflicts('foo').filldown()
+            .fillright(),
+        lambda a, b: etl.join(a, b, key='foo')
+            .hashleftjoin(b, key='foo', rprefix='r_'),
+        lambda a, b: etl.antijoin(a, b, key='foo').lookupjoin(b, key='foo'),
+        lambda a, b: etl.crossjoin(a, b, prefix=True).prefixheader('p_'),
+        lambda a, b: etl.cat(a, b).stack(a).annex(b).sortheader()
+            .suffixheader('_s'),
+        lambda a, b: etl.fieldmap(a, {'x': 'foo', 'y': 'bar'})
+            .extendheader(['z']),
+        lambda a, b: etl.rowmap(a, lambda r: r, header=['x', 'y', 'z'])
+            .setheader(['p', 'q', 'r']).pushheader(['s', 't', 'u']),
+        lambda a, b: etl.melt(a, 'foo').capture('value', r'(\d)', ['d']),
+        lambda a, b: etl.split(a, 'foo', ',', ['f1', 'f2'])
+            .addrownumbers().fuse(),
+        lambda a, b: etl.complement(a, b).hashintersection(a).search('x'),
+        lambda a, b: etl.mergesort(a, a, key='foo').addcolumn('c', []),
+    ]
+    a = [('foo', 'bar', 'baz'), ('1', 1, 2), ('2', 1, 3)]
+    b = [('foo', 'quux'), ('1', 'x')]
+    for pipeline in pipelines:
+        # no data rows read
+        table = pipeline(_HeaderOnly(a[0]), _HeaderOnly(b[0]))
+        hdr = header(table)
+        eq_(hdr, fieldnames(table))
+        with pytest.raises(AssertionError):
+            list(table)
+        # same as the header obtained by iteration
+        eq_(tuple(next(iter(pipeline(a, b)))), hdr)
+
+
+def test_header_static_fallback():
+    import petl as etl
+    table = (('foo', 'bar'), ('a', 1), ('b', 2))
+    eq_(('foo', 'a', 'b'), header(etl.transpose(table)))
+    eq_(('foo', 'bar'), header(etl.sort(table, 'foo').cut('foo', 'bar')))
+    # empty sources are iterated as before
+    with pytest.raises(FieldSelectionError):
+        header(etl.cut([], 'foo'))
+    eq_(('foo',), header(etl.addfield([], 'foo')))
+    with pytest.raises(StopIteration):
+        header(etl.sort([]))
+    # errors in the field selection are raised as before
+    with pytest.raises(FieldSelectionError):
+        header(etl.cut(table, 'baz'))
+
+
 def test_fieldnames():
     table = (('foo', 'bar'), ('a', 1), ('b', 2))
     actual = fieldnames(table)
@@ -46,6 +115,59 @@ def test_fieldnames():
     eq_(expect, actual)
 
 
+class _TypedTable(Table):
+    # a table declaring the types of its fields
+
+    def __init__(self, rows, types):
+        self.rows = rows
+        self.types = types
+
+    def _fieldtypes(self):
+        return self.types
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+def test_fieldtypes():
+    import petl as etl
+    table = [('foo', 'bar', 'baz'), ('b', 2, 1.5), ('a', 1, 2.5)]
+    eq_((None, None, None), fieldtypes(table))
+    typed = _TypedTable(table, (text_type, int, None))
+    eq_((text_type, int, None), fieldtypes(typed))
+    eq_((int, text_type), fieldtypes(etl.cut(typed, 'bar', 'foo')))
+    eq_((text_type, None), fieldtypes(etl.cutout(typed, 'bar')))
+    pipeline = (etl.sort(typed, 'foo').rename('foo', 'x').selectgt('bar', 0)
+                .addfield('n', 1).head(5).distinct(count='c'))
+    eq_((text_type, int, None, int, int), fieldtypes(pipeline))
+    ieq([('x', 'bar', 'baz', 'n', 'c'), ('a', 1, 2.5, 1, 1),
+         ('b', 2, 1.5, 1, 1)], pipeline)
+    # joins
+    other = _TypedTable([('bar', 'quux'), (1, 'x')], (int, text_type))
+    eq_((text_type, int, None, text_type),
+        fieldtypes(etl.join(typed, other, key='bar')))
+    eq_((text_type, int, None, None),
+        fieldtypes(etl.leftjoin(typed, other, key='bar')))
+    eq_((None, int, None, text_type),
+        fieldtypes(etl.hashrightjoin(typed, other, key='bar')))
+    eq_((text_type, int, None), fieldtypes(etl.antijoin(typed, other,
+                                                         key='bar')))
+    # conversions declare types if errors are not hidden
+    eq_((text_type, int, None), fieldtypes(etl.convert(typed, 'baz', float)))
+    eq_((text_type, int, float),
+        fieldtypes(etl.convert(typed, 'baz', float, failonerror=True)))
+    eq_((text_type, int, float),
+        fieldtypes(etl.convert(typed, 'baz', float, errorvalue=0.0)))
+    eq_((text_type, None, None),
+        fieldtypes(etl.convert(typed, 'bar', lambda v: v * 2)))
+    eq_((None, None, float), fieldtypes(etl.convert(table, 'baz', float,
+                                                    failonerror=True)))
+    eq_((text_type, int, None),
+        fieldtypes(etl.convert(typed, 'baz', float, failonerror=True,
+                               where=lambda r: r.bar > 1)))
+    eq_((text_type, int, None), fieldtypes(etl.fuse(etl.cut(typed, 0, 1, 2))))
+
+
 def test_data():
     table = (('foo', 'bar'), ('a', 1), ('b', 2))
     actual = data(table)
@@ -157,6 +279,55 @@ def test_records_unevenrows():
     eq_(None, o.bar)
 
 
+def test_records_shared_class():
+    table = (('foo', 'bar', 'foo'), ('a', 1, 'x'), ('b',))
+    a, b = records(table, missing='NA')
+    # one class per header, no per-record state
+    assert type(a) is type(b)
+    assert isinstance(a, Record)
+    assert not hasattr(a, '__dict__')
+    eq_(['foo', 'bar', 'foo'], a.flds)
+    eq_('NA', b.missing)
+    # duplicate fields resolve to the first occurrence
+    eq_('a', a['foo'])
+    eq_('x', a[2])
+    eq_(('NA', 'NA'), (b.bar, b['bar']))
+    eq_('NA', b[2])
+    eq_('NA', b.get('bar', 'X'))
+    eq_('X', b.get('baz', 'X'))
+    with pytest.raises(KeyError):
+        a[['foo']]
+    # behaves as a tuple
+    eq_(('a', 1, 'x'), a)
+    eq_(hash(('b',)), hash(b))
+
+
+def test_record_constructor():
+    flds = ['foo', 'bar']
+    r1 = Record(('a', 1), flds)
+    r2 = Record(('b',), flds, missing=0)
+    eq_((1, 0), (r1.bar, r2.bar))
+    assert type(r1) is type(Record(('c', 3), ['foo', 'bar']))
+    assert type(r1) is not type(r2)
+    # unhashable missing value
+    r3 = Record(('b',), flds, missing=[])
+    eq_([], r3.bar)
+    import pickle
+    r4 = pickle.loads(pickle.dumps(r2))
+    eq_(('b',), r4)
+    eq_(0, r4.bar)
+    # missing values which are equal but of different types are kept apart
+    r5 = Record(('b',), flds, missing=False)
+    r6 = Record(('b',), flds, missing=0.0)
+    assert r5.bar is False
+    assert isinstance(r6.bar, float)
+    assert isinstance(r2.bar, int) and r2.bar is not False
+    # likewise for fields
+    r7 = Record(('a',), [1.0])
+    eq_([1.0], r7.flds)
+    assert type(Record(('a',), [1]).flds[0]) is int
+
+
 def test_namedtuples():
     table = (('foo', 'bar'), ('a', 1), ('b', 2))
     actual = namedtuples(table)
@@ -353,6 +524,21 @@ def test_expr_inject():
         assert exc_info is not None
 
 
+def test_rowexpr():
+
+    hdr = ('foo', 'bar', 'baz')
+    fu = _rowexpr(expr("{baz} * {foo}"), hdr)
+    eq_(6, fu((3, None, 2)))
+    eq_(6, fu([3, None, 2, 'extra']))
+    # short rows are evaluated as records, with the missing value
+    fu = _rowexpr(expr("{baz} is {bar}"), hdr, missing=1)
+    eq_(True, fu((3, 1)))
+    eq_(False, fu((3, 2, 1)))
+    # only applies to expressions referencing fields in the header
+    eq_(None, _rowexpr(expr("{quux} * 2"), hdr))
+    eq_(None, _rowexpr(lambda rec: rec['foo'], hdr))
+
+
 def _has_asteval():
     if PY3:
         try:
@@ -385,3 +571,57 @@ def test_expr_nok_untrusted():
         with pytest.raises(KeyError) as exc_info:
             fu({'foo': 3, 'bar': 2})
             assert exc_info is not None
+
+
+def test_iterbatches():
+
+    table = (('foo', 'bar'),
+             ('a', 1),
+             ('b', 2),
+             ('c',))
+    it = iterbatches(table, 2)
+    eq_(('foo', 'bar'), next(it))
+    eq_([('a', 1), ('b', 2)], next(it))
+    eq_([('c',)], next(it))
+    with pytest.raises(StopIteration):
+        next(it)
+
+    it = iterbatches(table, 2, columns=True, missing='X')
+    eq_(('foo', 'bar'), next(it))
+    eq_([['a', 'b'], [1, 2]], next(it))
+    eq_([['c'], ['X']], next(it))
+
+    eq_([], list(iterbatches([], 2)))
+    eq_([('foo', 'bar')], list(iterbatches([('foo', 'bar')], 2)))
+
+
+class _Tuples(Table):
+
+    _tuplerows = True
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+def test_itertuples():
+
+    rows = [('foo', 'bar'), ('b', 2), ('a', 1), ('c', 3)]
+    actual = list(_itertuples(_Tuples(rows)))
+    assert all(r is e for r, e in zip(actual, rows))
+    eq_(rows, list(_itertuples([list(r) for r in rows])))
+
+    # rows are passed along a pipeline without being copied
+    table = (_Tuples(rows)
+             .rename('foo', 'baz')
+             .selectgt('bar', 1)
+             .sort('bar')
+             .head(2)
+             .prefixheader('x'))
+    actual = list(table)
+    eq_([('xbaz', 'xbar'), ('b', 2), ('c', 3)], actual)
+    assert actual[1] is rows[1] and actual[2] is rows[3]
+    assert table._tuplerows
+    assert not wrap(rows).prefixheader('x')._tuplerows
@@ -4,7 +4,9 @@ from __future__ import absolute_import, print_function, division
 from petl.compat import PY2
 from petl.test.helpers import ieq, eq_
 from petl.util.counting import valuecount, valuecounter, valuecounts, \
-    rowlengths, typecounts, parsecounts, stringpatterns, nrows
+    rowlengths, typecounts, parsecounts, stringpatterns, nrows, \
+    approxcountdistinct, approxdistinct, HyperLogLog
+from petl.transform.reductions import aggregate
 
 
 def test_nrows():
@@ -178,3 +180,78 @@ def test_stringpatterns():
               ('999 9999', 2, 2./6),
               ('999-9999-AA', 1, 1./6))
     ieq(expect, actual)
+
+
+def test_approxcountdistinct():
+
+    table = (('foo', 'bar'), ('a', 1), ('b', 2), ('b', 7), ('c',))
+    eq_(3, approxcountdistinct(table, 'foo'))
+    eq_(4, approxcountdistinct(table, 'bar'))  # includes missing
+    eq_(4, approxcountdistinct(table, ('foo', 'bar')))
+
+
+def test_approxcountdistinct_large():
+
+    table = [('foo',)] + [(i % 50000,) for i in range(100000)]
+    actual = approxcountdistinct(table, 'foo', error=0.01)
+    assert abs(actual - 50000) < 50000 * 0.04, actual
+
+
+def test_approxdistinct_aggregate():
+
+    table = (('foo', 'bar'),
+             ('a', 'x'),
+             ('a', 'y'),
+             ('a', 'x'),
+             ('b', 'z'))
+    actual = aggregate(table, 'foo', approxdistinct(), 'bar')
+    expect = (('foo', 'value'), ('a', 2), ('b', 1))
+    ieq(expect, actual)
+
+
+def test_hyperloglog_merge_serialize():
+
+    h1 = HyperLogLog()
+    h1.update(range(0, 3000))
+    h2 = HyperLogLog.frombytes(HyperLogLog().tobytes())
+    h2.update(range(2000, 5000))
+    h3 = HyperLogLog.frombytes(h1.tobytes())
+    h3 |= h2
+    actual = h3.count()
+    assert abs(actual - 5000) < 5000 * 0.04, actual
+    eq_(h1.count(), HyperLogLog.frombytes(h1.tobytes()).count())
+
+
+def test_hyperloglog_merge_precision_mismatch():
+
+    try:
+        HyperLogLog(p=10).merge(HyperLogLog(p=12))
+    except ValueError:
+        pass
+    else:
+        assert False, 'expected ValueError'
+
+
+def test_hyperloglog_sparse():
+
+    # sparse and dense sketches give the same estimates
+    h1 = HyperLogLog(p=10)
+    h1.update(range(10))
+    assert h1._dense is None
+    eq_(10, h1.count())
+    h2 = HyperLogLog(p=10)
+    h2.update(range(5, 500))
+    assert h2._dense is not None
+    eq_(h1.tobytes(), HyperLogLog.frombytes(h1.tobytes()).tobytes())
+    h3 = HyperLogLog.frombytes(h2.tobytes())
+    h3.merge(h1)
+    h1.merge(h2)
+    eq_(h1.tobytes(), h3.tobytes())
+    assert abs(h1.count() - 500) < 500 * 0.1, h1.count()
+
+
+def test_hyperloglog_canonical_values():
+
+    h = HyperLogLog()
+    h.update([1, 1.0, True, u'1', (1, 2), [1.0, 2]])
+    eq_(3, h.count())  # 1, '1' and (1, 2)
@@ -0,0 +1,63 @@
+from __future__ import absolute_import, print_function, division
+
+
+import binascii
+from datetime import datetime, date
+from decimal import Decimal
+
+
+from petl.test.helpers import eq_
+from petl.util.base import Record
+from petl.util.hashing import rowdigest, rowdigester
+
+
+def test_rowdigest():
+
+    d = rowdigest((u'a', 1, None))
+    eq_(16, len(d))
+    eq_(d, rowdigest([u'a', 1, None]))
+    # equal numbers have equal digests
+    eq_(d, rowdigest((u'a', 1.0, None)))
+    eq_(d, rowdigest((u'a', True, None)))
+    eq_(d, rowdigest((u'a', Decimal('1.0'), None)))
+    eq_(rowdigest((0.5,)), rowdigest((Decimal('0.5'),)))
+    # different types or values have different digests
+    assert d != rowdigest((u'a', u'1', None))
+    assert d != rowdigest((u'a', b'1', None))
+    assert d != rowdigest((u'a', 2, None))
+    assert d != rowdigest((u'a', 1, u''))
+    assert d != rowdigest((u'a', (1,), None))
+    assert rowdigest((u'ab', u'c')) != rowdigest((u'a', u'bc'))
+    assert rowdigest((date(2020, 1, 2),)) \
+        != rowdigest((datetime(2020, 1, 2),))
+    eq_(rowdigest(((1, 2), [3])), rowdigest(([1, 2], (3,))))
+    # stable across interpreter runs and versions
+    eq_(b'8b135b4b6bf165a997e580c253156952',
+        binascii.hexlify(rowdigest((u'A', 1))))
+    eq_(20, len(rowdigest((u'A', 1), algorithm='sha1')))
+
+
+def test_rowdigester():
+
+    flds = ('foo', 'bar', 'baz')
+    rec1 = Record(('a', 1, True), flds)
+    rec2 = Record(('a', 1.0, False), flds)
+    f = rowdigester(['foo', 'bar'])
+    eq_(f(rec1), f(rec2))
+    f = rowdigester('baz')
+    assert f(rec1) != f(rec2)
+    f = rowdigester()
+    eq_(rowdigest(rec1), f(rec1))
+
+
+def test_rowdigest_without_blake2(monkeypatch):
+
+    import hashlib
+    import petl.util.hashing
+    monkeypatch.setattr(petl.util.hashing, '_algorithms', ())
+    d = rowdigest((u'a', 1, None))
+    eq_(16, len(d))
+    eq_(d, rowdigest((u'a', 1.0, None), algorithm='blake2s'))
+    h = hashlib.sha1()
+    h.update(petl.util.hashing._serialize((u'a', 1, None)))
+    eq_(h.digest()[:16], d)
@@ -0,0 +1,82 @@
+from __future__ import absolute_import, print_function, division
+
+
+from petl.test.helpers import eq_
+from petl.util.base import header
+from petl.util.profiling import profile
+
+
+table = [('foo', 'bar', 'baz')] + \
+    [('a%s' % (i % 5), i, None if i % 4 == 0 else 'x-%s' % i)
+     for i in range(100)] + \
+    [('b',)]
+
+
+def test_profile():
+
+    p = profile(table, topn=3)
+    eq_(('field', 'count', 'nulls', 'distinct', 'types', 'min', 'max',
+         'mean', 'pstdev', 'top', 'patterns'), header(p))
+    rows = dict((r[0], r) for r in p.data())
+    eq_(['foo', 'bar', 'baz'], list(p.profiles))
+
+    foo = rows['foo']
+    eq_(101, foo[1])
+    eq_(0, foo[2])
+    eq_(6, foo[3])
+    eq_([('str', 101)], foo[4])
+    eq_('a0', foo[5])
+    eq_('b', foo[6])
+    eq_(None, foo[7])
+    eq_(3, len(foo[9]))
+    eq_(20, foo[9][0][1])
+    eq_([('a9', 100), ('a', 1)], foo[10])
+
+    bar = rows['bar']
+    eq_(1, bar[2])  # short row
+    eq_(100, bar[3])
+    eq_(0, bar[5])
+    eq_(99, bar[6])
+    eq_(49.5, bar[7])
+    stats = p.profiles['bar'].stats()
+    eq_(100, stats.count)
+    eq_(0, stats.errors)
+    eq_(4950, stats.sum)
+
+    baz = rows['baz']
+    eq_(26, baz[2])
+    eq_([('str', 75), ('NoneType', 26)], baz[4])
+    eq_(75, p.profiles['baz'].stats().errors)
+    eq_([('a-99', 68), ('a-9', 7)], baz[10])
+
+
+def test_profile_fields_and_sample():
+
+    p = profile(table, fields=('bar',), sample=.5, seed=42)
+    rows = list(p.data())
+    eq_(1, len(rows))
+    assert 20 < rows[0][1] < 80, rows[0][1]
+
+
+def test_profile_merge():
+
+    p1 = profile(table[:51])
+    p2 = profile([table[0]] + table[51:])
+    p1.merge(p2)
+    expect = list(profile(table).data())
+    actual = list(p1.data())
+    for e, a in zip(expect, actual):
+        eq_(e[:7], a[:7])
+    eq_(expect[0][9], actual[0][9])
+    eq_(49.5, round(actual[1][7], 6))
+    eq_(round(expect[1][8], 6), round(actual[1][8], 6))
+
+
+def test_profile_processes():
+
+    expect = list(profile(table).data())
+    actual = list(profile(table, processes=2, chunksize=7).data())
+    for e, a in zip(expect, actual):
+        eq_(e[:7], a[:7])
+    eq_(sorted(expect[0][9]), sorted(actual[0][9]))
+    eq_(49.5, round(actual[1][7], 6))
@@ -1,8 +1,13 @@
 from __future__ import absolute_import, print_function, division
 
 
-from petl.test.helpers import eq_
-from petl.util.statistics import stats
+import pickle
+
+
+from petl.test.helpers import eq_, ieq
+from petl.util.statistics import stats, quantiles, approxquantiles, \
+    histogram, KLLSketch
+from petl.transform.reductions import aggregate
 
 
 def test_stats():
@@ -23,3 +28,74 @@ def test_stats():
     eq_(2.0, result.mean)
     eq_(2/3, result.pvariance)
     eq_((2/3)**.5, result.pstdev)
+
+
+def test_quantiles():
+
+    table = [('foo',)] + [(v,) for v in range(1, 101)] + [('xyz',)]
+    actual = quantiles(table, 'foo', qs=(0, .5, .9, 1))
+    eq_((1.0, 50.0, 90.0, 100.0), actual)
+
+
+def test_quantiles_empty():
+
+    table = [('foo',)]
+    eq_((None, None), quantiles(table, 'foo', qs=(.5, .9)))
+
+
+def test_quantiles_large():
+
+    table = [('foo',)] + [(v,) for v in range(100000)]
+    p50, p99 = quantiles(table, 'foo', qs=(.5, .99))
+    assert abs(p50 - 50000) < 2000, p50
+    assert abs(p99 - 99000) < 2000, p99
+
+
+def test_kllsketch_merge_pickle():
+
+    s1 = KLLSketch(k=100)
+    s1.update(range(0, 30000))
+    s2 = pickle.loads(pickle.dumps(KLLSketch(k=100)))
+    s2.update(range(30000, 60000))
+    s1.merge(s2)
+    eq_(60000, len(s1))
+    assert abs(s1.quantile(.5) - 30000) < 3000, s1.quantile(.5)
+
+
+def test_approxquantiles_aggregate():
+
+    table = (('foo', 'bar'),
+             ('a', 3),
+             ('a', 7),
+             ('a', 1),
+             ('b', 2))
+    actual = aggregate(table, 'foo', approxquantiles((0, 1)), 'bar')
+    expect = (('foo', 'value'), ('a', (1, 7)), ('b', (2, 2)))
+    ieq(expect, actual)
+
+
+def test_histogram():
+
+    table = (('foo', 'bar'),
+             ('a', 1),
+             ('b', 2.5),
+             ('c', 4),
+             ('d', 'xyz'),
+             ('e', 8),
+             ('f', 9))
+    actual = histogram(table, 'bar', bins=[0, 2, 4, 8])
+    expect = (('lower', 'upper', 'count'),
+              (0, 2, 1),
+              (2, 4, 1),
+              (4, 8, 2))
+    ieq(expect, actual)
+    actual = histogram(table, 'bar', bins=2, range=(0, 10))
+    expect = (('lower', 'upper', 'count'),
+              (0., 5., 3),
+              (5., 10., 2))
+    ieq(expect, actual)
+    actual = histogram(table, 'bar', bins=2)
+    expect = (('lower', 'upper', 'count'),
+              (1., 5., 3),
+              (5., 9., 2))
+    ieq(expect, actual)
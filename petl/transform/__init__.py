@@ -2,7 +2,7 @@ from __future__ import absolute_import, print_function, division
 
 from petl.transform.basics import cut, cutout, movefield, cat, annex, \
     addfield, addfieldusingcontext, addrownumbers, addcolumn, rowslice, head, \
-    tail, skipcomments, stack, addfields
+    tail, skipcomments, stack, addfields, addrowdigest
 
 from petl.transform.headers import rename, setheader, extendheader, \
     pushheader, skip, prefixheader, suffixheader, sortheader
@@ -28,7 +28,8 @@ from petl.transform.hashjoins import hashjoin, hashleftjoin, hashrightjoin, \
 
 from petl.transform.reductions import rowreduce, mergeduplicates,\
     aggregate, groupcountdistinctvalues, groupselectfirst, groupselectmax, \
-    groupselectmin, merge, fold, Conflict, groupselectlast
+    groupselectmin, merge, fold, Conflict, groupselectlast, groupingsets, \
+    rollup, cube
 
 from petl.transform.fills import filldown, fillright, fillleft
 
@@ -40,13 +41,16 @@ from petl.transform.reshape import melt, recast, transpose, pivot, flatten, \
 
 from petl.transform.maps import fieldmap, rowmap, rowmapmany, rowgroupmap
 
+from petl.transform.asyncmaps import aconvert, aaddfield, amap
+
 from petl.transform.unpacks import unpack, unpackdict
 
 from petl.transform.dedup import duplicates, unique, distinct, conflicts, \
     isunique
 
 from petl.transform.setops import complement, intersection, \
-    recordcomplement, diff, recorddiff, hashintersection, hashcomplement
+    recordcomplement, diff, recorddiff, hashintersection, hashcomplement, \
+    keydiff
 
 from petl.transform.intervals import intervaljoin, intervalleftjoin, \
     intervaljoinvalues, intervalantijoin, intervallookup, intervallookupone, \
@@ -55,3 +59,10 @@ from petl.transform.intervals import intervaljoin, intervalleftjoin, \
     facetintervalrecordlookupone, collapsedintervals
 
 from petl.transform.validation import validate
+
+from petl.transform.windows import window, rownumber, rank, denserank, lag, \
+    lead, cumsum, cumcount, movingsum, movingavg, movingmin, movingmax
+
+from petl.transform.fusion import fuse
+
+from petl.transform.plan import plan, optimize, explain
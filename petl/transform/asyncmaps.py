@@ -0,0 +1,345 @@
+from __future__ import absolute_import, print_function, division
+
+
+from collections import deque
+from petl.compat import next, text_type
+
+
+import petl.config as config
+from petl.util.base import Table, asindices, _recordclass, _sourceheader, \
+    _derivedheader
+from petl.transform.basics import stack
+
+
+def aconvert(table, field, function, failonerror=None, errorvalue=None,
+             concurrency=10, window=None):
+    """
+    Transform values under one or more fields via an asynchronous function,
+    e.g., one calling a remote service. E.g.::
+
+        >>> import asyncio
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar'],
+        ...           ['a', 1],
+        ...           ['b', 2],
+        ...           ['c', 3]]
+        >>> async def lookup(v):
+        ...     await asyncio.sleep(0.01 * (3 - v))  # e.g., a request
+        ...     return v * 10
+        ...
+        >>> table2 = etl.aconvert(table1, 'bar', lookup)
+        >>> table2
+        +-----+-----+
+        | foo | bar |
+        +=====+=====+
+        | 'a' |  10 |
+        +-----+-----+
+        | 'b' |  20 |
+        +-----+-----+
+        | 'c' |  30 |
+        +-----+-----+
+
+    The `function` should be defined with ``async def``, and is run on an
+    :mod:`asyncio` event loop started for each iteration over the table. Up
+    to `concurrency` calls are run at the same time, and up to `window` rows
+    (four times `concurrency` by default) are read ahead of the row being
+    yielded, so calls on later rows can proceed while waiting for an earlier
+    one. Rows are always yielded in order. Outstanding calls are cancelled if
+    iteration stops early. As the event loop is run by the iterating thread,
+    the table cannot be iterated from code already running in an event loop.
+
+    The `failonerror` and `errorvalue` keyword arguments are documented
+    under :func:`petl.config.failonerror`
+
+    See also :func:`petl.transform.conversions.convert`.
+
+    """
+
+    return AsyncConvertView(table, field, function, failonerror=failonerror,
+                            errorvalue=errorvalue, concurrency=concurrency,
+                            window=window)
+
+
+Table.aconvert = aconvert
+
+
+class AsyncConvertView(Table):
+
+    def __init__(self, source, field, function, failonerror=None,
+                 errorvalue=None, concurrency=10, window=None):
+        self.source = source
+        self.field = field
+        self.function = function
+        self.failonerror = (config.failonerror if failonerror is None
+                            else failonerror)
+        self.errorvalue = errorvalue
+        self.concurrency = concurrency
+        self.window = window
+
+    def _staticheader(self):
+        return _sourceheader(self.source)
+
+    def __iter__(self):
+        return iteraconvert(self.source, self.field, self.function,
+                            self.failonerror, self.errorvalue,
+                            self.concurrency, self.window)
+
+
+def iteraconvert(source, field, function, failonerror, errorvalue,
+                 concurrency, window):
+    it = iter(source)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        return
+    if isinstance(field, (list, tuple)):
+        indices = asindices(hdr, field)
+    else:
+        indices = asindices(hdr, (field,))
+    yield tuple(hdr)
+
+    def getargs(row):
+        return [row[i] for i in indices if i < len(row)]
+
+    for row, results in _iterawaited(it, function, getargs, concurrency,
+                                     window):
+        row = list(row)
+        for i, (v, e) in zip(indices, results):
+            if e is None:
+                row[i] = v
+            elif failonerror == 'inline':
+                row[i] = e
+            elif failonerror:
+                raise e
+            else:
+                row[i] = errorvalue
+        yield tuple(row)
+
+
+def aaddfield(table, field, value, index=None, missing=None, failonerror=None,
+              errorvalue=None, concurrency=10, window=None):
+    """
+    Add a field with a value calculated by an asynchronous function of each
+    row. E.g.::
+
+        >>> import asyncio
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar'],
+        ...           ['M', 12],
+        ...           ['F', 34]]
+        >>> async def lookup(rec):
+        ...     await asyncio.sleep(0)  # e.g., a request
+        ...     return rec.bar * 2
+        ...
+        >>> table2 = etl.aaddfield(table1, 'baz', lookup)
+        >>> table2
+        +-----+-----+-----+
+        | foo | bar | baz |
+        +=====+=====+=====+
+        | 'M' |  12 |  24 |
+        +-----+-----+-----+
+        | 'F' |  34 |  68 |
+        +-----+-----+-----+
+
+    See :func:`aconvert` for how the function is run, and
+    :func:`petl.transform.basics.addfield`.
+
+    """
+
+    return AsyncAddFieldView(table, field, value, index=index,
+                             missing=missing, failonerror=failonerror,
+                             errorvalue=errorvalue, concurrency=concurrency,
+                             window=window)
+
+
+Table.aaddfield = aaddfield
+
+
+class AsyncAddFieldView(Table):
+
+    def __init__(self, source, field, value, index=None, missing=None,
+                 failonerror=None, errorvalue=None, concurrency=10,
+                 window=None):
+        # ensure rows are all the same length
+        self.source = stack(source, missing=missing)
+        self.field = field
+        self.value = value
+        self.index = index
+        self.failonerror = (config.failonerror if failonerror is None
+                            else failonerror)
+        self.errorvalue = errorvalue
+        self.concurrency = concurrency
+        self.window = window
+
+    def _staticheader(self):
+        return _derivedheader(self)
+
+    def __iter__(self):
+        return iteraaddfield(self.source, self.field, self.value, self.index,
+                             self.failonerror, self.errorvalue,
+                             self.concurrency, self.window)
+
+
+def iteraaddfield(source, field, value, index, failonerror, errorvalue,
+                  concurrency, window):
+    it = iter(source)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        hdr = []
+    if index is None:
+        index = len(hdr)
+    outhdr = list(hdr)
+    outhdr.insert(index, field)
+    yield tuple(outhdr)
+
+    record = _recordclass(list(map(text_type, hdr)))
+    for row, results in _iterawaited(it, value, lambda r: [record(r)],
+                                     concurrency, window):
+        v, e = results[0]
+        if e is not None:
+            if failonerror == 'inline':
+                v = e
+            elif failonerror:
+                raise e
+            else:
+                v = errorvalue
+        row = tuple(row)
+        yield row[:index] + (v,) + row[index:]
+
+
+def amap(table, rowmapper, header, failonerror=None, concurrency=10,
+         window=None):
+    """
+    Transform rows via an asynchronous function. E.g.::
+
+        >>> import asyncio
+        >>> import petl as etl
+        >>> table1 = [['id', 'sex'],
+        ...           [1, 'male'],
+        ...           [2, 'female']]
+        >>> async def rowmapper(rec):
+        ...     await asyncio.sleep(0)  # e.g., a request
+        ...     return [rec.id, rec.sex[0].upper()]
+        ...
+        >>> table2 = etl.amap(table1, rowmapper, header=['id', 'gender'])
+        >>> table2
+        +----+--------+
+        | id | gender |
+        +====+========+
+        |  1 | 'M'    |
+        +----+--------+
+        |  2 | 'F'    |
+        +----+--------+
+
+    See :func:`aconvert` for how the function is run, and
+    :func:`petl.transform.maps.rowmap`. As with :func:`rowmap`, rows for
+    which the function fails are skipped unless `failonerror` is set.
+
+    """
+
+    return AsyncRowMapView(table, rowmapper, header, failonerror=failonerror,
+                           concurrency=concurrency, window=window)
+
+
+Table.amap = amap
+
+
+class AsyncRowMapView(Table):
+
+    def __init__(self, source, rowmapper, header, failonerror=None,
+                 concurrency=10, window=None):
+        self.source = source
+        self.rowmapper = rowmapper
+        self.header = header
+        self.failonerror = (config.failonerror if failonerror is None
+                            else failonerror)
+        self.concurrency = concurrency
+        self.window = window
+
+    def _staticheader(self):
+        return _derivedheader(self)
+
+    def __iter__(self):
+        return iteramap(self.source, self.rowmapper, self.header,
+                        self.failonerror, self.concurrency, self.window)
+
+
+def iteramap(source, rowmapper, header, failonerror, concurrency, window):
+    it = iter(source)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        return
+    yield tuple(header)
+    record = _recordclass(list(map(text_type, hdr)))
+    for _, results in _iterawaited(it, rowmapper, lambda r: [record(r)],
+                                   concurrency, window):
+        outrow, e = results[0]
+        if e is None:
+            yield tuple(outrow)
+        elif failonerror == 'inline':
+            yield tuple([e])
+        elif failonerror:
+            raise e
+
+
+def _iterawaited(items, function, getargs, concurrency, window):
+    # call `function` on the arguments given by `getargs` for each item,
+    # running the resulting awaitables on an event loop, and yield each item in
+    # order with a list of (result, error) pairs, one per argument
+    import asyncio
+    concurrency = max(concurrency, 1)
+    if window is None:
+        window = 4 * concurrency
+    window = max(window, 1)
+    loop = asyncio.new_event_loop()
+    pending = deque()  # [item, args, tasks], in order
+    running = set()
+    items = iter(items)
+    exhausted = False
+    try:
+        while True:
+            # read ahead
+            while not exhausted and len(pending) < window:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                else:
+                    pending.append([item, getargs(item), None])
+            if not pending:
+                return
+            # start calls, in order, while there are free slots
+            for entry in pending:
+                if entry[2] is not None:
+                    continue
+                if running and len(running) + len(entry[1]) > concurrency:
+                    break
+                entry[2] = [asyncio.ensure_future(function(arg), loop=loop)
+                            for arg in entry[1]]
+                running.update(entry[2])
+            item, _, tasks = pending[0]
+            if all(t.done() for t in tasks):
+                pending.popleft()
+                results = []
+                for t in tasks:
+                    e = t.exception()
+                    results.append((None if e else t.result(), e))
+                yield item, results
+            else:
+                done, _ = loop.run_until_complete(
+                    asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                )
+                running.difference_update(done)
+    finally:
+        # cancel any outstanding calls, e.g., if iteration stops early
+        outstanding = [t for entry in pending for t in entry[2] or ()
+                       if not t.done()]
+        for t in outstanding:
+            t.cancel()
+        if outstanding:
+            loop.run_until_complete(
+                asyncio.gather(*outstanding, return_exceptions=True)
+            )
+        loop.close()
@@ -2,6 +2,7 @@ from __future__ import absolute_import, print_function, division
 
 
 # standard library dependencies
+import binascii
 from itertools import islice, chain
 from collections import deque
 from itertools import count
@@ -9,7 +10,11 @@ from petl.compat import izip, izip_longest, next, string_types, text_type
 
 
 # internal dependencies
-from petl.util.base import asindices, rowgetter, Record, Table
+import petl.config as config
+from petl.util.base import asindices, rowgetter, Table, _recordclass, \
+    _sourceheader, _derivedheader, header, _sourcetypes, _selecttypes, \
+    iterbatches, _unbatched, _columnrecord, _vectorcall, _itertuples
+from petl.util.hashing import _digestgetter
 
 
 import logging
@@ -116,11 +121,25 @@ Table.cut = cut
 
 class CutView(Table):
 
+    _tuplerows = True
+
     def __init__(self, source, spec, missing=None):
         self.source = source
         self.spec = spec
         self.missing = missing
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
+    def _fieldtypes(self):
+        types = _sourcetypes(self.source)
+        if types is None:
+            return None
+        return _selecttypes(types, asindices(header(self.source), self.spec))
+
+    def _iterbatches(self, size):
+        return _itercutbatches(self.source, self.spec, self.missing, size)
+
     def __iter__(self):
         return itercut(self.source, self.spec, self.missing)
 
@@ -152,6 +171,28 @@ def itercut(source, spec, missing=None):
             yield tuple(row[i] if i < len(row) else missing for i in indices)
 
 
+def _itercutbatches(source, spec, missing, size, complement=False):
+    it = iterbatches(source, size)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        hdr = []
+    indices = asindices(hdr, tuple(spec))
+    if complement:
+        indices = [i for i in range(len(hdr)) if i not in indices]
+    transform = rowgetter(*indices)
+    yield transform(hdr)
+    n = max(indices) + 1 if indices else 0
+    for batch in it:
+        if min(map(len, batch)) >= n:
+            yield list(map(transform, batch))
+        else:
+            # some rows are short, fill in any missing fields
+            yield [tuple(row[i] if i < len(row) else missing
+                         for i in indices)
+                   for row in batch]
+
+
 def cutout(table, *args, **kwargs):
     """
     Remove fields. E.g.::
@@ -191,11 +232,29 @@ Table.cutout = cutout
 
 class CutOutView(Table):
 
+    _tuplerows = True
+
     def __init__(self, source, spec, missing=None):
         self.source = source
         self.spec = spec
         self.missing = missing
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
+    def _fieldtypes(self):
+        types = _sourcetypes(self.source)
+        if types is None:
+            return None
+        hdr = header(self.source)
+        indicesout = asindices(hdr, self.spec)
+        return _selecttypes(types, [i for i in range(len(hdr))
+                                    if i not in indicesout])
+
+    def _iterbatches(self, size):
+        return _itercutbatches(self.source, self.spec, self.missing, size,
+                               complement=True)
+
     def __iter__(self):
         return itercutout(self.source, self.spec, self.missing)
 
@@ -335,11 +394,19 @@ Table.cat = cat
 
 class CatView(Table):
 
+    _tuplerows = True
+
     def __init__(self, sources, missing=None, header=None):
         self.sources = sources
         self.missing = missing
         self.header = header
 
+    def _staticheader(self):
+        return _derivedheader(self, listattr='sources')
+
+    def _iterbatches(self, size):
+        return _itercatbatches(self.sources, self.missing, self.header, size)
+
     def __iter__(self):
         return itercat(self.sources, self.missing, self.header)
 
@@ -386,6 +453,38 @@ def itercat(sources, missing, header):
             yield tuple(outrow)
 
 
+def _itercatbatches(sources, missing, header, size):
+    its = [iterbatches(t, size) for t in sources]
+    hdrs = [list(next(it, [])) for it in its]
+    if header is None:
+        outhdr = list(hdrs[0])
+        for hdr in hdrs[1:]:
+            for h in hdr:
+                if h not in outhdr:
+                    outhdr.append(h)
+    else:
+        outhdr = header
+    yield tuple(outhdr)
+    for hdr, it in zip(hdrs, its):
+        # index of each output field in this source, or None if not present
+        indices = [hdr.index(h) if h in hdr else None for h in outhdr]
+        present = [i for i in indices if i is not None]
+        n = max(present) + 1 if present else 0
+        if len(present) == len(indices):
+            transform = rowgetter(*indices)
+        else:
+            def transform(row):
+                return tuple(missing if i is None else row[i]
+                             for i in indices)
+        for batch in it:
+            if min(map(len, batch)) >= n:
+                yield list(map(transform, batch))
+            else:
+                yield [tuple(missing if i is None or i >= len(row)
+                             else row[i] for i in indices)
+                       for row in batch]
+
+
 def stack(*tables, **kwargs):
     """Concatenate tables, without trying to match headers. E.g.::
 
@@ -450,18 +549,32 @@ Table.stack = stack
 
 class StackView(Table):
 
+    _tuplerows = True
+
     def __init__(self, sources, missing=None, trim=True, pad=True):
         self.sources = sources
         self.missing = missing
         self.trim = trim
         self.pad = pad
 
+    def _staticheader(self):
+        return _derivedheader(self, listattr='sources')
+
+    def _fieldtypes(self):
+        if len(self.sources) == 1:
+            return _sourcetypes(self.sources[0])
+        return None
+
+    def _iterbatches(self, size):
+        return _iterstackbatches(self.sources, self.missing, self.trim,
+                                 self.pad, size)
+
     def __iter__(self):
         return iterstack(self.sources, self.missing, self.trim, self.pad)
 
 
 def iterstack(sources, missing, trim, pad):
-    its = [iter(t) for t in sources]
+    its = [_itertuples(t) for t in sources]
     hdrs = []
     for it in its:
         try:
@@ -473,15 +586,34 @@ def iterstack(sources, missing, trim, pad):
     yield tuple(hdr)
     for it in its:
         for row in it:
-            outrow = tuple(row)
             if trim:
-                outrow = outrow[:n]
-            if pad and len(outrow) < n:
-                outrow += (missing,) * (n - len(outrow))
-            yield outrow
+                row = row[:n]
+            if pad and len(row) < n:
+                row += (missing,) * (n - len(row))
+            yield row
 
 
-def addfield(table, field, value=None, index=None, missing=None):
+def _iterstackbatches(sources, missing, trim, pad, size):
+    its = [iterbatches(t, size) for t in sources]
+    hdrs = [next(it, []) for it in its]
+    hdr = hdrs[0]
+    n = len(hdr)
+    yield tuple(hdr)
+    for it in its:
+        for batch in it:
+            batch = list(map(tuple, batch))
+            lengths = set(map(len, batch))
+            if (trim and max(lengths) > n) or (pad and min(lengths) < n):
+                batch = [row[:n] if trim else row for row in batch]
+                if pad:
+                    batch = [row + (missing,) * (n - len(row))
+                             if len(row) < n else row
+                             for row in batch]
+            yield batch
+
+
+def addfield(table, field, value=None, index=None, missing=None,
+             vectorized=False):
     """
     Add a field with a fixed or calculated value. E.g.::
 
@@ -518,10 +650,18 @@ def addfield(table, field, value=None, index=None, missing=None):
 
     Use the `index` parameter to control the position of the inserted field.
 
+    If `vectorized=True` is given and :mod:`numpy` is installed, values are
+    calculated in batches (see :func:`petl.util.base.iterbatches`), with the
+    function called once per batch on a record holding whole columns, and
+    numeric columns given as numpy arrays, e.g., ``etl.addfield(table,
+    'baz', lambda rec: rec.bar * 2, vectorized=True)``. The function should
+    return an array with one value per row, otherwise values are calculated
+    one row at a time as usual.
+
     """
 
     return AddFieldView(table, field, value=value, index=index,
-                        missing=missing)
+                        missing=missing, vectorized=vectorized)
 
 
 Table.addfield = addfield
@@ -529,19 +669,43 @@ Table.addfield = addfield
 
 class AddFieldView(Table):
 
-    def __init__(self, source, field, value=None, index=None, missing=None):
+    _tuplerows = True
+
+    def __init__(self, source, field, value=None, index=None, missing=None,
+                 vectorized=False):
         # ensure rows are all the same length
         self.source = stack(source, missing=missing)
         self.field = field
         self.value = value
         self.index = index
+        self.vectorized = vectorized
+
+    def _staticheader(self):
+        return _derivedheader(self)
+
+    def _fieldtypes(self):
+        types = _sourcetypes(self.source)
+        if types is None:
+            return None
+        types = list(types)
+        index = len(types) if self.index is None else self.index
+        value = self.value
+        types.insert(index, None if value is None or callable(value)
+                     else type(value))
+        return types
+
+    def _iterbatches(self, size):
+        return _iteraddfieldbatches(self.source, self.field, self.value,
+                                    self.index, size, self.vectorized)
 
     def __iter__(self):
+        if self.vectorized and callable(self.value):
+            return _unbatched(self._iterbatches(config.batchsize))
         return iteraddfield(self.source, self.field, self.value, self.index)
 
 
 def iteraddfield(source, field, value, index):
-    it = iter(source)
+    it = _itertuples(source)
     try:
         hdr = next(it)
     except StopIteration:
@@ -559,17 +723,49 @@ def iteraddfield(source, field, value, index):
 
     if callable(value):
         # wrap rows as records if using calculated value
-        it = (Record(row, flds) for row in it)
+        record = _recordclass(flds)
         for row in it:
-            outrow = list(row)
-            v = value(row)
-            outrow.insert(index, v)
-            yield tuple(outrow)
+            v = value(record(row))
+            yield row[:index] + (v,) + row[index:]
     else:
+        v = (value,)
         for row in it:
-            outrow = list(row)
-            outrow.insert(index, value)
-            yield tuple(outrow)
+            yield row[:index] + v + row[index:]
+
+
+def _iteraddfieldbatches(source, field, value, index, size,
+                         vectorized=False):
+    it = iterbatches(source, size)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        hdr = []
+    if index is None:
+        index = len(hdr)
+    outhdr = list(hdr)
+    outhdr.insert(index, field)
+    yield tuple(outhdr)
+    if callable(value):
+        flds = list(map(text_type, hdr))
+        record = _recordclass(flds)
+        if vectorized:
+            import numpy as np
+        for batch in it:
+            batch = list(map(tuple, batch))
+            values = None
+            if vectorized:
+                rec = _columnrecord(np, flds, batch)
+                if rec is not None:
+                    values = _vectorcall(np, value, rec, len(batch))
+            if values is None:
+                values = [value(record(row)) for row in batch]
+            yield [row[:index] + (v,) + row[index:]
+                   for row, v in zip(batch, values)]
+    else:
+        v = (value,)
+        for batch in it:
+            yield [row[:index] + v + row[index:]
+                   for row in map(tuple, batch)]
 
 
 def addfields(table, field_defs, missing=None):
@@ -628,6 +824,9 @@ class AddFieldsView(Table):
         # convert tuples to FieldDefinitions, if necessary
         self.field_defs = field_defs
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
     def __iter__(self):
         return iteraddfields(self.source, self.field_defs)
 
@@ -659,6 +858,7 @@ def iteraddfields(source, field_defs):
         value_indexes.append((value, index))
     yield tuple(outhdr)
 
+    record = _recordclass(flds)
     for row in it:
         outrow = list(row)
 
@@ -666,7 +866,7 @@ def iteraddfields(source, field_defs):
         for value, index in value_indexes:
             if callable(value):
                 # wrap row as record if using calculated value
-                row = Record(row, flds)
+                row = record(row)
                 v = value(row)
                 outrow.insert(index, v)
             else:
@@ -736,6 +936,8 @@ Table.rowslice = rowslice
 
 class RowSliceView(Table):
 
+    _tuplerows = True
+
     def __init__(self, source, *sliceargs):
         self.source = source
         if not sliceargs:
@@ -743,18 +945,24 @@ class RowSliceView(Table):
         else:
             self.sliceargs = sliceargs
 
+    def _staticheader(self):
+        return _sourceheader(self.source)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.source)
+
     def __iter__(self):
         return iterrowslice(self.source, self.sliceargs)
 
 
 def iterrowslice(source, sliceargs):
-    it = iter(source)
+    it = _itertuples(source)
     try:
-        yield tuple(next(it))  # fields
+        yield next(it)  # fields
     except StopIteration:
         return
     for row in islice(it, *sliceargs):
-        yield tuple(row)
+        yield row
 
 
 def head(table, n=5):
@@ -838,18 +1046,26 @@ Table.tail = tail
 
 class TailView(Table):
 
+    _tuplerows = True
+
     def __init__(self, source, n):
         self.source = source
         self.n = n
 
+    def _staticheader(self):
+        return _sourceheader(self.source)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.source)
+
     def __iter__(self):
         return itertail(self.source, self.n)
 
 
 def itertail(source, n):
-    it = iter(source)
+    it = _itertuples(source)
     try:
-        yield tuple(next(it))  # fields
+        yield next(it)  # fields
     except StopIteration:
         return  # stop generating
     cache = deque()
@@ -858,7 +1074,7 @@ def itertail(source, n):
         if len(cache) > n:
             cache.popleft()
     for row in cache:
-        yield tuple(row)
+        yield row
 
 
 def skipcomments(table, prefix):
@@ -931,6 +1147,9 @@ class MoveFieldView(Table):
         self.index = index
         self.missing = missing
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('table',))
+
     def __iter__(self):
         it = iter(self.table)
 
@@ -999,6 +1218,9 @@ class AnnexView(Table):
         self.tables = tables
         self.missing = missing
 
+    def _staticheader(self):
+        return _derivedheader(self, listattr='tables')
+
     def __iter__(self):
         return iterannex(self.tables, self.missing)
 
@@ -1069,6 +1291,9 @@ class AddRowNumbersView(Table):
         self.step = step
         self.field = field
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('table',))
+
     def __iter__(self):
         return iteraddrownumbers(self.table, self.start, self.step, self.field)
 
@@ -1088,6 +1313,80 @@ def iteraddrownumbers(table, start, step, field):
         yield tuple(outrow)
 
 
+def addrowdigest(table, field='digest', fields=None, algorithm='blake2b',
+                 binary=False):
+    """
+    Add a field containing a digest of the values in each row. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar'],
+        ...           ['A', 1],
+        ...           ['B', 2],
+        ...           ['A', 1.0]]
+        >>> table2 = etl.addrowdigest(table1)
+        >>> table2
+        +-----+-----+------------------------------------+
+        | foo | bar | digest                             |
+        +=====+=====+====================================+
+        | 'A' |   1 | '8b135b4b6bf165a997e580c253156952' |
+        +-----+-----+------------------------------------+
+        | 'B' |   2 | '1811fc9c5c147e932aa42b2520d425c8' |
+        +-----+-----+------------------------------------+
+        | 'A' | 1.0 | '8b135b4b6bf165a997e580c253156952' |
+        +-----+-----+------------------------------------+
+
+    Digests are computed as for :func:`petl.util.hashing.rowdigest`, over the
+    values of the given `fields` (by default, all fields), and are output as
+    hexadecimal strings, or as bytes if `binary` is True. Digests are stable
+    across Python versions and platforms, and can be used for change
+    detection or as compact keys, e.g., for
+    :func:`petl.transform.dedup.distinct`.
+
+    """
+
+    return AddRowDigestView(table, field=field, fields=fields,
+                            algorithm=algorithm, binary=binary)
+
+
+Table.addrowdigest = addrowdigest
+
+
+class AddRowDigestView(Table):
+
+    def __init__(self, table, field='digest', fields=None,
+                 algorithm='blake2b', binary=False):
+        self.table = table
+        self.field = field
+        self.fields = fields
+        self.algorithm = algorithm
+        self.binary = binary
+
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('table',))
+
+    def __iter__(self):
+        return iteraddrowdigest(self.table, self.field, self.fields,
+                                self.algorithm, self.binary)
+
+
+def iteraddrowdigest(table, field, fields, algorithm, binary):
+    it = iter(table)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        hdr = []
+    index = len(hdr)
+    yield tuple(hdr) + (field,)
+    getdigest = _digestgetter(hdr, fields, algorithm=algorithm)
+    for row in it:
+        d = getdigest(row)
+        if not binary:
+            d = binascii.hexlify(d).decode('ascii')
+        outrow = list(row)
+        outrow.insert(index, d)
+        yield tuple(outrow)
+
+
 def addcolumn(table, field, col, index=None, missing=None):
     """
     Add a column of data to the table. E.g.::
@@ -1126,6 +1425,9 @@ class AddColumnView(Table):
         self._index = index
         self._missing = missing
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('_table',))
+
     def __iter__(self):
         return iteraddcolumn(self._table, self._field, self._col,
                              self._index, self._missing)
@@ -1219,6 +1521,9 @@ class AddFieldUsingContextView(Table):
         self.field = field
         self.query = query
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('table',))
+
     def __iter__(self):
         return iteraddfieldusingcontext(self.table, self.field, self.query)
 
@@ -1232,7 +1537,8 @@ def iteraddfieldusingcontext(table, field, query):
     flds = list(map(text_type, hdr))
     yield hdr + (field,)
     flds.append(field)
-    it = (Record(row, flds) for row in it)
+    record = _recordclass(flds)
+    it = (record(row) for row in it)
     prv = None
     try:
         cur = next(it)
@@ -1241,7 +1547,7 @@ def iteraddfieldusingcontext(table, field, query):
     for nxt in it:
         v = query(prv, cur, nxt)
         yield tuple(cur) + (v,)
-        prv = Record(tuple(cur) + (v,), flds)
+        prv = record(tuple(cur) + (v,))
         cur = nxt
     # handle last row
     v = query(prv, cur, None)
@@ -6,8 +6,11 @@ from petl.compat import next, integer_types, string_types, text_type
 
 import petl.config as config
 from petl.errors import ArgumentError, FieldSelectionError
-from petl.util.base import Table, expr, fieldnames, Record
+from petl.util.base import Table, expr, fieldnames, header, _rowexpr, \
+    _recordclass, _sourceheader, _sourcetypes, _selecttypes, iterbatches, \
+    _batched, _unbatched, _asnumeric, _vectorcall
 from petl.util.parsers import numparser
+from petl.util.parallel import _iterparallel
 
 
 def convert(table, *args, **kwargs):
@@ -203,6 +206,21 @@ def convert(table, *args, **kwargs):
     Also accepts `failonerror` and `errorvalue` keyword arguments,
     documented under :func:`petl.config.failonerror`
 
+    If `vectorized=True` is given and :mod:`numpy` is installed, rows are
+    converted in batches (see :func:`petl.util.base.iterbatches`), and
+    conversion functions are called once per batch with a whole column of
+    values as a numpy array, e.g., ``etl.convert(table, 'bar', np.sqrt,
+    vectorized=True)``. The function should return an array of the same
+    length, and arithmetic follows numpy rules (e.g., integers are of fixed
+    width). Values are converted one at a time as usual for any column which
+    is not all numbers, or if the function fails (including on numpy
+    floating point errors) or does not return such an array. Ignored if
+    `where` or `pass_row` is given.
+
+    The `workers`, `chunksize` and `ordered` keyword arguments can be used to
+    convert values in a pool of processes, see
+    :func:`petl.transform.maps.rowmap`.
+
     The ``trusted`` keyword argument can be used to specify whether the
     expression is trusted. See `:func:`petl.util.base.expr` for details.
 
@@ -327,8 +345,11 @@ Table.convertnumbers = convertnumbers
 
 class FieldConvertView(Table):
 
+    _tuplerows = True
+
     def __init__(self, source, converters=None, failonerror=None,
-                 errorvalue=None, where=None, pass_row=False, trusted=True):
+                 errorvalue=None, where=None, pass_row=False, trusted=True,
+                 vectorized=False, workers=None, chunksize=None, ordered=True):
         self.source = source
         if converters is None:
             self.converters = dict()
@@ -344,8 +365,50 @@ class FieldConvertView(Table):
         self.where = where
         self.pass_row = pass_row
         self.trusted = trusted
+        self.vectorized = vectorized
+        self.workers = workers
+        self.chunksize = chunksize
+        self.ordered = ordered
+
+    def _staticheader(self):
+        return _sourceheader(self.source)
+
+    def _fieldtypes(self):
+        # a converter which is itself a type declares the type of a field, if
+        # all values are converted and errors are raised (or replaced by a
+        # value of that type)
+        types = _sourcetypes(self.source)
+        if types is None and not any(isinstance(c, type)
+                                     for c in self.converters.values()):
+            return None
+        flds = list(map(text_type, header(self.source)))
+        types = list(types or [None] * len(flds))
+        strict = self.where is None and not self.pass_row
+        for i, c in _converterfunctions(self.converters, flds).items():
+            if not -len(types) <= i < len(types):
+                continue
+            if isinstance(c, type) and strict and (
+                    self.failonerror is True or
+                    self.failonerror != 'inline' and
+                    isinstance(self.errorvalue, c)):
+                types[i] = c
+            elif types[i] is not c:
+                types[i] = None
+        return _selecttypes(types, range(len(types)))
+
+    def _iterbatches(self, size):
+        if self.where is not None or self.pass_row or self.workers:
+            # rows are converted depending on the whole row, or elsewhere
+            return _batched(iter(self), size)
+        return _iterfieldconvertbatches(self.source, self.converters,
+                                        self.failonerror, self.errorvalue,
+                                        size, self.vectorized)
 
     def __iter__(self):
+        if self.workers:
+            return _iterparallel(self)
+        if self.vectorized and self.where is None and not self.pass_row:
+            return _unbatched(self._iterbatches(config.batchsize))
         return iterfieldconvert(self.source, self.converters, self.failonerror,
                                 self.errorvalue, self.where, self.pass_row, self.trusted)
 
@@ -353,19 +416,8 @@ class FieldConvertView(Table):
         self.converters[key] = value
 
 
-def iterfieldconvert(source, converters, failonerror, errorvalue, where,
-                     pass_row, trusted):
-
-    # grab the fields in the source table
-    it = iter(source)
-    try:
-        hdr = next(it)
-        flds = list(map(text_type, hdr))
-        yield tuple(hdr)  # these are not modified
-    except StopIteration:
-        hdr = flds = []  # converters will fail selecting a field
-
-    # build converter functions
+def _converterfunctions(converters, flds):
+    # build converter functions, keyed by field index
     converter_functions = dict()
     for k, c in converters.items():
 
@@ -403,6 +455,88 @@ def iterfieldconvert(source, converters, failonerror, errorvalue, where,
                 'unexpected converter specification on field %r: %r' % (k, c)
             )
 
+    return converter_functions
+
+
+def _iterfieldconvertbatches(source, converters, failonerror, errorvalue,
+                             size, vectorized=False):
+    it = iterbatches(source, size)
+    try:
+        hdr = next(it)
+        flds = list(map(text_type, hdr))
+        yield tuple(hdr)
+    except StopIteration:
+        hdr = flds = []
+    functions = sorted((i, f) for i, f
+                       in _converterfunctions(converters, flds).items()
+                       if i >= 0)  # never selected by position
+    if vectorized:
+        import numpy as np
+        # only functions can be called on whole columns, not method names or
+        # dictionaries
+        vectorizable = _converterfunctions(
+            dict((k, c) for k, c in converters.items() if callable(c)), flds
+        )
+
+    def convertvalue(f, v):
+        try:
+            return f(v)
+        except Exception as e:
+            if failonerror == 'inline':
+                return e
+            elif failonerror:
+                raise e
+            else:
+                return errorvalue
+
+    for batch in it:
+        n = len(batch[0])
+        if n and all(len(row) == n for row in batch):
+            # convert the batch column by column
+            cols = list(zip(*batch))
+            for i, f in functions:
+                if i >= n:
+                    continue
+                if vectorized and i in vectorizable:
+                    a = _asnumeric(np, cols[i])
+                    values = (None if a is None
+                              else _vectorcall(np, f, a, len(batch)))
+                    if values is not None:
+                        cols[i] = values
+                        continue
+                try:
+                    cols[i] = list(map(f, cols[i]))
+                except Exception:
+                    # go round again value by value to handle the error,
+                    # so values before it are converted twice
+                    cols[i] = [convertvalue(f, v) for v in cols[i]]
+            yield list(zip(*cols))
+        else:
+            out = []
+            for row in batch:
+                row = list(row)
+                for i, f in functions:
+                    if i < len(row):
+                        row[i] = convertvalue(f, row[i])
+                out.append(tuple(row))
+            yield out
+
+
+def iterfieldconvert(source, converters, failonerror, errorvalue, where,
+                     pass_row, trusted):
+
+    # grab the fields in the source table
+    it = iter(source)
+    try:
+        hdr = next(it)
+        flds = list(map(text_type, hdr))
+        yield tuple(hdr)  # these are not modified
+    except StopIteration:
+        hdr = flds = []  # converters will fail selecting a field
+
+    # build converter functions
+    converter_functions = _converterfunctions(converters, flds)
+
     # define a function to transform a value
     def transform_value(i, v, *args):
         if i not in converter_functions:
@@ -437,9 +571,21 @@ def iterfieldconvert(source, converters, failonerror, errorvalue, where,
                                 'found %r' % where
 
     # prepare iterator
+    rowwhere = None
+    if where is not None and not pass_row:
+        rowwhere = _rowexpr(where, hdr)
+    if rowwhere is not None:
+        # expression compiled against the header, no need for records
+        for row in it:
+            if rowwhere(row):
+                yield transform_row(row)
+            else:
+                yield tuple(row)
+        return
     if pass_row or where:
         # wrap rows as records
-        it = (Record(row, flds) for row in it)
+        record = _recordclass(flds)
+        it = (record(row) for row in it)
 
     # construct the data rows
     if where is None:
@@ -452,7 +598,7 @@ def iterfieldconvert(source, converters, failonerror, errorvalue, where,
             if where(row):
                 yield transform_row(row)
             else:
-                yield row
+                yield tuple(row)
 
 
 def methodcaller(nm, *args):
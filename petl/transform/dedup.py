@@ -5,12 +5,16 @@ import operator
 from petl.compat import text_type
 
 
-from petl.util.base import Table, asindices, itervalues
-from petl.transform.sorts import sort
+import petl.config as config
+from petl.util.base import Table, asindices, itervalues, _derivedheader, \
+    _sourcetypes
+from petl.util.hashing import _digestgetter
+from petl.transform.sorts import sort, _iterhashgroups, _iterhashdistinct, \
+    _checkstrategy, _SpillBuffer, _spilllargest
 
 
 def duplicates(table, key=None, presorted=False, buffersize=None, tempdir=None, 
-               cache=True):
+               cache=True, strategy='sort'):
     """
     Select rows with duplicate values under a given key (or duplicate
     rows where no key is given). E.g.::
@@ -56,14 +60,24 @@ def duplicates(table, key=None, presorted=False, buffersize=None, tempdir=None,
     ignored. Otherwise, the data are sorted, see also the discussion of the
     `buffersize`, `tempdir` and `cache` arguments under the
     :func:`petl.transform.sorts.sort` function.
+
+    If `strategy` is 'hash', the data are not sorted, and rows are grouped by
+    key via a hash table instead, as described for
+    :func:`petl.transform.dedup.distinct`. Groups of duplicate rows are
+    output in order of first appearance of each key, and rows within each
+    group are output in their original order. Rows are held until the end of
+    the table (or of its partition), and are written to temporary files once
+    more than `buffersize` rows are held in memory.
     
     See also :func:`petl.transform.dedup.unique` and
     :func:`petl.transform.dedup.distinct`.
     
     """
 
+    _checkstrategy(strategy)
     return DuplicatesView(table, key=key, presorted=presorted, 
-                          buffersize=buffersize, tempdir=tempdir, cache=cache)
+                          buffersize=buffersize, tempdir=tempdir, cache=cache,
+                          strategy=strategy)
 
 
 Table.duplicates = duplicates
@@ -72,15 +86,27 @@ Table.duplicates = duplicates
 class DuplicatesView(Table):
     
     def __init__(self, source, key=None, presorted=False, buffersize=None, 
-                 tempdir=None, cache=True):
-        if presorted:
+                 tempdir=None, cache=True, strategy='sort'):
+        self.hashed = strategy == 'hash'
+        if presorted or self.hashed:
             self.source = source
         else:
             self.source = sort(source, key, buffersize=buffersize, 
                                tempdir=tempdir, cache=cache)
         self.key = key
+        self.buffersize = buffersize
+        self.tempdir = tempdir
         
+    def _staticheader(self):
+        return _derivedheader(self)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.source)
+
     def __iter__(self):
+        if self.hashed:
+            return iterhashduplicates(self.source, self.key, self.buffersize,
+                                      self.tempdir)
         return iterduplicates(self.source, self.key)
 
 
@@ -126,10 +152,61 @@ def iterduplicates(source, key):
                 # reset
                 previous_yielded = False
             previous = row
+
+
+def _hashgroups(it, getkey, buffersize, tempdir):
+    # group rows by key in order of first appearance, without sorting, holding
+    # the rows for each key in a buffer; once more than buffersize rows are
+    # held in memory, the largest buffers are spilled to disk
+    if buffersize is None:
+        buffersize = config.sort_buffersize
+    live = set()  # buffers not yet yielded
+    held = [0]  # rows held in memory, at most
+
+    def initial():
+        rows = _SpillBuffer(buffersize=buffersize, tempdir=tempdir)
+        live.add(rows)
+        return rows
+
+    def update(rows, row):
+        rows.append(row)
+        held[0] += 1
+        if buffersize is not None and held[0] > buffersize:
+            held[0] = _spilllargest(live, buffersize // 2)
+        return rows
+
+    for k, rows in _iterhashgroups(it, getkey, initial, update,
+                                   buffersize=buffersize, tempdir=tempdir):
+        live.discard(rows)
+        held[0] -= rows.held()
+        yield k, rows
+
+
+def iterhashduplicates(source, key, buffersize, tempdir):
+    it = iter(source)
+
+    try:
+        hdr = next(it)
+    except StopIteration:
+        if key is None:
+            return  # nothing to do on a table without headers
+        hdr = []
+    yield tuple(hdr)
+
+    if key is None:
+        indices = range(len(hdr))
+    else:
+        indices = asindices(hdr, key)
+    getkey = operator.itemgetter(*indices)
+
+    for _, rows in _hashgroups(it, getkey, buffersize, tempdir):
+        if len(rows) > 1:
+            for row in rows:
+                yield tuple(row)
     
     
 def unique(table, key=None, presorted=False, buffersize=None, tempdir=None,
-           cache=True):
+           cache=True, strategy='sort'):
     """
     Select rows with unique values under a given key (or unique rows
     if no key is given). E.g.::
@@ -162,13 +239,20 @@ def unique(table, key=None, presorted=False, buffersize=None, tempdir=None,
     `buffersize`, `tempdir` and `cache` arguments under the
     :func:`petl.transform.sorts.sort` function.
 
+    If `strategy` is 'hash', the data are not sorted, and keys are counted
+    via a hash table instead, as described for
+    :func:`petl.transform.dedup.distinct`. Unique rows are output in their
+    original order.
+
     See also :func:`petl.transform.dedup.duplicates` and
     :func:`petl.transform.dedup.distinct`.
     
     """
 
+    _checkstrategy(strategy)
     return UniqueView(table, key=key, presorted=presorted, 
-                      buffersize=buffersize, tempdir=tempdir, cache=cache)
+                      buffersize=buffersize, tempdir=tempdir, cache=cache,
+                      strategy=strategy)
 
 
 Table.unique = unique
@@ -177,15 +261,27 @@ Table.unique = unique
 class UniqueView(Table):
     
     def __init__(self, source, key=None, presorted=False, buffersize=None,
-                 tempdir=None, cache=True):
-        if presorted:
+                 tempdir=None, cache=True, strategy='sort'):
+        self.hashed = strategy == 'hash'
+        if presorted or self.hashed:
             self.source = source
         else:
             self.source = sort(source, key, buffersize=buffersize,
                                tempdir=tempdir, cache=cache)
         self.key = key
+        self.buffersize = buffersize
+        self.tempdir = tempdir
         
+    def _staticheader(self):
+        return _derivedheader(self)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.source)
+
     def __iter__(self):
+        if self.hashed:
+            return iterhashunique(self.source, self.key, self.buffersize,
+                                  self.tempdir)
         return iterunique(self.source, self.key)
 
 
@@ -231,10 +327,41 @@ def iterunique(source, key):
     # last one?
     if prev_comp_ne:
         yield prev
+
+
+def _counting(state, row):
+    # keep the first row for each key, and count rows
+    if state is None:
+        return [row, 1]
+    state[1] += 1
+    return state
+
+
+def iterhashunique(source, key, buffersize, tempdir):
+    it = iter(source)
+
+    try:
+        hdr = next(it)
+    except StopIteration:
+        return
+    yield tuple(hdr)
+
+    if key is None:
+        indices = range(len(hdr))
+    else:
+        indices = asindices(hdr, key)
+    getkey = operator.itemgetter(*indices)
+
+    for _, (row, n) in _iterhashgroups(it, getkey, lambda: None, _counting,
+                                       buffersize=buffersize,
+                                       tempdir=tempdir):
+        if n == 1:
+            yield tuple(row)
     
     
 def conflicts(table, key, missing=None, include=None, exclude=None, 
-              presorted=False, buffersize=None, tempdir=None, cache=True):
+              presorted=False, buffersize=None, tempdir=None, cache=True,
+              strategy='sort'):
     """
     Select rows with the same key value but differing in some other field.
     E.g.::
@@ -291,12 +418,20 @@ def conflicts(table, key, missing=None, include=None, exclude=None,
     ignored. Otherwise, the data are sorted, see also the discussion of the
     `buffersize`, `tempdir` and `cache` arguments under the
     :func:`petl.transform.sorts.sort` function.
+
+    If `strategy` is 'hash', the data are not sorted, and rows are grouped by
+    key via a hash table instead, as described for
+    :func:`petl.transform.dedup.distinct`. Conflicting rows are output in
+    order of first appearance of each key. Rows are held as described for
+    :func:`petl.transform.dedup.duplicates`.
     
     """
     
+    _checkstrategy(strategy)
     return ConflictsView(table, key, missing=missing, exclude=exclude,
                          include=include, presorted=presorted,
-                         buffersize=buffersize, tempdir=tempdir, cache=cache)
+                         buffersize=buffersize, tempdir=tempdir, cache=cache,
+                         strategy=strategy)
 
 
 Table.conflicts = conflicts
@@ -305,8 +440,10 @@ Table.conflicts = conflicts
 class ConflictsView(Table):
     
     def __init__(self, source, key, missing=None, exclude=None, include=None, 
-                 presorted=False, buffersize=None, tempdir=None, cache=True):
-        if presorted:
+                 presorted=False, buffersize=None, tempdir=None, cache=True,
+                 strategy='sort'):
+        self.hashed = strategy == 'hash'
+        if presorted or self.hashed:
             self.source = source
         else:
             self.source = sort(source, key, buffersize=buffersize,
@@ -315,13 +452,27 @@ class ConflictsView(Table):
         self.missing = missing
         self.exclude = exclude
         self.include = include
+        self.buffersize = buffersize
+        self.tempdir = tempdir
         
+    def _staticheader(self):
+        return _derivedheader(self)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.source)
+
     def __iter__(self):
+        if self.hashed:
+            return iterconflicts(self.source, self.key, self.missing,
+                                 self.exclude, self.include,
+                                 buffersize=self.buffersize,
+                                 tempdir=self.tempdir, hashed=True)
         return iterconflicts(self.source, self.key, self.missing, self.exclude, 
                              self.include)
     
     
-def iterconflicts(source, key, missing, exclude, include):
+def iterconflicts(source, key, missing, exclude, include, buffersize=None,
+                  tempdir=None, hashed=False):
 
     # normalise arguments
     if exclude and not isinstance(exclude, (list, tuple)):
@@ -348,39 +499,48 @@ def iterconflicts(source, key, missing, exclude, include):
     # N.B., this may raise an exception on short rows, depending on
     # the field selection
     getkey = operator.itemgetter(*indices)
-    
-    previous = None
-    previous_yielded = False
-    
-    for row in it:
-        if previous is None:
-            previous = row
-        else:
-            kprev = getkey(previous)
-            kcurr = getkey(row)
-            if kprev == kcurr:
-                # is there a conflict?
-                conflict = False
-                for x, y, f in zip(previous, row, flds):
-                    if (exclude and f not in exclude) \
-                            or (include and f in include) \
-                            or (not exclude and not include):
-                        if missing not in (x, y) and x != y:
-                            conflict = True
-                            break
-                if conflict:
-                    if not previous_yielded:
-                        yield tuple(previous)
-                        previous_yielded = True
-                    yield tuple(row)
+
+    if hashed:
+        # group rows by key without sorting, then compare rows within each
+        # group in their original order, as a stable sort would leave them
+        groups = (rows for _, rows
+                  in _hashgroups(it, getkey, buffersize, tempdir))
+    else:
+        groups = [it]
+
+    for rows in groups:
+        previous = None
+        previous_yielded = False
+
+        for row in rows:
+            if previous is None:
+                previous = row
             else:
-                # reset
-                previous_yielded = False
-            previous = row
+                kprev = getkey(previous)
+                kcurr = getkey(row)
+                if kprev == kcurr:
+                    # is there a conflict?
+                    conflict = False
+                    for x, y, f in zip(previous, row, flds):
+                        if (exclude and f not in exclude) \
+                                or (include and f in include) \
+                                or (not exclude and not include):
+                            if missing not in (x, y) and x != y:
+                                conflict = True
+                                break
+                    if conflict:
+                        if not previous_yielded:
+                            yield tuple(previous)
+                            previous_yielded = True
+                        yield tuple(row)
+                else:
+                    # reset
+                    previous_yielded = False
+                previous = row
 
 
 def distinct(table, key=None, count=None, presorted=False, buffersize=None,
-             tempdir=None, cache=True):
+             tempdir=None, cache=True, strategy='sort', digest=False):
     """
     Return only distinct rows in the table.
 
@@ -391,6 +551,35 @@ def distinct(table, key=None, count=None, presorted=False, buffersize=None,
     If the `key` keyword argument is passed, the comparison is done on the
     given key instead of the full row.
 
+    If `strategy` is 'hash', the data are not sorted. Instead, the first row
+    for each distinct key is selected via a hash set of key values, and rows
+    are output in their original order. Key values must be hashable. Without
+    `count`, rows are output as they are read. At most `buffersize` keys are
+    held in memory; once that many keys are held, rows for any other keys
+    are hash partitioned into temporary files (in `tempdir`), and each
+    partition is then processed in turn, so rows from the partitions follow
+    the rows selected in memory. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar'],
+        ...           ['b', 2],
+        ...           ['a', 1],
+        ...           ['b', 3],
+        ...           ['a', 1]]
+        >>> etl.distinct(table1, 'foo', strategy='hash')
+        +-----+-----+
+        | foo | bar |
+        +=====+=====+
+        | 'b' |   2 |
+        +-----+-----+
+        | 'a' |   1 |
+        +-----+-----+
+
+    If `digest` is True (and `strategy` is 'hash'), digests of key values
+    computed by :func:`petl.util.hashing.rowdigest` are held in memory
+    instead of the key values themselves, which reduces memory use where
+    keys are large (e.g., where no key is given and whole rows are compared).
+
     See also :func:`petl.transform.dedup.duplicates`,
     :func:`petl.transform.dedup.unique`,
     :func:`petl.transform.reductions.groupselectfirst`,
@@ -398,8 +587,10 @@ def distinct(table, key=None, count=None, presorted=False, buffersize=None,
 
     """
 
+    _checkstrategy(strategy)
     return DistinctView(table, key=key, count=count, presorted=presorted,
-                        buffersize=buffersize, tempdir=tempdir, cache=cache)
+                        buffersize=buffersize, tempdir=tempdir, cache=cache,
+                        strategy=strategy, digest=digest)
 
 
 Table.distinct = distinct
@@ -407,14 +598,28 @@ Table.distinct = distinct
 
 class DistinctView(Table):
     def __init__(self, table, key=None, count=None, presorted=False,
-                 buffersize=None, tempdir=None, cache=True):
-        if presorted:
+                 buffersize=None, tempdir=None, cache=True, strategy='sort',
+                 digest=False):
+        self.hashed = strategy == 'hash'
+        if presorted or self.hashed:
             self.table = table
         else:
             self.table = sort(table, key=key, buffersize=buffersize,
                               tempdir=tempdir, cache=cache)
         self.key = key
         self.count = count
+        self.buffersize = buffersize
+        self.tempdir = tempdir
+        self.digest = digest
+
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('table',))
+
+    def _fieldtypes(self):
+        types = _sourcetypes(self.table)
+        if types is None or not self.count:
+            return types
+        return list(types) + [int]
 
     def __iter__(self):
         it = iter(self.table)
@@ -434,6 +639,23 @@ class DistinctView(Table):
         # the field selection
         getkey = operator.itemgetter(*indices)
 
+        if self.hashed:
+            if self.digest:
+                getkey = _digestgetter(hdr, list(indices))
+            if self.count:
+                yield tuple(hdr) + (self.count,)
+                for _, (row, n) in _iterhashgroups(
+                        it, getkey, lambda: None, _counting,
+                        buffersize=self.buffersize, tempdir=self.tempdir):
+                    yield tuple(row) + (n,)
+            else:
+                yield tuple(hdr)
+                for row in _iterhashdistinct(it, getkey,
+                                             buffersize=self.buffersize,
+                                             tempdir=self.tempdir):
+                    yield tuple(row)
+            return
+
         INIT = object()
         if self.count:
             hdr = tuple(hdr) + (self.count,)
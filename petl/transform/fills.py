@@ -4,7 +4,7 @@ from __future__ import absolute_import, print_function, division
 from petl.compat import next
 
 
-from petl.util.base import Table, asindices
+from petl.util.base import Table, asindices, _sourceheader
 
 
 def filldown(table, *fields, **kwargs):
@@ -98,6 +98,9 @@ class FillDownView(Table):
         self.fields = fields
         self.missing = missing
 
+    def _staticheader(self):
+        return _sourceheader(self.table)
+
     def __iter__(self):
         return iterfilldown(self.table, self.fields, self.missing)
 
@@ -174,6 +177,9 @@ class FillRightView(Table):
         self.table = table
         self.missing = missing
 
+    def _staticheader(self):
+        return _sourceheader(self.table)
+
     def __iter__(self):
         return iterfillright(self.table, self.missing)
 
@@ -243,6 +249,9 @@ class FillLeftView(Table):
         self.table = table
         self.missing = missing
 
+    def _staticheader(self):
+        return _sourceheader(self.table)
+
     def __iter__(self):
         return iterfillleft(self.table, self.missing)
 
@@ -0,0 +1,329 @@
+from __future__ import absolute_import, print_function, division
+
+
+import copy
+import operator
+from itertools import chain
+from petl.compat import next, string_types, text_type
+
+
+from petl.util.base import Table, asindices, expr, header, _rowexpr, \
+    _recordclass, _sourcetypes
+from petl.transform.basics import CutView, CutOutView, StackView, \
+    AddFieldView
+from petl.transform.headers import RenameView, SetHeaderView, \
+    PrefixHeaderView, SuffixHeaderView
+from petl.transform.selects import RowSelectView, FieldSelectView
+from petl.transform.conversions import FieldConvertView, _converterfunctions
+
+
+def fuse(table):
+    """
+    Fuse chains of consecutive row-wise transformations into a single pass.
+    E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar', 'baz'],
+        ...           ['A', '1', 2],
+        ...           ['B', '2', 3],
+        ...           ['C', '3', 7]]
+        >>> table2 = (
+        ...     etl
+        ...     .convert(table1, 'bar', int)
+        ...     .select('bar', lambda v: v > 1)
+        ...     .addfield('quux', lambda rec: rec.bar * rec.baz)
+        ...     .cut('foo', 'quux')
+        ...     .rename('quux', 'product')
+        ...     .fuse()
+        ... )
+        >>> table2
+        +-----+---------+
+        | foo | product |
+        +=====+=========+
+        | 'B' |       6 |
+        +-----+---------+
+        | 'C' |      21 |
+        +-----+---------+
+
+    Each transformation in a pipeline such as the one above normally wraps
+    the table below it, so every row is passed through one generator per
+    transformation and copied into an intermediate tuple at each step. The
+    fused table instead compiles the chain, when iterated, into one
+    specialised loop, with field selections resolved to row indices and
+    converters, predicates and calculated values called inline. The result
+    is the same as iterating `table` directly.
+
+    The following transformations can be fused: :func:`cut`, :func:`cutout`,
+    :func:`rename`, :func:`setheader`, :func:`prefixheader`,
+    :func:`suffixheader`, :func:`select` (and the `select*` shortcuts),
+    :func:`convert` (and the `convert*` shortcuts), :func:`addfield` and
+    :func:`stack` of a single table, unless given `vectorized=True` or
+    `workers`. Chains below any other transformation (e.g., a sort or a
+    join) are fused separately. Tables without any fusable transformation
+    are returned unchanged.
+
+    """
+
+    base, stages = _fusionchain(table)
+    if not stages:
+        return _fusesource(table)
+    return FusedView(table, _fusesource(base), stages)
+
+
+Table.fuse = fuse
+
+
+# registry of fusable views, mapping the view class to a pair of the
+# name of the attribute holding the source table and a function which
+# generates the code for a single row
+_fusers = dict()
+
+
+def _fusionchain(table):
+    stages = []
+    while type(table) in _fusers:
+        if isinstance(table, StackView) and len(table.sources) != 1:
+            break
+        if getattr(table, 'vectorized', False):
+            break  # already works on whole batches
+        if getattr(table, 'workers', None):
+            break  # runs in worker processes
+        stages.append(table)
+        table = _getsource(table)
+    stages.reverse()
+    return table, stages
+
+
+def _getsource(view):
+    attr = _fusers[type(view)][0]
+    if attr == 'sources':
+        return view.sources[0]
+    return getattr(view, attr)
+
+
+def _withsource(view, source, attr):
+    view = copy.copy(view)
+    if attr == 'sources':
+        source = [source]
+    setattr(view, attr, source)
+    return view
+
+
+def _fusesource(table):
+    # fuse any chain further down the pipeline, below a view which cannot
+    # itself be fused
+    if isinstance(table, FusedView):
+        return table
+    for attr in 'source', 'table':
+        source = getattr(table, attr, None)
+        if isinstance(source, Table):
+            fused = fuse(source)
+            if fused is not source:
+                return _withsource(table, fused, attr)
+            break
+    return table
+
+
+class FusedView(Table):
+
+    _tuplerows = True
+
+    def __init__(self, original, source, stages):
+        self._original = original
+        self._stages = stages
+        self.source = source
+        self.stages = tuple(type(view).__name__ for view in stages)
+
+    def _staticheader(self):
+        return header(self._original)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self._original)
+
+    def __iter__(self):
+        it = iter(self.source)
+        try:
+            hdr = next(it)
+        except StopIteration:
+            # nothing to compile against, let the original views deal with it
+            return iter(self._original)
+        outhdr, fused = _compile(hdr, self._stages)
+        return chain([outhdr], fused(it))
+
+
+class _Codegen(object):
+
+    def __init__(self):
+        self.env = {}
+        self.lines = []
+        self.indent = 2
+        self.sized = False  # rows known to be as long as the header
+        self.istuple = False  # row known to be a tuple
+
+    def bind(self, value):
+        name = '_v%s' % len(self.env)
+        self.env[name] = value
+        return name
+
+    def emit(self, line):
+        self.lines.append('    ' * self.indent + line)
+
+
+def _compile(hdr, stages):
+    gen = _Codegen()
+    for view in stages:
+        attr, build = _fusers[type(view)]
+        build(view, hdr, gen)
+        # derive the output header by running the view over the header only
+        outhdr = next(iter(_withsource(view, [hdr], attr)))
+        if len(outhdr) != len(hdr):
+            gen.sized = gen.sized and type(view) in (CutView, CutOutView,
+                                                     AddFieldView)
+        hdr = outhdr
+    gen.indent = 2
+    gen.emit('yield %s' % ('r' if gen.istuple else 'tuple(r)'))
+    names = sorted(gen.env)
+    src = 'def _fused(it, %s):\n    for r in it:\n%s\n' % (
+        ', '.join('%s=%s' % (n, n) for n in names),
+        '\n'.join(gen.lines)
+    )
+    namespace = dict(gen.env)
+    exec(compile(src, '<fused>', 'exec'), namespace)
+    return tuple(hdr), namespace['_fused']
+
+
+def _fusecut(indices, view, gen):
+    m = gen.bind(view.missing)
+    if gen.sized:
+        getters = ['r[%d]' % i for i in indices]
+    else:
+        gen.emit('n = len(r)')
+        getters = ['(r[%d] if %d < n else %s)' % (i, i, m) for i in indices]
+    gen.emit('r = (%s)' % ''.join(g + ', ' for g in getters).rstrip())
+    gen.sized = True
+    gen.istuple = True
+
+
+def _buildcut(view, hdr, gen):
+    _fusecut(asindices(hdr, tuple(view.spec)), view, gen)
+
+
+def _buildcutout(view, hdr, gen):
+    indicesout = asindices(hdr, tuple(view.spec))
+    indices = [i for i in range(len(hdr)) if i not in indicesout]
+    _fusecut(indices, view, gen)
+
+
+def _buildstack(view, hdr, gen):
+    n = len(hdr)
+    if not gen.istuple:
+        gen.emit('r = tuple(r)')
+        gen.istuple = True
+    if gen.sized:
+        return
+    if view.trim:
+        gen.emit('if len(r) > %d: r = r[:%d]' % (n, n))
+    if view.pad:
+        gen.emit('if len(r) < %d: r += (%s,) * (%d - len(r))'
+                 % (n, gen.bind(view.missing), n))
+    gen.sized = view.trim and view.pad
+
+
+def _buildaddfield(view, hdr, gen):
+    index = len(hdr) if view.index is None else view.index
+    if callable(view.value):
+        record = gen.bind(_recordclass(list(map(text_type, hdr))))
+        gen.emit('v = %s(%s(r))' % (gen.bind(view.value), record))
+    else:
+        gen.emit('v = %s' % gen.bind(view.value))
+    if not gen.istuple:
+        gen.emit('r = tuple(r)')
+        gen.istuple = True
+    gen.emit('r = r[:%d] + (v,) + r[%d:]' % (index, index))
+
+
+def _buildheader(view, hdr, gen):
+    pass  # only the header is changed
+
+
+def _buildrowselect(view, hdr, gen):
+    rowwhere = _rowexpr(view.where, hdr, view.missing)
+    if rowwhere is not None:
+        test = '%s(r)' % gen.bind(rowwhere)
+    else:
+        record = _recordclass(list(map(text_type, hdr)), view.missing)
+        test = '%s(%s(r))' % (gen.bind(view.where), gen.bind(record))
+    gen.emit('if bool(%s) == %r: continue' % (test, bool(view.complement)))
+
+
+def _buildfieldselect(view, hdr, gen):
+    indices = asindices(hdr, view.field)
+    if gen.sized and len(indices) == 1:
+        gen.emit('v = r[%d]' % indices[0])
+    else:
+        gen.emit('try:')
+        gen.emit('    v = %s(r)' % gen.bind(operator.itemgetter(*indices)))
+        gen.emit('except IndexError:')
+        gen.emit('    v = %s' % gen.bind(view.missing))
+    gen.emit('if bool(%s(v)) == %r: continue'
+             % (gen.bind(view.where), bool(view.complement)))
+
+
+def _buildconvert(view, hdr, gen):
+    flds = list(map(text_type, hdr))
+    functions = _converterfunctions(view.converters, flds)
+    where = view.where
+    if isinstance(where, string_types):
+        where = expr(where, trusted=view.trusted)
+    if not functions and where is None:
+        return
+    args = ''
+    rowwhere = None
+    if where is not None and not view.pass_row:
+        rowwhere = _rowexpr(where, hdr)
+    if rowwhere is not None:
+        gen.emit('if %s(r):' % gen.bind(rowwhere))
+        gen.indent += 1
+    else:
+        if view.pass_row or where is not None:
+            gen.emit('rec = %s(r)' % gen.bind(_recordclass(flds)))
+            if view.pass_row:
+                args = ', rec'
+        if where is not None:
+            gen.emit('if %s(rec):' % gen.bind(where))
+            gen.indent += 1
+    gen.emit('r = list(r)')
+    for i in sorted(functions):
+        if i < 0:
+            continue  # never selected by position
+        indent = gen.indent
+        if not (gen.sized and i < len(hdr)):
+            gen.emit('if %d < len(r):' % i)
+            gen.indent += 1
+        gen.emit('try:')
+        gen.emit('    r[%d] = %s(r[%d]%s)'
+                 % (i, gen.bind(functions[i]), i, args))
+        gen.emit('except Exception as e:')
+        if view.failonerror == 'inline':
+            gen.emit('    r[%d] = e' % i)
+        elif view.failonerror:
+            gen.emit('    raise')
+        else:
+            gen.emit('    r[%d] = %s' % (i, gen.bind(view.errorvalue)))
+        gen.indent = indent
+    if where is not None:
+        gen.indent -= 1
+    gen.istuple = False
+
+
+_fusers[CutView] = 'source', _buildcut
+_fusers[CutOutView] = 'source', _buildcutout
+_fusers[StackView] = 'sources', _buildstack
+_fusers[AddFieldView] = 'source', _buildaddfield
+_fusers[RenameView] = 'source', _buildheader
+_fusers[SetHeaderView] = 'source', _buildheader
+_fusers[PrefixHeaderView] = 'table', _buildheader
+_fusers[SuffixHeaderView] = 'table', _buildheader
+_fusers[RowSelectView] = 'source', _buildrowselect
+_fusers[FieldSelectView] = 'source', _buildfieldselect
+_fusers[FieldConvertView] = 'source', _buildconvert
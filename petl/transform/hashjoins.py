@@ -4,8 +4,9 @@ import operator
 
 from petl.compat import next, text_type
 from petl.transform.basics import stack
-from petl.transform.joins import keys_from_args
-from petl.util.base import Table, asindices, iterpeek, rowgetter
+from petl.transform.joins import keys_from_args, _jointypes
+from petl.util.base import Table, asindices, iterpeek, rowgetter, \
+    _derivedheader, _sourcetypes
 from petl.util.lookups import lookup, lookupone
 
 
@@ -52,6 +53,13 @@ class HashJoinView(Table):
         self.lprefix = lprefix
         self.rprefix = rprefix
         
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('left', 'right'))
+
+    def _fieldtypes(self):
+        return _jointypes(self.left, self.right, self.lkey, self.rkey,
+                          leftouter=False, rightouter=False)
+
     def __iter__(self):
         if not self.cache or self.rlookup is None:
             self.rlookup = lookup(self.right, self.rkey)
@@ -151,6 +159,13 @@ class HashLeftJoinView(Table):
         self.lprefix = lprefix
         self.rprefix = rprefix
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('left', 'right'))
+
+    def _fieldtypes(self):
+        return _jointypes(self.left, self.right, self.lkey, self.rkey,
+                          leftouter=True, rightouter=False)
+
     def __iter__(self):
         if not self.cache or self.rlookup is None:
             self.rlookup = lookup(self.right, self.rkey)
@@ -257,6 +272,13 @@ class HashRightJoinView(Table):
         self.lprefix = lprefix
         self.rprefix = rprefix
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('left', 'right'))
+
+    def _fieldtypes(self):
+        return _jointypes(self.left, self.right, self.lkey, self.rkey,
+                          leftouter=False, rightouter=True)
+
     def __iter__(self):
         if not self.cache or self.llookup is None:
             self.llookup = lookup(self.left, self.lkey)
@@ -354,6 +376,12 @@ class HashAntiJoinView(Table):
         self.lkey = lkey
         self.rkey = rkey
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('left', 'right'))
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.left)
+
     def __iter__(self):
         return iterhashantijoin(self.left, self.right, self.lkey, self.rkey)
     
@@ -423,6 +451,13 @@ class HashLookupJoinView(Table):
         self.lprefix = lprefix
         self.rprefix = rprefix
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('left', 'right'))
+
+    def _fieldtypes(self):
+        return _jointypes(self.left, self.right, self.lkey, self.rkey,
+                          leftouter=True, rightouter=False)
+
     def __iter__(self):
         return iterhashlookupjoin(self.left, self.right, self.lkey, self.rkey,
                                   self.missing, self.lprefix, self.rprefix)
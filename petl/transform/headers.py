@@ -6,7 +6,8 @@ from petl.compat import next, text_type
 from petl.errors import FieldSelectionError
 
 
-from petl.util.base import Table, asindices, rowgetter
+from petl.util.base import Table, asindices, rowgetter, _derivedheader, \
+    _sourcetypes, _headerbatches, _itertuples
 
 
 def rename(table, *args, **kwargs):
@@ -60,6 +61,8 @@ Table.rename = rename
 
 class RenameView(Table):
 
+    _tuplerows = True
+
     def __init__(self, table, *args, **kwargs):
         self.source = table
         if len(args) == 0:
@@ -70,6 +73,15 @@ class RenameView(Table):
             self.spec = {args[0]: args[1]}
         self.strict = kwargs.get('strict', True)
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.source)
+
+    def _iterbatches(self, size):
+        return _headerbatches(self, size)
+
     def __iter__(self):
         return iterrename(self.source, self.spec, self.strict)
 
@@ -78,7 +90,7 @@ class RenameView(Table):
 
 
 def iterrename(source, spec, strict):
-    it = iter(source)
+    it = _itertuples(source)
     try:
         hdr = next(it)
     except StopIteration:
@@ -97,7 +109,7 @@ def iterrename(source, spec, strict):
               for i, f in enumerate(flds)]
     yield tuple(outhdr)
     for row in it:
-        yield tuple(row)
+        yield row
 
 
 def setheader(table, header):
@@ -131,23 +143,34 @@ Table.setheader = setheader
 
 class SetHeaderView(Table):
 
+    _tuplerows = True
+
     def __init__(self, source, header):
         self.source = source
         self.header = header
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.source)
+
+    def _iterbatches(self, size):
+        return _headerbatches(self, size)
+
     def __iter__(self):
         return itersetheader(self.source, self.header)
 
 
 def itersetheader(source, header):
-    it = iter(source)
+    it = _itertuples(source)
     try:
         next(it)  # discard source header
     except StopIteration:
         pass  # no previous header
     yield tuple(header)
     for row in it:
-        yield tuple(row)
+        yield row
 
 
 def extendheader(table, fields):
@@ -181,16 +204,21 @@ Table.extendheader = extendheader
 
 class ExtendHeaderView(Table):
 
+    _tuplerows = True
+
     def __init__(self, source, fields):
         self.source = source
         self.fields = fields
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
     def __iter__(self):
         return iterextendheader(self.source, self.fields)
 
 
 def iterextendheader(source, fields):
-    it = iter(source)
+    it = _itertuples(source)
     try:
         hdr = next(it)
     except StopIteration:
@@ -199,7 +227,7 @@ def iterextendheader(source, fields):
     outhdr.extend(fields)
     yield tuple(outhdr)
     for row in it:
-        yield tuple(row)
+        yield row
 
 
 def pushheader(table, header, *args):
@@ -231,6 +259,8 @@ Table.pushheader = pushheader
 
 class PushHeaderView(Table):
 
+    _tuplerows = True
+
     def __init__(self, source, header, *args):
         self.source = source
         self.args = args
@@ -245,15 +275,18 @@ class PushHeaderView(Table):
         else:
             assert False, 'bad parameters'
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
     def __iter__(self):
         return iterpushheader(self.source, self.header)
 
 
 def iterpushheader(source, header):
-    it = iter(source)
+    it = _itertuples(source)
     yield tuple(header)
     for row in it:
-        yield tuple(row)
+        yield row
 
 
 def skip(table, n):
@@ -315,6 +348,20 @@ class PrefixHeaderView(Table):
         self.table = table
         self.prefix = prefix
 
+    @property
+    def _tuplerows(self):
+        # data rows are passed through as they are
+        return getattr(self.table, '_tuplerows', False)
+
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('table',))
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.table)
+
+    def _iterbatches(self, size):
+        return _headerbatches(self, size, attr='table')
+
     def __iter__(self):
         it = iter(self.table)
         try:
@@ -342,6 +389,20 @@ class SuffixHeaderView(Table):
         self.table = table
         self.suffix = suffix
 
+    @property
+    def _tuplerows(self):
+        # data rows are passed through as they are
+        return getattr(self.table, '_tuplerows', False)
+
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('table',))
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.table)
+
+    def _iterbatches(self, size):
+        return _headerbatches(self, size, attr='table')
+
     def __iter__(self):
         it = iter(self.table)
         try:
@@ -374,6 +435,9 @@ class SortHeaderView(Table):
         self.reverse = reverse
         self.missing = missing
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('table',))
+
     def __iter__(self):
         it = iter(self.table)
         try:
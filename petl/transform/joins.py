@@ -9,7 +9,8 @@ from petl.errors import ArgumentError
 from petl.transform.basics import cut, cutout, stack
 from petl.transform.dedup import distinct
 from petl.transform.sorts import sort
-from petl.util.base import Table, asindices, data, header, rowgetter, rowgroupby
+from petl.util.base import Table, asindices, data, header, rowgetter, \
+    rowgroupby, _derivedheader, _sourcetypes, _selecttypes, _itertuples
 
 
 def natural_key(left, right):
@@ -44,6 +45,29 @@ def keys_from_args(left, right, key, lkey, rkey):
     return lkey, rkey
 
 
+def _jointypes(left, right, lkey, rkey, leftouter=False, rightouter=False):
+    # types of the fields output by a join, see fieldtypes()
+    ltypes = _sourcetypes(left)
+    rtypes = _sourcetypes(right)
+    if ltypes is None and rtypes is None:
+        return None
+    lhdr = header(left)
+    rhdr = header(right)
+    ltypes = list(ltypes or [None] * len(lhdr))
+    rtypes = list(rtypes or [None] * len(rhdr))
+    lkind = asindices(lhdr, lkey)
+    rkind = asindices(rhdr, rkey)
+    if rightouter:
+        # unmatched right rows have missing values in all but the key fields
+        keytypes = dict((li, ltypes[li]) for li, ri in zip(lkind, rkind)
+                        if ltypes[li] == rtypes[ri])
+        ltypes = [keytypes.get(i) for i in range(len(ltypes))]
+    rtypes = [rtypes[i] for i in range(len(rtypes)) if i not in rkind]
+    if leftouter:
+        rtypes = [None] * len(rtypes)
+    return _selecttypes(ltypes + rtypes, range(len(ltypes) + len(rtypes)))
+
+
 def join(left, right, key=None, lkey=None, rkey=None, presorted=False,
          buffersize=None, tempdir=None, cache=True, lprefix=None, rprefix=None):
     """
@@ -150,6 +174,8 @@ Table.join = join
 
 class JoinView(Table):
 
+    _tuplerows = True
+
     def __init__(self, left, right, lkey, rkey,
                  presorted=False, leftouter=False, rightouter=False,
                  missing=None, buffersize=None, tempdir=None, cache=True,
@@ -169,6 +195,13 @@ class JoinView(Table):
         self.lprefix = lprefix
         self.rprefix = rprefix
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('left', 'right'))
+
+    def _fieldtypes(self):
+        return _jointypes(self.left, self.right, self.lkey, self.rkey,
+                          leftouter=self.leftouter, rightouter=self.rightouter)
+
     def __iter__(self):
         return iterjoin(self.left, self.right, self.lkey, self.rkey,
                         leftouter=self.leftouter, rightouter=self.rightouter,
@@ -340,7 +373,7 @@ Table.outerjoin = outerjoin
 
 def iterjoin(left, right, lkey, rkey, leftouter=False, rightouter=False,
              missing=None, lprefix=None, rprefix=None):
-    lit = iter(left)
+    lit = _itertuples(left)
     rit = iter(right)
 
     lhdr = next(lit)
@@ -370,15 +403,15 @@ def iterjoin(left, right, lkey, rkey, leftouter=False, rightouter=False,
     else:
         outhdr.extend([(text_type(rprefix) + text_type(f)) for f in rgetv(rhdr)])
     yield tuple(outhdr)
+    rmissing = (missing,) * len(rvind)
 
     # define a function to join two groups of rows
     def joinrows(_lrowgrp, _rrowgrp):
         if _rrowgrp is None:
             for lrow in _lrowgrp:
-                outrow = list(lrow)  # start with the left row
-                # extend with missing values in place of the right row
-                outrow.extend([missing] * len(rvind))
-                yield tuple(outrow)
+                # extend the left row with missing values in place of the
+                # right row
+                yield lrow + rmissing
         elif _lrowgrp is None:
             for rrow in _rrowgrp:
                 # start with missing values in place of the left row
@@ -393,11 +426,9 @@ def iterjoin(left, right, lkey, rkey, leftouter=False, rightouter=False,
             _rrowgrp = list(_rrowgrp)  # may need to iterate more than once
             for lrow in _lrowgrp:
                 for rrow in _rrowgrp:
-                    # start with the left row
-                    outrow = list(lrow)
-                    # extend with non-key values from the right row
-                    outrow.extend(rgetv(rrow))
-                    yield tuple(outrow)
+                    # extend the left row with non-key values from the right
+                    # row
+                    yield lrow + rgetv(rrow)
 
     # construct group iterators for both tables
     lgit = itertools.groupby(lit, key=lgetk)
@@ -418,18 +449,18 @@ def iterjoin(left, right, lkey, rkey, leftouter=False, rightouter=False,
             if lkval < rkval:
                 if leftouter:
                     for row in joinrows(lrowgrp, None):
-                        yield tuple(row)
+                        yield row
                 # advance left
                 lkval, lrowgrp = next(lgit)
             elif lkval > rkval:
                 if rightouter:
                     for row in joinrows(None, rrowgrp):
-                        yield tuple(row)
+                        yield row
                 # advance right
                 rkval, rrowgrp = next(rgit)
             else:
                 for row in joinrows(lrowgrp, rrowgrp):
-                    yield tuple(row)
+                    yield row
                 # advance both
                 lkval, lrowgrp = next(lgit)
                 rkval, rrowgrp = next(rgit)
@@ -442,22 +473,22 @@ def iterjoin(left, right, lkey, rkey, leftouter=False, rightouter=False,
         if lkval > rkval:
             # yield anything that got left hanging
             for row in joinrows(lrowgrp, None):
-                yield tuple(row)
+                yield row
         # yield the rest
         for lkval, lrowgrp in lgit:
             for row in joinrows(lrowgrp, None):
-                yield tuple(row)
+                yield row
 
     # make sure any right rows remaining are yielded
     if rightouter:
         if lkval < rkval:
             # yield anything that got left hanging
             for row in joinrows(None, rrowgrp):
-                yield tuple(row)
+                yield row
         # yield the rest
         for rkval, rrowgrp in rgit:
             for row in joinrows(None, rrowgrp):
-                yield tuple(row)
+                yield row
 
 
 def crossjoin(*tables, **kwargs):
@@ -507,6 +538,16 @@ class CrossJoinView(Table):
         self.missing = kwargs.get('missing', None)
         self.sources = [stack(source, missing=self.missing) for source in sources]
 
+    def _staticheader(self):
+        return _derivedheader(self, listattr='sources')
+
+    def _fieldtypes(self):
+        types = [_sourcetypes(source) for source in self.sources]
+        if all(t is None for t in types):
+            return None
+        return [t for source, ts in zip(self.sources, types)
+                for t in (ts or [None] * len(header(source)))]
+
     def __iter__(self):
         return itercrossjoin(self.sources, self.prefix)
 
@@ -583,6 +624,8 @@ Table.antijoin = antijoin
 
 class AntiJoinView(Table):
 
+    _tuplerows = True
+
     def __init__(self, left, right, lkey, rkey, presorted=False,
                  buffersize=None, tempdir=None, cache=True):
         if presorted:
@@ -596,12 +639,18 @@ class AntiJoinView(Table):
         self.lkey = lkey
         self.rkey = rkey
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('left', 'right'))
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.left)
+
     def __iter__(self):
         return iterantijoin(self.left, self.right, self.lkey, self.rkey)
 
 
 def iterantijoin(left, right, lkey, rkey):
-    lit = iter(left)
+    lit = _itertuples(left)
     rit = iter(right)
 
     lhdr = next(lit)
@@ -632,7 +681,7 @@ def iterantijoin(left, right, lkey, rkey):
         while True:
             if lkval < rkval:
                 for row in lrowgrp:
-                    yield tuple(row)
+                    yield row
                 # advance left
                 lkval, lrowgrp = next(lgit)
             elif lkval > rkval:
@@ -650,11 +699,11 @@ def iterantijoin(left, right, lkey, rkey):
     if lkval > rkval:
         # yield anything that got left hanging
         for row in lrowgrp:
-            yield tuple(row)
+            yield row
     # and the rest...
     for lkval, lrowgrp in lgit:
         for row in lrowgrp:
-            yield tuple(row)
+            yield row
 
 
 def lookupjoin(left, right, key=None, lkey=None, rkey=None, missing=None,
@@ -708,6 +757,8 @@ Table.lookupjoin = lookupjoin
 
 class LookupJoinView(Table):
 
+    _tuplerows = True
+
     def __init__(self, left, right, lkey, rkey, presorted=False, missing=None,
                  buffersize=None, tempdir=None, cache=True,
                  lprefix=None, rprefix=None):
@@ -724,6 +775,13 @@ class LookupJoinView(Table):
         self.lprefix = lprefix
         self.rprefix = rprefix
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('left', 'right'))
+
+    def _fieldtypes(self):
+        return _jointypes(self.left, self.right, self.lkey, self.rkey,
+                          leftouter=True, rightouter=False)
+
     def __iter__(self):
         return iterlookupjoin(self.left, self.right, self.lkey, self.rkey,
                               missing=self.missing, lprefix=self.lprefix,
@@ -732,7 +790,7 @@ class LookupJoinView(Table):
 
 def iterlookupjoin(left, right, lkey, rkey, missing=None, lprefix=None,
                    rprefix=None):
-    lit = iter(left)
+    lit = _itertuples(left)
     rit = iter(right)
 
     lhdr = next(lit)
@@ -762,23 +820,21 @@ def iterlookupjoin(left, right, lkey, rkey, missing=None, lprefix=None,
     else:
         outhdr.extend([(text_type(rprefix) + text_type(f)) for f in rgetv(rhdr)])
     yield tuple(outhdr)
+    rmissing = (missing,) * len(rvind)
 
     # define a function to join two groups of rows
     def joinrows(_lrowgrp, _rrowgrp):
         if _rrowgrp is None:
             for lrow in _lrowgrp:
-                outrow = list(lrow)  # start with the left row
-                # extend with missing values in place of the right row
-                outrow.extend([missing] * len(rvind))
-                yield tuple(outrow)
+                # extend the left row with missing values in place of the
+                # right row
+                yield lrow + rmissing
         else:
             rrow = next(iter(_rrowgrp))  # pick first arbitrarily
+            rvals = rgetv(rrow)
             for lrow in _lrowgrp:
-                # start with the left row
-                outrow = list(lrow)
-                # extend with non-key values from the right row
-                outrow.extend(rgetv(rrow))
-                yield tuple(outrow)
+                # extend the left row with non-key values from the right row
+                yield lrow + rvals
 
     # construct group iterators for both tables
     lgit = itertools.groupby(lit, key=lgetk)
@@ -796,7 +852,7 @@ def iterlookupjoin(left, right, lkey, rkey, missing=None, lprefix=None,
         while True:
             if lkval < rkval:
                 for row in joinrows(lrowgrp, None):
-                    yield tuple(row)
+                    yield row
                 # advance left
                 lkval, lrowgrp = next(lgit)
             elif lkval > rkval:
@@ -804,7 +860,7 @@ def iterlookupjoin(left, right, lkey, rkey, missing=None, lprefix=None,
                 rkval, rrowgrp = next(rgit)
             else:
                 for row in joinrows(lrowgrp, rrowgrp):
-                    yield tuple(row)
+                    yield row
                 # advance both
                 lkval, lrowgrp = next(lgit)
                 rkval, rrowgrp = next(rgit)
@@ -816,11 +872,11 @@ def iterlookupjoin(left, right, lkey, rkey, missing=None, lprefix=None,
     if lkval > rkval:
         # yield anything that got left hanging
         for row in joinrows(lrowgrp, None):
-            yield tuple(row)
+            yield row
     # yield the rest
     for lkval, lrowgrp in lgit:
         for row in joinrows(lrowgrp, None):
-            yield tuple(row)
+            yield row
 
 
 def unjoin(table, value, key=None, autoincrement=(1, 1), presorted=False,
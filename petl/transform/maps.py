@@ -8,11 +8,14 @@ from petl.compat import next, string_types, text_type
 
 import petl.config as config
 from petl.errors import ArgumentError
-from petl.util.base import Table, expr, rowgroupby, Record
+from petl.util.base import Table, expr, rowgroupby, _recordclass, \
+    _derivedheader
+from petl.util.parallel import _iterparallel
 from petl.transform.sorts import sort
 
 
-def fieldmap(table, mappings=None, failonerror=None, errorvalue=None, trusted=True):
+def fieldmap(table, mappings=None, failonerror=None, errorvalue=None,
+             trusted=True, workers=None, chunksize=None, ordered=True):
     """
     Transform a table, mapping fields arbitrarily between input and output.
     E.g.::
@@ -59,10 +62,14 @@ def fieldmap(table, mappings=None, failonerror=None, errorvalue=None, trusted=Tr
 
     The `failonerror` and `errorvalue` keyword arguments are documented
     under :func:`petl.config.failonerror`
+
+    The `workers`, `chunksize` and `ordered` keyword arguments can be used to
+    run the mappings in a pool of processes, see :func:`rowmap`.
     """
 
     return FieldMapView(table, mappings=mappings, failonerror=failonerror,
-                        errorvalue=errorvalue, trusted=trusted)
+                        errorvalue=errorvalue, trusted=trusted,
+                        workers=workers, chunksize=chunksize, ordered=ordered)
 
 
 Table.fieldmap = fieldmap
@@ -71,7 +78,8 @@ Table.fieldmap = fieldmap
 class FieldMapView(Table):
 
     def __init__(self, source, mappings=None, failonerror=None,
-                 errorvalue=None, trusted=True):
+                 errorvalue=None, trusted=True, workers=None, chunksize=None,
+                 ordered=True):
         self.source = source
         if mappings is None:
             self.mappings = OrderedDict()
@@ -81,11 +89,19 @@ class FieldMapView(Table):
                                 else failonerror)
         self.errorvalue = errorvalue
         self.trusted = trusted
+        self.workers = workers
+        self.chunksize = chunksize
+        self.ordered = ordered
 
     def __setitem__(self, key, value):
         self.mappings[key] = value
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
     def __iter__(self):
+        if self.workers:
+            return _iterparallel(self)
         return iterfieldmap(self.source, self.mappings, self.failonerror,
                             self.errorvalue, self.trusted)
 
@@ -123,7 +139,8 @@ def iterfieldmap(source, mappings, failonerror, errorvalue, trusted):
             raise ArgumentError('invalid mapping %r: %r' % (outfld, m))
 
     # wrap rows as records
-    it = (Record(row, flds) for row in it)
+    record = _recordclass(flds)
+    it = (record(row) for row in it)
     for row in it:
         outrow = list()
         for outfld in outhdr:
@@ -156,7 +173,8 @@ def composedict(d, srcfld):
     return g
 
 
-def rowmap(table, rowmapper, header, failonerror=None):
+def rowmap(table, rowmapper, header, failonerror=None, workers=None,
+           chunksize=None, ordered=True):
     """
     Transform rows via an arbitrary function. E.g.::
 
@@ -197,9 +215,22 @@ def rowmap(table, rowmapper, header, failonerror=None):
 
     The `failonerror` keyword argument is documented under
     :func:`petl.config.failonerror`
+
+    If `workers` is given, rows are mapped in a pool of that many processes,
+    which can speed up CPU-bound functions. Chunks of `chunksize` rows
+    (`petl.config.batchsize` by default) are sent to the workers, with a
+    few chunks in flight per worker, and output rows come back in the order
+    of the input, unless `ordered=False` is given, in which case chunks are
+    yielded as soon as they are done. Errors are handled in the workers as
+    usual and raised by the consumer. The pool is shut down when iteration
+    finishes or stops early. The function (and the table's other settings)
+    must be picklable if new processes are not forked (e.g., on Windows or
+    macOS), so a function defined at the top level of a module should be
+    used rather than a lambda.
     """
 
-    return RowMapView(table, rowmapper, header, failonerror=failonerror)
+    return RowMapView(table, rowmapper, header, failonerror=failonerror,
+                      workers=workers, chunksize=chunksize, ordered=ordered)
 
 
 Table.rowmap = rowmap
@@ -207,14 +238,23 @@ Table.rowmap = rowmap
 
 class RowMapView(Table):
 
-    def __init__(self, source, rowmapper, header, failonerror=None):
+    def __init__(self, source, rowmapper, header, failonerror=None,
+                 workers=None, chunksize=None, ordered=True):
         self.source = source
         self.rowmapper = rowmapper
         self.header = header
         self.failonerror = (config.failonerror if failonerror is None
                                 else failonerror)
+        self.workers = workers
+        self.chunksize = chunksize
+        self.ordered = ordered
+
+    def _staticheader(self):
+        return _derivedheader(self)
 
     def __iter__(self):
+        if self.workers:
+            return _iterparallel(self)
         return iterrowmap(self.source, self.rowmapper, self.header,
                           self.failonerror)
 
@@ -227,7 +267,8 @@ def iterrowmap(source, rowmapper, header, failonerror):
         return
     flds = list(map(text_type, hdr))
     yield tuple(header)
-    it = (Record(row, flds) for row in it)
+    record = _recordclass(flds)
+    it = (record(row) for row in it)
     for row in it:
         try:
             outrow = rowmapper(row)
@@ -239,7 +280,8 @@ def iterrowmap(source, rowmapper, header, failonerror):
                 raise e
 
 
-def rowmapmany(table, rowgenerator, header, failonerror=None):
+def rowmapmany(table, rowgenerator, header, failonerror=None, workers=None,
+               chunksize=None, ordered=True):
     """
     Map each input row to any number of output rows via an arbitrary
     function. E.g.::
@@ -292,11 +334,16 @@ def rowmapmany(table, rowgenerator, header, failonerror=None):
     The `failonerror` keyword argument is documented under
     :func:`petl.config.failonerror`
 
+    The `workers`, `chunksize` and `ordered` keyword arguments can be used to
+    run `rowgenerator` in a pool of processes, see :func:`rowmap`.
+
     See also the :func:`petl.transform.reshape.melt` function.
 
     """
 
-    return RowMapManyView(table, rowgenerator, header, failonerror=failonerror)
+    return RowMapManyView(table, rowgenerator, header, failonerror=failonerror,
+                          workers=workers, chunksize=chunksize,
+                          ordered=ordered)
 
 
 Table.rowmapmany = rowmapmany
@@ -304,14 +351,23 @@ Table.rowmapmany = rowmapmany
 
 class RowMapManyView(Table):
 
-    def __init__(self, source, rowgenerator, header, failonerror=None):
+    def __init__(self, source, rowgenerator, header, failonerror=None,
+                 workers=None, chunksize=None, ordered=True):
         self.source = source
         self.rowgenerator = rowgenerator
         self.header = header
         self.failonerror = (config.failonerror if failonerror is None
                                 else failonerror)
+        self.workers = workers
+        self.chunksize = chunksize
+        self.ordered = ordered
+
+    def _staticheader(self):
+        return _derivedheader(self)
 
     def __iter__(self):
+        if self.workers:
+            return _iterparallel(self)
         return iterrowmapmany(self.source, self.rowgenerator, self.header,
                               self.failonerror)
 
@@ -324,7 +380,8 @@ def iterrowmapmany(source, rowgenerator, header, failonerror):
         return
     flds = list(map(text_type, hdr))
     yield tuple(header)
-    it = (Record(row, flds) for row in it)
+    record = _recordclass(flds)
+    it = (record(row) for row in it)
     for row in it:
         try:
             for outrow in rowgenerator(row):
@@ -367,6 +424,9 @@ class RowGroupMapView(Table):
         self.header = header
         self.mapper = mapper
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
     def __iter__(self):
         return iterrowgroupmap(self.source, self.key, self.mapper, self.header)
 
@@ -0,0 +1,535 @@
+from __future__ import absolute_import, print_function, division
+
+
+import copy
+import math
+import operator
+import re
+import sys
+import time
+from itertools import islice
+from petl.compat import string_types, text_type, integer_types, PY2
+
+
+import petl.config as config
+from petl.util.base import Table, wrap
+from petl.transform.basics import CutView, CutOutView, TailView
+from petl.transform.selects import FieldSelectView, _Comparison, _Range, \
+    _inner, SplitView
+from petl.transform.sorts import SortView, MergeSortView
+from petl.transform.reductions import GroupingSetsView
+from petl.transform.reshape import RecastView, PivotView, TransposeView
+from petl.transform.setops import HashComplementView, \
+    HashIntersectionView, KeyDiffView
+from petl.transform.dedup import DistinctView
+from petl.transform.joins import CrossJoinView
+from petl.transform.hashjoins import HashJoinView, HashLeftJoinView, \
+    HashRightJoinView, HashAntiJoinView, HashLookupJoinView
+from petl.transform.intervals import IntervalJoinView, \
+    IntervalLeftJoinView, IntervalAntiJoinView, IntervalSubtractView
+from petl.transform.unpacks import UnpackDictView
+from petl.io.db_utils import _quote
+
+
+def plan(table):
+    """
+    Return the logical plan of a table, i.e., the tree of views it is built
+    from, each with its parameters. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar'],
+        ...           ['a', 1],
+        ...           ['b', 2]]
+        >>> table2 = etl.selecteq(table1, 'foo', 'a').cut('bar')
+        >>> p = etl.plan(table2)
+        >>> p.op
+        'CutView'
+        >>> p.params['spec']
+        ('bar',)
+        >>> [node.op for node in p.walk()]
+        ['CutView', 'FieldSelectView']
+        >>> p
+        CutView(missing=None, spec=('bar',))
+          FieldSelectView(complement=False, field='foo', missing=None, source=[['foo', 'bar'], ['a', 1], ['b', 2]], vectorized=False, where=eq('a'))
+
+    The plan is a :class:`PlanNode`, with its inputs (the views it reads
+    from) as child nodes. Sources which are not views (e.g., a list of rows
+    or a file source) are shown as parameters.
+
+    """
+
+    return PlanNode(table)
+
+
+Table.plan = plan
+
+
+class PlanNode(object):
+    """A view in a logical plan. See :func:`plan`."""
+
+    def __init__(self, table):
+        self.table = table
+        self.op = type(table).__name__
+        self.params = dict()
+        self.inputs = []
+        if isinstance(table, Table):
+            for name, value in vars(table).items():
+                if name.startswith('_'):
+                    continue
+                if isinstance(value, Table):
+                    self.inputs.append(PlanNode(value))
+                elif isinstance(value, (list, tuple)) and value \
+                        and all(isinstance(t, Table) for t in value):
+                    self.inputs.extend(PlanNode(t) for t in value)
+                else:
+                    self.params[name] = value
+
+    def walk(self):
+        """Iterate over this node and all nodes below it, depth first."""
+        for _, node in self._walk(0):
+            yield node
+
+    def _walk(self, depth):
+        yield depth, self
+        for node in self.inputs:
+            for item in node._walk(depth + 1):
+                yield item
+
+    def __repr__(self):
+        return '\n'.join(self._lines(0))
+
+    def _lines(self, depth):
+        params = ', '.join('%s=%s' % (k, _shortrepr(self.params[k]))
+                           for k in sorted(self.params))
+        yield '%s%s(%s)' % ('  ' * depth, self.op, params)
+        for node in self.inputs:
+            for line in node._lines(depth + 1):
+                yield line
+
+
+def _shortrepr(value, width=40):
+    r = repr(value)
+    if len(r) > width:
+        r = r[:width - 3] + '...'
+    return r
+
+
+def explain(table, sample=None):
+    """
+    Describe how each view in a pipeline reads its input. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar'],
+        ...           ['a', 1],
+        ...           ['b', 2],
+        ...           ['a', 3]]
+        >>> table2 = etl.aggregate(table1, 'foo', sum, 'bar').transpose()
+        >>> etl.explain(table2).cut('stage', 'key', 'sorts', 'reiterates',
+        ...                         'memory')
+        +-------------------------+-------+-------+------------+------------------+
+        | stage                   | key   | sorts | reiterates | memory           |
+        +=========================+=======+=======+============+==================+
+        | 'TransposeView'         | None  | False | True       | None             |
+        +-------------------------+-------+-------+------------+------------------+
+        | '  SimpleAggregateView' | 'foo' | False | False      | None             |
+        +-------------------------+-------+-------+------------+------------------+
+        | '    SortView'          | 'foo' | True  | False      | '<= 100000 rows' |
+        +-------------------------+-------+-------+------------+------------------+
+
+    The result is a table with one row per view, indented by its depth in
+    the pipeline (see :func:`plan`), and fields 'stage', 'key', 'sorts'
+    (whether the view sorts its input), 'spills' (whether it may write
+    rows to temporary files), 'buffers' (whether it holds rows, groups or
+    keys in memory), 'reiterates' (whether it iterates over its input more
+    than once) and 'memory' (the most it holds in memory, e.g.,
+    '<= 100000 rows' for a sort with the default buffer size, or 'all rows'
+    for the right table of a hash join).
+
+    If `sample` is given, up to that many rows are read through each view,
+    and the fields 'rows' (the number of rows read), 'seconds' (the time
+    taken, including the views below) and 'bytes' (an estimate of the memory
+    used by buffering views, from the size of the rows read) are added.
+
+    """
+
+    fields = ('stage', 'key', 'sorts', 'spills', 'buffers', 'reiterates',
+              'memory')
+    if sample is not None:
+        fields += ('rows', 'seconds', 'bytes')
+    rows = [fields]
+    for depth, node in PlanNode(table)._walk(0):
+        view = node.table
+        sorts, spills, buffers, bound, reiterates = _traits(view)
+        if buffers is None:
+            memory = None
+        elif bound is None:
+            memory = 'all %s' % buffers
+        else:
+            memory = '<= %s %s' % (bound, buffers)
+        row = ['  ' * depth + node.op, _key(view), sorts, spills,
+               buffers is not None, reiterates, memory]
+        if sample is not None:
+            row.extend(_measure(view, sample, buffers, bound))
+        rows.append(tuple(row))
+    return wrap(rows)
+
+
+Table.explain = explain
+
+
+_hashjoins = (HashJoinView, HashLeftJoinView, HashRightJoinView,
+              HashAntiJoinView, HashLookupJoinView, IntervalJoinView,
+              IntervalLeftJoinView, IntervalAntiJoinView,
+              IntervalSubtractView)
+
+
+def _traits(view):
+    # return whether the view sorts its input, may spill to disk, what it
+    # holds in memory and up to how many, and whether it reiterates its input
+    sorts = spills = reiterates = False
+    buffers = bound = None
+    buffersize = getattr(view, 'buffersize', None) or config.sort_buffersize
+    if isinstance(view, (SortView, MergeSortView, RecastView)):
+        # recast sorts internally, the others show up as sort views
+        sorts = spills = True
+        buffers, bound = 'rows', buffersize
+    elif isinstance(view, (HashComplementView, HashIntersectionView,
+                           DistinctView)) and getattr(view, 'hashed', True):
+        spills = True
+        buffers, bound = 'keys', buffersize
+    elif getattr(view, 'hashed', False) and not isinstance(view, KeyDiffView):
+        spills = True
+        buffers, bound = 'groups', buffersize
+    elif isinstance(view, PivotView):
+        spills = True
+        buffers, bound = 'groups', buffersize
+    elif isinstance(view, SplitView):
+        spills = True
+        buffers = 'rows'
+        bound = view.splitter.buffersize or config.sort_buffersize
+    elif isinstance(view, KeyDiffView) and view.hashed:
+        buffers, reiterates = 'keys', True
+    elif isinstance(view, _hashjoins + (CrossJoinView,)):
+        buffers = 'rows'
+    elif isinstance(view, GroupingSetsView):
+        buffers = 'groups'
+    elif isinstance(view, TailView):
+        buffers, bound = 'rows', view.n
+    elif isinstance(view, UnpackDictView) and view.keys is None:
+        buffers, bound = 'rows', view.samplesize
+    elif isinstance(view, TransposeView):
+        reiterates = True
+    return sorts, spills, buffers, bound, reiterates
+
+
+def _key(view):
+    for attr in 'key', 'lkey':
+        key = getattr(view, attr, None)
+        if key is not None:
+            rkey = getattr(view, 'rkey', key)
+            return key if rkey == key else (key, rkey)
+    return None
+
+
+def _measure(view, sample, buffers, bound):
+    start = time.time()
+    it = iter(view)
+    next(it, None)  # header
+    rows = list(islice(it, sample))
+    seconds = time.time() - start
+    nbytes = None
+    if buffers is not None and rows:
+        size = sum(sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row)
+                   for row in rows) / len(rows)
+        held = len(rows) if bound is None else min(bound, len(rows))
+        nbytes = int(size * held)
+    return len(rows), seconds, nbytes
+
+
+def optimize(table):
+    """
+    Push field selections and simple predicates down into the sources which
+    can apply them, e.g., as a column list and WHERE clause for a database
+    query. E.g.::
+
+        >>> import petl as etl
+        >>> import sqlite3
+        >>> connection = sqlite3.connect(':memory:')
+        >>> _ = connection.execute('CREATE TABLE example (foo, bar, baz)')
+        >>> _ = connection.executemany('INSERT INTO example VALUES (?, ?, ?)',
+        ...                            [('a', 1, 2.5), ('b', 2, 3.5)])
+        >>> table1 = (
+        ...     etl
+        ...     .fromdb(connection, 'SELECT * FROM example')
+        ...     .selectgt('bar', 1)
+        ...     .cut('foo', 'baz')
+        ... )
+        >>> table2 = etl.optimize(table1)
+        >>> table2
+        +-----+-----+
+        | foo | baz |
+        +=====+=====+
+        | 'b' | 3.5 |
+        +-----+-----+
+
+        >>> print(table2.source.source.query)
+        SELECT "foo", "baz", "bar" FROM (SELECT * FROM example) _petl WHERE "bar" > 1
+
+    Consecutive :func:`cut`, :func:`cutout` and field selections via
+    :func:`selecteq`, :func:`selectne`, :func:`selectlt`,
+    :func:`selectle`, :func:`selectgt`, :func:`selectge`, :func:`selectop`
+    (with one of these comparisons) and the `selectrange*` functions, applied
+    directly to one of the following sources, are pushed down:
+
+    * :func:`petl.io.db.fromdb` with a query string: the query is wrapped
+      with a column list and a WHERE clause;
+    * :func:`petl.io.pytables.fromhdf5`: numeric predicates are added to
+      the `condition`;
+    * :func:`petl.io.bcolz.frombcolz`: field names are set as the `outcols`
+      and numeric predicates added to the `expression` (unless `skip` or
+      `limit` are given);
+    * :func:`petl.io.csv.fromcsv`: only the selected fields are kept in the
+      rows read from the file.
+
+    The original transformations are kept on top of the source, so the
+    source only needs to narrow the data down, and the result is the same
+    as for `table`. Predicates are translated so that values which compare
+    as in :func:`select` (e.g., `None` sorting before other values for
+    :func:`selectlt`) are kept, assuming the values in the source are of
+    the same type as the value compared against. Field selections are only
+    pushed down when given by name. Pipelines below any other
+    transformation are optimized separately.
+
+    N.B., field names in queries pushed down to a database are quoted with
+    SQL-92 standard double quotes, so for MySQL the statement
+    ``SET SQL_MODE=ANSI_QUOTES`` is required (as for
+    :func:`petl.io.db.todb`).
+
+    """
+
+    views = []
+    source = table
+    while type(source) in (CutView, CutOutView, FieldSelectView):
+        views.append(source)
+        source = source.source
+    pusher = _getpushers().get(type(source))
+    projection = None
+    if views and pusher is not None:
+        projection = _projection(views)
+        pushed, projected = pusher(source, projection, _predicates(views))
+        if not projected:
+            projection = None
+    else:
+        pushed = _optimizesource(source)
+    if pushed is source:
+        return table
+    for view in reversed(views):
+        if projection is not None and projection[1] \
+                and isinstance(view, CutOutView):
+            continue  # fields already excluded by the source
+        pushed = _withsource(view, pushed, 'source')
+    return pushed
+
+
+Table.optimize = optimize
+
+
+def _withsource(view, source, attr):
+    view = copy.copy(view)
+    setattr(view, attr, source)
+    return view
+
+
+def _optimizesource(table):
+    for attr in 'source', 'table':
+        source = getattr(table, attr, None)
+        if isinstance(source, Table):
+            optimized = optimize(source)
+            if optimized is not source:
+                return _withsource(table, optimized, attr)
+            break
+    return table
+
+
+def _isnames(spec):
+    return all(isinstance(f, string_types) for f in spec)
+
+
+def _projection(views):
+    # determine the fields needed by the views, from the top down, returning
+    # a pair of field names and a complement flag, or None if all fields are
+    # needed
+    fields = None
+    exclude = []
+    for view in views:
+        if view.missing is not None:
+            return None  # short rows must be padded by the views themselves
+        if isinstance(view, FieldSelectView):
+            spec = view.field
+            if not isinstance(spec, (list, tuple)):
+                spec = spec,
+        else:
+            spec = tuple(view.spec)
+        if not _isnames(spec):
+            return None
+        if isinstance(view, CutView):
+            if fields is None:
+                fields = list(spec)
+        elif fields is not None:
+            # keep any fields used by the views below the cut
+            fields.extend(f for f in spec if f not in fields)
+        elif isinstance(view, CutOutView):
+            exclude.extend(spec)
+        elif any(f in exclude for f in spec):
+            return None
+    if fields is not None:
+        return fields, False
+    if exclude:
+        return exclude, True
+    return None
+
+
+_comparisons = {operator.eq: 'eq', operator.ne: 'ne', operator.lt: 'lt',
+                operator.le: 'le', operator.gt: 'gt', operator.ge: 'ge'}
+
+_reversed = {'lt': 'gt', 'le': 'ge'}
+
+
+def _predicates(views):
+    # extract simple comparisons as (field, op, value) triples
+    predicates = []
+    for view in views:
+        if not isinstance(view, FieldSelectView) or view.complement \
+                or not isinstance(view.field, string_types):
+            continue
+        where = view.where
+        if isinstance(where, _Comparison) and where.op in _comparisons:
+            predicates.append((view.field, _comparisons[where.op],
+                               _inner(where.value)))
+        elif isinstance(where, _Range):
+            minop = _reversed[_comparisons[where.minop]]
+            predicates.append((view.field, minop, _inner(where.minv)))
+            predicates.append((view.field, _comparisons[where.maxop],
+                               _inner(where.maxv)))
+    return predicates
+
+
+def _isnumber(v):
+    return (isinstance(v, integer_types + (float,))
+            and not isinstance(v, bool)
+            and not (isinstance(v, float) and (math.isnan(v)
+                                               or math.isinf(v))))
+
+
+def _literal(v):
+    if _isnumber(v):
+        return repr(v).rstrip('L')
+    return "'%s'" % v.replace("'", "''")
+
+
+_symbols = {'eq': '==', 'ne': '!=', 'lt': '<', 'le': '<=', 'gt': '>',
+            'ge': '>='}
+
+
+def _sqlpredicate(field, op, value):
+    col = _quote(field)
+    sym = '=' if op == 'eq' else '<>' if op == 'ne' else _symbols[op]
+    cond = '%s %s %s' % (col, sym, _literal(value))
+    if op in ('ne', 'lt', 'le'):
+        # None is not equal to and sorts before any value in petl
+        cond = '(%s OR %s IS NULL)' % (cond, col)
+    return cond
+
+
+def _pushdb(view, projection, predicates):
+    if not isinstance(view.query, string_types):
+        return view, False
+    predicates = [p for p in predicates
+                  if _isnumber(p[2]) or isinstance(p[2], text_type)]
+    columns = '*'
+    if projection is not None and not projection[1]:
+        columns = ', '.join(_quote(f) for f in projection[0])
+    if columns == '*' and not predicates:
+        return view, False
+    # no AS before the alias, which Oracle rejects
+    query = 'SELECT %s FROM (%s) _petl' % (
+        columns, view.query.strip().rstrip(';')
+    )
+    if predicates:
+        query += ' WHERE ' + ' AND '.join(_sqlpredicate(*p)
+                                          for p in predicates)
+    pushed = copy.copy(view)
+    pushed.query = query
+    # the connection stays with the original view, which must be kept alive
+    pushed.ownsdb = False
+    pushed._pushedfrom = view
+    return pushed, columns != '*'
+
+
+_identifier = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _numexpr(predicates):
+    # combine numeric predicates into a numexpr condition
+    return ' & '.join('(%s %s %s)' % (f, _symbols[op], _literal(v))
+                      for f, op, v in predicates
+                      if _isnumber(v) and _identifier.match(f))
+
+
+def _and(condition, other):
+    if not other:
+        return condition
+    if not condition:
+        return other
+    return '(%s) & %s' % (condition, other)
+
+
+def _pushhdf5(view, projection, predicates):
+    condition = _numexpr(predicates)
+    if not condition:
+        return view, False
+    pushed = copy.copy(view)
+    pushed.condition = _and(view.condition, condition)
+    return pushed, False
+
+
+def _pushbcolz(view, projection, predicates):
+    pushed = copy.copy(view)
+    if projection is not None and not projection[1]:
+        if view.outcols is None \
+                or all(f in view.outcols for f in projection[0]):
+            pushed.outcols = list(projection[0])
+    if not view.skip and view.limit is None:
+        pushed.expression = _and(view.expression, _numexpr(predicates))
+    if pushed.outcols == view.outcols \
+            and pushed.expression == view.expression:
+        return view, False
+    return pushed, pushed.outcols != view.outcols
+
+
+def _pushcsv(view, projection, predicates):
+    if projection is None:
+        return view, False
+    pushed = copy.copy(view)
+    pushed.projection = projection
+    return pushed, True
+
+
+_pushers = dict()
+
+
+def _getpushers():
+    # deferred, as the petl.io modules import petl.transform
+    if not _pushers:
+        from petl.io.db import DbView
+        from petl.io.pytables import HDF5View
+        from petl.io.bcolz import BcolzView
+        if PY2:
+            from petl.io.csv_py2 import CSVView
+        else:
+            from petl.io.csv_py3 import CSVView
+        _pushers[DbView] = _pushdb
+        _pushers[HDF5View] = _pushhdf5
+        _pushers[BcolzView] = _pushbcolz
+        _pushers[CSVView] = _pushcsv
+    return _pushers
@@ -8,10 +8,13 @@ from petl.compat import next, string_types, reduce, text_type
 
 
 from petl.errors import ArgumentError
-from petl.util.base import Table, iterpeek, rowgroupby
+from petl.comparison import Comparable
+from petl.util.base import Table, iterpeek, rowgroupby, rowgetter, asindices, \
+    _recordclass
 from petl.util.base import values
 from petl.util.counting import nrows
-from petl.transform.sorts import sort, mergesort
+from petl.transform.sorts import sort, mergesort, _iterhashgroups, _nostate, \
+    _checkstrategy
 from petl.transform.basics import cut
 from petl.transform.dedup import distinct
 
@@ -91,7 +94,8 @@ def iterrowreduce(source, key, reducer, header):
         
 
 def aggregate(table, key, aggregation=None, value=None, presorted=False,
-              buffersize=None, tempdir=None, cache=True, field='value'):
+              buffersize=None, tempdir=None, cache=True, field='value',
+              strategy='sort'):
     """Apply aggregation functions.
     E.g.::
 
@@ -214,18 +218,44 @@ def aggregate(table, key, aggregation=None, value=None, presorted=False,
 
     If `key` is None, sorting is not necessary.
 
+    If `strategy` is 'hash', the data are not sorted. Instead, groups are
+    accumulated in a hash table in a single pass, and output in order of
+    first appearance rather than sorted by key. Key values must be hashable.
+    At most `buffersize` groups are held in memory; once that many groups
+    are held, rows for any other keys are hash partitioned into temporary
+    files (in `tempdir`), and each partition is then aggregated in turn. The
+    aggregation functions :func:`sum`, :func:`len`, :func:`min` and
+    :func:`max` are computed incrementally, other functions are applied to
+    the values collected for each group. E.g.::
+
+        >>> table6 = etl.aggregate(table1, 'foo', sum, 'bar', strategy='hash',
+        ...                        buffersize=2)
+        >>> table6
+        +-----+-------+
+        | foo | value |
+        +=====+=======+
+        | 'a' |    10 |
+        +-----+-------+
+        | 'b' |    13 |
+        +-----+-------+
+        | 'c' |     4 |
+        +-----+-------+
+
     """
 
+    _checkstrategy(strategy)
     if callable(aggregation):
         return SimpleAggregateView(table, key, aggregation=aggregation, 
                                    value=value, presorted=presorted, 
                                    buffersize=buffersize, tempdir=tempdir, 
-                                   cache=cache, field=field)
+                                   cache=cache, field=field,
+                                   strategy=strategy)
     elif aggregation is None or isinstance(aggregation, (list, tuple, dict)):
         # ignore value arg
         return MultiAggregateView(table, key, aggregation=aggregation,  
                                   presorted=presorted, buffersize=buffersize, 
-                                  tempdir=tempdir, cache=cache)
+                                  tempdir=tempdir, cache=cache,
+                                  strategy=strategy)
     else:
         raise ArgumentError('expected aggregation is callable, list, tuple, dict '
                         'or None')
@@ -238,8 +268,9 @@ class SimpleAggregateView(Table):
     
     def __init__(self, table, key, aggregation=list, value=None, 
                  presorted=False, buffersize=None, tempdir=None,
-                 cache=True, field='value'):
-        if presorted or key is None:
+                 cache=True, field='value', strategy='sort'):
+        self.hashed = strategy == 'hash' and key is not None
+        if presorted or key is None or self.hashed:
             self.table = table
         else:
             self.table = sort(table, key, buffersize=buffersize, 
@@ -248,8 +279,15 @@ class SimpleAggregateView(Table):
         self.aggregation = aggregation
         self.value = value
         self.field = field
+        self.buffersize = buffersize
+        self.tempdir = tempdir
         
     def __iter__(self):
+        if self.hashed:
+            aggregation = OrderedDict([(self.field,
+                                        (self.value, self.aggregation))])
+            return iterhashaggregate(self.table, self.key, aggregation,
+                                     self.buffersize, self.tempdir)
         return itersimpleaggregate(self.table, self.key, self.aggregation, 
                                    self.value, self.field)
 
@@ -293,13 +331,16 @@ def itersimpleaggregate(table, key, aggregation, value, field):
 class MultiAggregateView(Table):
     
     def __init__(self, source, key, aggregation=None, presorted=False, 
-                 buffersize=None, tempdir=None, cache=True):
-        if presorted or key is None:
+                 buffersize=None, tempdir=None, cache=True, strategy='sort'):
+        self.hashed = strategy == 'hash' and key is not None
+        if presorted or key is None or self.hashed:
             self.source = source
         else:
             self.source = sort(source, key, buffersize=buffersize, 
                                tempdir=tempdir, cache=cache)
         self.key = key
+        self.buffersize = buffersize
+        self.tempdir = tempdir
         if aggregation is None:
             self.aggregation = OrderedDict()
         elif isinstance(aggregation, (list, tuple)):
@@ -315,20 +356,17 @@ class MultiAggregateView(Table):
             )
 
     def __iter__(self):
+        if self.hashed:
+            return iterhashaggregate(self.source, self.key, self.aggregation,
+                                     self.buffersize, self.tempdir)
         return itermultiaggregate(self.source, self.key, self.aggregation)
     
     def __setitem__(self, key, value):
         self.aggregation[key] = value
 
     
-def itermultiaggregate(source, key, aggregation):
+def _normaliseaggregation(aggregation):
     aggregation = OrderedDict(aggregation.items())  # take a copy
-    it = iter(source)
-    hdr = next(it)
-    # push back header to ensure we iterate only once
-    it = itertools.chain([hdr], it)
-
-    # normalise aggregators
     for outfld in aggregation:
         agg = aggregation[outfld]
         if callable(agg):
@@ -343,6 +381,15 @@ def itermultiaggregate(source, key, aggregation):
             pass  # no need to normalise
         else:
             raise ArgumentError('invalid aggregation: %r, %r' % (outfld, agg))
+    return aggregation
+
+
+def itermultiaggregate(source, key, aggregation):
+    aggregation = _normaliseaggregation(aggregation)
+    it = iter(source)
+    hdr = next(it)
+    # push back header to ensure we iterate only once
+    it = itertools.chain([hdr], it)
 
     # determine output header
     if isinstance(key, (list, tuple)):
@@ -392,6 +439,66 @@ def itermultiaggregate(source, key, aggregation):
         yield tuple(outrow)
 
 
+def _hashkeygetter(hdr, key):
+    # return a function to get hashable key values from a row, and whether
+    # the function needs rows wrapped as records
+    if callable(key):
+        return key, True
+    indices = asindices(hdr, key)
+    if isinstance(key, (list, tuple)):
+        return lambda row: tuple(row[i] for i in indices), False
+    return operator.itemgetter(indices[0]), False
+
+
+def iterhashaggregate(source, key, aggregation, buffersize, tempdir):
+    aggregation = _normaliseaggregation(aggregation)
+    it = iter(source)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        hdr = []
+    flds = list(map(text_type, hdr))
+
+    # determine output header
+    if isinstance(key, (list, tuple)):
+        outhdr = list(key)
+    elif callable(key):
+        outhdr = ['key']
+    else:
+        outhdr = [key]
+    outhdr.extend(aggregation)
+    yield tuple(outhdr)
+
+    getkey, wrap = _hashkeygetter(hdr, key)
+    getvals, factories = _accumulation(hdr, aggregation)
+    wrap = wrap or any(srcfld is None or callable(srcfld)
+                       for srcfld, _ in aggregation.values())
+    if wrap:
+        # raw rows are partitioned to disk, records are built when needed
+        _getkey = getkey
+        record = _recordclass(flds)
+
+        def getkey(row):
+            return _getkey(record(row))
+
+    def initial():
+        return [factory(aggfun) for factory, aggfun in factories]
+
+    def update(accs, row):
+        if wrap:
+            row = record(row)
+        for acc, getval in zip(accs, getvals):
+            acc.add(getval(row))
+        return accs
+
+    compound = isinstance(key, (list, tuple))
+    for k, accs in _iterhashgroups(it, getkey, initial, update,
+                                   buffersize=buffersize, tempdir=tempdir):
+        outrow = list(k) if compound else [k]
+        outrow.extend(acc.result() for acc in accs)
+        yield tuple(outrow)
+
+
 def groupcountdistinctvalues(table, key, value):
     """Group by the `key` field then count the number of distinct values in the
     `value` field."""
@@ -515,7 +622,7 @@ Table.groupselectmax = groupselectmax
 
 
 def mergeduplicates(table, key, missing=None, presorted=False, buffersize=None,
-                    tempdir=None, cache=True):
+                    tempdir=None, cache=True, strategy='sort'):
     """
     Merge duplicate rows under the given key. E.g.::
 
@@ -551,13 +658,19 @@ def mergeduplicates(table, key, missing=None, presorted=False, buffersize=None,
     `buffersize`, `tempdir` and `cache` arguments under the
     :func:`petl.transform.sorts.sort` function.
 
+    If `strategy` is 'hash', the data are not sorted, and rows are merged via
+    a hash table instead, as described for
+    :func:`petl.transform.reductions.aggregate`. Merged rows are output in
+    order of first appearance of each key.
+
     See also :func:`petl.transform.dedup.conflicts`.
 
     """
 
+    _checkstrategy(strategy)
     return MergeDuplicatesView(table, key, missing=missing, presorted=presorted,
                                buffersize=buffersize, tempdir=tempdir,
-                               cache=cache)
+                               cache=cache, strategy=strategy)
 
 
 Table.mergeduplicates = mergeduplicates
@@ -566,16 +679,23 @@ Table.mergeduplicates = mergeduplicates
 class MergeDuplicatesView(Table):
 
     def __init__(self, table, key, missing=None, presorted=False,
-                 buffersize=None, tempdir=None, cache=True):
-        if presorted:
+                 buffersize=None, tempdir=None, cache=True, strategy='sort'):
+        self.hashed = strategy == 'hash'
+        if presorted or self.hashed:
             self.table = table
         else:
             self.table = sort(table, key, buffersize=buffersize,
                               tempdir=tempdir, cache=cache)
         self.key = key
         self.missing = missing
+        self.buffersize = buffersize
+        self.tempdir = tempdir
 
     def __iter__(self):
+        if self.hashed:
+            return iterhashmergeduplicates(self.table, self.key,
+                                           self.missing, self.buffersize,
+                                           self.tempdir)
         return itermergeduplicates(self.table, self.key, self.missing)
 
 
@@ -614,6 +734,51 @@ def itermergeduplicates(table, key, missing):
         yield tuple(outrow)
 
 
+def iterhashmergeduplicates(table, key, missing, buffersize, tempdir):
+    it = iter(table)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        hdr = []
+    flds = list(map(text_type, hdr))
+
+    # determine output fields
+    if isinstance(key, string_types):
+        outhdr = [key]
+        keyflds = {key}
+    else:
+        outhdr = list(key)
+        keyflds = set(key)
+    valflds = [f for f in flds if f not in keyflds]
+    valfldidxs = [flds.index(f) for f in valflds]
+    outhdr.extend(valflds)
+    yield tuple(outhdr)
+
+    getkey, _ = _hashkeygetter(hdr, key)
+
+    def initial():
+        return [set() for _ in valfldidxs]
+
+    def update(mergedvals, row):
+        for vals, i in zip(mergedvals, valfldidxs):
+            if len(row) > i and row[i] != missing:
+                vals.add(row[i])
+        return mergedvals
+
+    for k, mergedvals in _iterhashgroups(it, getkey, initial, update,
+                                         buffersize=buffersize,
+                                         tempdir=tempdir):
+        if isinstance(key, string_types):
+            outrow = [k]
+        else:
+            outrow = list(k)
+        outrow.extend(vals.pop() if len(vals) == 1
+                      else missing if len(vals) == 0
+                      else Conflict(vals)
+                      for vals in mergedvals)
+        yield tuple(outrow)
+
+
 def merge(*tables, **kwargs):
     """
     Convenience function to combine multiple tables (via
@@ -665,7 +830,7 @@ class Conflict(frozenset):
 
 
 def fold(table, key, f, value=None, presorted=False, buffersize=None,
-         tempdir=None, cache=True):
+         tempdir=None, cache=True, strategy='sort'):
     """
     Reduce rows recursively via the Python standard :func:`reduce` function.
     E.g.::
@@ -688,13 +853,20 @@ def fold(table, key, f, value=None, presorted=False, buffersize=None,
         |   2 |    12 |
         +-----+-------+
 
+    If `strategy` is 'hash', the data are not sorted, and values are folded
+    into a hash table of partial results instead, as described for
+    :func:`petl.transform.reductions.aggregate`. Results are output in order
+    of first appearance of each key.
+
     See also :func:`petl.transform.reductions.aggregate`,
     :func:`petl.transform.reductions.rowreduce`.
 
     """
 
+    _checkstrategy(strategy)
     return FoldView(table, key, f, value=value, presorted=presorted,
-                    buffersize=buffersize, tempdir=tempdir, cache=cache)
+                    buffersize=buffersize, tempdir=tempdir, cache=cache,
+                    strategy=strategy)
 
 
 Table.fold = fold
@@ -703,8 +875,9 @@ Table.fold = fold
 class FoldView(Table):
 
     def __init__(self, table, key, f, value=None, presorted=False,
-                 buffersize=None, tempdir=None, cache=True):
-        if presorted:
+                 buffersize=None, tempdir=None, cache=True, strategy='sort'):
+        self.hashed = strategy == 'hash'
+        if presorted or self.hashed:
             self.table = table
         else:
             self.table = sort(table, key, buffersize=buffersize,
@@ -712,8 +885,13 @@ class FoldView(Table):
         self.key = key
         self.f = f
         self.value = value
+        self.buffersize = buffersize
+        self.tempdir = tempdir
 
     def __iter__(self):
+        if self.hashed:
+            return iterhashfold(self.table, self.key, self.f, self.value,
+                                self.buffersize, self.tempdir)
         return iterfold(self.table, self.key, self.f, self.value)
 
 
@@ -721,3 +899,374 @@ def iterfold(table, key, f, value):
     yield ('key', 'value')
     for k, grp in rowgroupby(table, key, value):
         yield k, reduce(f, grp)
+
+
+def iterhashfold(table, key, f, value, buffersize, tempdir):
+    it = iter(table)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        hdr = []
+    flds = list(map(text_type, hdr))
+    yield ('key', 'value')
+
+    getkey, wrap = _hashkeygetter(hdr, key)
+    if value is None:
+        getval = None
+        wrap = True
+    elif callable(value):
+        getval = value
+        wrap = True
+    else:
+        getval = operator.itemgetter(*asindices(hdr, value))
+    if wrap:
+        _getkey = getkey
+        record = _recordclass(flds)
+
+        def getkey(row):
+            return _getkey(record(row))
+
+    def initial():
+        return _nostate
+
+    def update(state, row):
+        if wrap:
+            row = record(row)
+        v = row if getval is None else getval(row)
+        if state is _nostate:
+            return v
+        return f(state, v)
+
+    # as for rowgroupby, a key of a single field gives single values
+    single = isinstance(key, (list, tuple)) and len(key) == 1
+    for k, v in _iterhashgroups(it, getkey, initial, update,
+                                buffersize=buffersize, tempdir=tempdir):
+        yield (k[0] if single else k), v
+
+
+def groupingsets(table, sets, aggregation=None, value=None, missing=None,
+                 groupingid=None, field='value'):
+    """
+    Aggregate rows under several grouping sets in a single pass over the
+    table. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['region', 'product', 'units'],
+        ...           ['east', 'tee', 12],
+        ...           ['west', 'golf', 15],
+        ...           ['east', 'golf', 14],
+        ...           ['west', 'tee', 6],
+        ...           ['east', 'tee', 3]]
+        >>> table2 = etl.groupingsets(table1, [('region', 'product'),
+        ...                                    ('product',)],
+        ...                           sum, 'units', groupingid='gid')
+        >>> table2.lookall()
+        +--------+---------+-----+-------+
+        | region | product | gid | value |
+        +========+=========+=====+=======+
+        | 'east' | 'golf'  |   0 |    14 |
+        +--------+---------+-----+-------+
+        | 'east' | 'tee'   |   0 |    15 |
+        +--------+---------+-----+-------+
+        | 'west' | 'golf'  |   0 |    15 |
+        +--------+---------+-----+-------+
+        | 'west' | 'tee'   |   0 |     6 |
+        +--------+---------+-----+-------+
+        | None   | 'golf'  |   2 |    29 |
+        +--------+---------+-----+-------+
+        | None   | 'tee'   |   2 |    21 |
+        +--------+---------+-----+-------+
+
+    The `sets` argument is a list of grouping sets, each a field name or a
+    tuple of field names (an empty tuple gives a grand total). The output
+    contains one field for each key field found in any grouping set, and key
+    fields that are not part of a row's grouping set (i.e., that have been
+    rolled up) are filled with `missing`. If `groupingid` is given, a field
+    of that name is added holding a bit mask of the rolled up key fields, as
+    for SQL ``GROUPING_ID()``.
+
+    The `aggregation` and `value` arguments are as for
+    :func:`petl.transform.reductions.aggregate`. Accumulators for all grouping
+    sets are maintained while the table is scanned once, without sorting.
+    Aggregations using :func:`sum`, :func:`len`, :func:`min` or :func:`max`
+    are computed incrementally; other aggregation functions are applied to
+    the collected values of each group once the scan is complete. Output rows
+    are grouped by grouping set, in the order given, then sorted by key.
+
+    See also :func:`petl.transform.reductions.rollup` and
+    :func:`petl.transform.reductions.cube`.
+
+    """
+
+    return GroupingSetsView(table, sets, aggregation=aggregation, value=value,
+                            missing=missing, groupingid=groupingid,
+                            field=field)
+
+
+Table.groupingsets = groupingsets
+
+
+def rollup(table, key, aggregation=None, value=None, missing=None,
+           groupingid=None, field='value'):
+    """
+    Aggregate rows under the given key and under each of its prefixes,
+    including a grand total, in a single pass over the table. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['region', 'product', 'units'],
+        ...           ['east', 'tee', 12],
+        ...           ['west', 'golf', 15],
+        ...           ['east', 'golf', 14],
+        ...           ['east', 'tee', 3]]
+        >>> table2 = etl.rollup(table1, ('region', 'product'), sum, 'units')
+        >>> table2.lookall()
+        +--------+---------+-------+
+        | region | product | value |
+        +========+=========+=======+
+        | 'east' | 'golf'  |    14 |
+        +--------+---------+-------+
+        | 'east' | 'tee'   |    15 |
+        +--------+---------+-------+
+        | 'west' | 'golf'  |    15 |
+        +--------+---------+-------+
+        | 'east' | None    |    29 |
+        +--------+---------+-------+
+        | 'west' | None    |    15 |
+        +--------+---------+-------+
+        | None   | None    |    44 |
+        +--------+---------+-------+
+
+    See :func:`petl.transform.reductions.groupingsets` for a description of
+    the other arguments.
+
+    """
+
+    key = _askeytuple(key)
+    sets = [key[:i] for i in range(len(key), -1, -1)]
+    return groupingsets(table, sets, aggregation=aggregation, value=value,
+                        missing=missing, groupingid=groupingid, field=field)
+
+
+Table.rollup = rollup
+
+
+def cube(table, key, aggregation=None, value=None, missing=None,
+         groupingid=None, field='value'):
+    """
+    Aggregate rows under every combination of the given key fields,
+    including a grand total, in a single pass over the table. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['region', 'product', 'units'],
+        ...           ['east', 'tee', 12],
+        ...           ['west', 'golf', 15],
+        ...           ['east', 'golf', 14]]
+        >>> table2 = etl.cube(table1, ('region', 'product'), sum, 'units',
+        ...                   groupingid='gid')
+        >>> table2.lookall()
+        +--------+---------+-----+-------+
+        | region | product | gid | value |
+        +========+=========+=====+=======+
+        | 'east' | 'golf'  |   0 |    14 |
+        +--------+---------+-----+-------+
+        | 'east' | 'tee'   |   0 |    12 |
+        +--------+---------+-----+-------+
+        | 'west' | 'golf'  |   0 |    15 |
+        +--------+---------+-----+-------+
+        | 'east' | None    |   1 |    26 |
+        +--------+---------+-----+-------+
+        | 'west' | None    |   1 |    15 |
+        +--------+---------+-----+-------+
+        | None   | 'golf'  |   2 |    29 |
+        +--------+---------+-----+-------+
+        | None   | 'tee'   |   2 |    12 |
+        +--------+---------+-----+-------+
+        | None   | None    |   3 |    41 |
+        +--------+---------+-----+-------+
+
+    See :func:`petl.transform.reductions.groupingsets` for a description of
+    the other arguments.
+
+    """
+
+    key = _askeytuple(key)
+    sets = [c for r in range(len(key), -1, -1)
+            for c in itertools.combinations(key, r)]
+    return groupingsets(table, sets, aggregation=aggregation, value=value,
+                        missing=missing, groupingid=groupingid, field=field)
+
+
+Table.cube = cube
+
+
+def _askeytuple(key):
+    if key is None:
+        return ()
+    if isinstance(key, (list, tuple)):
+        return tuple(key)
+    return key,
+
+
+class GroupingSetsView(Table):
+
+    def __init__(self, source, sets, aggregation=None, value=None,
+                 missing=None, groupingid=None, field='value'):
+        self.source = source
+        self.sets = [_askeytuple(s) for s in sets]
+        if callable(aggregation):
+            self.aggregation = OrderedDict([(field, (value, aggregation))])
+        elif aggregation is None:
+            self.aggregation = OrderedDict()
+        elif isinstance(aggregation, (list, tuple)):
+            self.aggregation = OrderedDict()
+            for t in aggregation:
+                self.aggregation[t[0]] = t[1:]
+        elif isinstance(aggregation, dict):
+            self.aggregation = aggregation
+        else:
+            raise ArgumentError('expected aggregation is callable, list, '
+                                'tuple, dict or None')
+        self.missing = missing
+        self.groupingid = groupingid
+
+    def __iter__(self):
+        return itergroupingsets(self.source, self.sets, self.aggregation,
+                                self.missing, self.groupingid)
+
+
+class _Accumulator(object):
+    # collect values, apply the aggregation function at the end
+
+    def __init__(self, aggfun):
+        self.aggfun = aggfun
+        self.vals = []
+
+    def add(self, v):
+        self.vals.append(v)
+
+    def result(self):
+        return self.aggfun(self.vals)
+
+
+class _SumAccumulator(object):
+
+    def __init__(self, aggfun):
+        self.total = 0
+
+    def add(self, v):
+        self.total += v
+
+    def result(self):
+        return self.total
+
+
+class _CountAccumulator(object):
+
+    def __init__(self, aggfun):
+        self.n = 0
+
+    def add(self, v):
+        self.n += 1
+
+    def result(self):
+        return self.n
+
+
+class _MinAccumulator(object):
+
+    def __init__(self, aggfun):
+        self.first = True
+        self.v = None
+
+    def add(self, v):
+        if self.first or v < self.v:
+            self.v = v
+            self.first = False
+
+    def result(self):
+        return self.v
+
+
+class _MaxAccumulator(_MinAccumulator):
+
+    def add(self, v):
+        if self.first or v > self.v:
+            self.v = v
+            self.first = False
+
+
+_accumulators = {sum: _SumAccumulator, len: _CountAccumulator,
+                 min: _MinAccumulator, max: _MaxAccumulator}
+
+
+def _accumulation(hdr, aggregation):
+    # determine how to get the value and accumulate for each output field
+    getvals = []
+    factories = []
+    for outfld in aggregation:
+        srcfld, aggfun = aggregation[outfld]
+        if srcfld is None:
+            getvals.append(lambda row: row)
+        elif callable(srcfld):
+            getvals.append(srcfld)
+        elif isinstance(srcfld, (list, tuple)):
+            getvals.append(operator.itemgetter(*asindices(hdr, srcfld)))
+        else:
+            getvals.append(operator.itemgetter(asindices(hdr, srcfld)[0]))
+        factory = _accumulators.get(aggfun, _Accumulator)
+        factories.append((factory, aggfun))
+    return getvals, factories
+
+
+def itergroupingsets(source, sets, aggregation, missing, groupingid):
+    aggregation = _normaliseaggregation(aggregation)
+    it = iter(source)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        hdr = []
+
+    # output key fields are all fields found in any grouping set
+    keyfields = []
+    for s in sets:
+        for f in s:
+            if f not in keyfields:
+                keyfields.append(f)
+    outhdr = list(keyfields)
+    if groupingid is not None:
+        outhdr.append(groupingid)
+    outhdr.extend(aggregation)
+    yield tuple(outhdr)
+
+    getkey = rowgetter(*asindices(hdr, keyfields))
+    positions = [[keyfields.index(f) for f in s] for s in sets]
+
+    getvals, factories = _accumulation(hdr, aggregation)
+
+    # single pass, maintaining accumulators for every grouping set
+    groups = [dict() for _ in sets]
+    for row in it:
+        k = getkey(row)
+        vals = [getval(row) for getval in getvals]
+        for g, pos in zip(groups, positions):
+            gk = tuple(k[p] for p in pos)
+            accs = g.get(gk)
+            if accs is None:
+                accs = g[gk] = [factory(aggfun)
+                                for factory, aggfun in factories]
+            for acc, v in zip(accs, vals):
+                acc.add(v)
+
+    # generate output
+    nkeys = len(keyfields)
+    for s, g, pos in zip(sets, groups, positions):
+        gid = sum(1 << (nkeys - 1 - i) for i, f in enumerate(keyfields)
+                  if f not in s)
+        for gk in sorted(g, key=Comparable):
+            outrow = [missing] * nkeys
+            for p, v in zip(pos, gk):
+                outrow[p] = v
+            if groupingid is not None:
+                outrow.append(gid)
+            outrow.extend(acc.result() for acc in g[gk])
+            yield tuple(outrow)
@@ -7,7 +7,7 @@ from petl.compat import next, text_type
 
 
 from petl.errors import ArgumentError
-from petl.util.base import Table, asindices
+from petl.util.base import Table, asindices, _sourceheader, _derivedheader
 from petl.transform.basics import TransformError
 from petl.transform.conversions import convert
 
@@ -89,6 +89,9 @@ class CaptureView(Table):
         self.flags = flags
         self.fill = fill
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
     def __iter__(self):
         return itercapture(self.source, self.field, self.pattern,
                            self.newfields, self.include_original, self.flags,
@@ -189,6 +192,9 @@ class SplitView(Table):
         self.maxsplit = maxsplit
         self.flags = flags
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
     def __iter__(self):
         return itersplit(self.source, self.field, self.pattern, self.newfields,
                          self.include_original, self.maxsplit, self.flags)
@@ -310,6 +316,9 @@ class SearchView(Table):
         self.flags = flags
         self.complement = complement
 
+    def _staticheader(self):
+        return _sourceheader(self.table)
+
     def __iter__(self):
         return itersearch(self.table, self.pattern, self.field, self.flags,
                           self.complement)
@@ -439,6 +448,9 @@ class SplitDownView(Table):
         self.maxsplit = maxsplit
         self.flags = flags
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('table',))
+
     def __iter__(self):
         return itersplitdown(self.table, self.field, self.pattern,
                              self.maxsplit, self.flags)
@@ -2,15 +2,14 @@ from __future__ import absolute_import, print_function, division
 
 
 import itertools
-import collections
 import operator
 from petl.compat import next, text_type
 
 
 from petl.comparison import comparable_itemgetter
-from petl.util.base import Table, rowgetter, values, itervalues, \
-    header, data, asindices
-from petl.transform.sorts import sort
+from petl.util.base import Table, rowgetter, values, header, data, \
+    asindices, _derivedheader
+from petl.transform.sorts import sort, _SpillBuffer
 
 
 def melt(table, key=None, variables=None, variablefield='variable',
@@ -100,6 +99,9 @@ class MeltView(Table):
         self.variablefield = variablefield
         self.valuefield = valuefield
 
+    def _staticheader(self):
+        return _derivedheader(self)
+
     def __iter__(self):
         return itermelt(self.source, self.key, self.variables,
                         self.variablefield, self.valuefield)
@@ -157,7 +159,8 @@ def itermelt(source, key, variables, variablefield, valuefield):
 
 
 def recast(table, key=None, variablefield='variable', valuefield='value',
-           samplesize=1000, reducers=None, missing=None):
+           samplesize=1000, reducers=None, missing=None, buffersize=None,
+           tempdir=None, cache=True):
     """
     Recast molten data. E.g.::
 
@@ -257,9 +260,13 @@ def recast(table, key=None, variablefield='variable', valuefield='value',
         |  3 | None | 'M'    |
         +----+------+--------+
 
-    Note that the table is scanned once to discover variables, then a second
-    time to reshape the data and recast variables as fields. How many rows are
-    scanned in the first pass is determined by the `samplesize` argument.
+    The table is sorted by the key fields (see also the discussion of the
+    `buffersize`, `tempdir` and `cache` arguments under the
+    :func:`petl.transform.sorts.sort` function), then scanned once. Variables
+    are discovered while each group is reshaped, and groups are held in
+    memory, or spilled to temporary files once more than `buffersize` groups
+    are held, until all variables are known. The `samplesize` argument is no
+    longer used and is retained for backwards compatibility.
 
     See also :func:`petl.transform.reshape.melt`.
 
@@ -267,7 +274,8 @@ def recast(table, key=None, variablefield='variable', valuefield='value',
 
     return RecastView(table, key=key, variablefield=variablefield,
                       valuefield=valuefield, samplesize=samplesize,
-                      reducers=reducers, missing=missing)
+                      reducers=reducers, missing=missing,
+                      buffersize=buffersize, tempdir=tempdir, cache=cache)
 
 
 Table.recast = recast
@@ -277,7 +285,7 @@ class RecastView(Table):
 
     def __init__(self, source, key=None, variablefield='variable',
                  valuefield='value', samplesize=1000, reducers=None,
-                 missing=None):
+                 missing=None, buffersize=None, tempdir=None, cache=True):
         self.source = source
         self.key = key
         self.variablefield = variablefield
@@ -288,17 +296,20 @@ class RecastView(Table):
         else:
             self.reducers = reducers
         self.missing = missing
+        self.buffersize = buffersize
+        self.tempdir = tempdir
+        self.cache = cache
 
     def __iter__(self):
         return iterrecast(self.source, self.key, self.variablefield,
                           self.valuefield, self.samplesize, self.reducers,
-                          self.missing)
+                          self.missing, self.buffersize, self.tempdir,
+                          self.cache)
 
 
 def iterrecast(source, key, variablefield, valuefield,
-               samplesize, reducers, missing):
-
-    # TODO only make one pass through the data
+               samplesize, reducers, missing, buffersize=None, tempdir=None,
+               cache=True):
 
     it = iter(source)
     try:
@@ -349,21 +360,61 @@ def iterrecast(source, key, variablefield, valuefield,
     keyindices = [flds.index(f) for f in keyfields]
     variableindices = [flds.index(f) for f in variablefields]
 
-    # determine the actual variable names to be cast as fields
+    # only needed the header from the unsorted source, rebinding `it` to the
+    # sorted rows releases it
+    source = sort(source, key=keyfields, buffersize=buffersize,
+                  tempdir=tempdir, cache=cache)
+    it = itertools.islice(source, 1, None)  # skip header row
+    getsortablekey = comparable_itemgetter(*keyindices)
+    getactualkey = operator.itemgetter(*keyindices)
+
+    def _recastgroups():
+        for _, group in itertools.groupby(it, key=getsortablekey):
+            group = iter(group)
+            first = next(group)
+            # N.B., key returned by groupby is wrapped as Comparable, we want
+            # to output the actual key value, get it from the first row
+            key_value = getactualkey(first)
+            # collect all values for each variable, in a single pass over
+            # the rows in the group
+            collected = [dict() for _ in variablefields]
+            for r in itertools.chain([first], group):
+                for vals, i in zip(collected, variableindices):
+                    vals.setdefault(r[i], []).append(r[valueindex])
+            for vals in collected:
+                for variable in vals:
+                    if len(vals[variable]) == 1:
+                        vals[variable] = vals[variable][0]
+                    else:
+                        redu = reducers.get(variable, list)
+                        vals[variable] = redu(vals[variable])
+            yield key_value, collected
+
+    def _outrow(key_value, collected):
+        if len(keyfields) > 1:
+            out_row = list(key_value)
+        else:
+            out_row = [key_value]
+        for f, vals in zip(variablefields, collected):
+            for variable in variables[f]:
+                out_row.append(vals.get(variable, missing))
+        return tuple(out_row)
+
     if isinstance(variablefields, dict):
-        # user supplied dictionary
+        # user supplied dictionary, can stream the output
         variables = variablefields
+        groups = _recastgroups()
     else:
-        variables = collections.defaultdict(set)
-        # sample the data to discover variables to be cast as fields
-        for row in itertools.islice(it, 0, samplesize):
-            for i, f in zip(variableindices, variablefields):
-                variables[f].add(row[i])
-        for f in variables:
-            # turn from sets to sorted lists
-            variables[f] = sorted(variables[f])
-
-    # finished the first pass
+        # discover the variables to be cast as fields while accumulating
+        # groups, holding groups (or spilling them to disk) until all
+        # variables are known
+        groups = _SpillBuffer(buffersize=buffersize, tempdir=tempdir)
+        found = [set() for _ in variablefields]
+        for key_value, collected in _recastgroups():
+            for s, vals in zip(found, collected):
+                s.update(vals)
+            groups.append((key_value, collected))
+        variables = dict((f, sorted(s)) for f, s in zip(variablefields, found))
 
     # determine the output fields
     outhdr = list(keyfields)
@@ -372,40 +423,8 @@ def iterrecast(source, key, variablefield, valuefield,
     yield tuple(outhdr)
 
     # output data
-
-    source = sort(source, key=keyfields)
-    it = itertools.islice(source, 1, None)  # skip header row
-    getsortablekey = comparable_itemgetter(*keyindices)
-    getactualkey = operator.itemgetter(*keyindices)
-
-    # process sorted data in newfields
-    groups = itertools.groupby(it, key=getsortablekey)
-    for _, group in groups:
-        # may need to iterate over the group more than once
-        group = list(group)
-        # N.B., key returned by groupby may be wrapped as SortableItem, we want
-        # to output the actual key value, get it from the first row in the group
-        key_value = getactualkey(group[0])
-        if len(keyfields) > 1:
-            out_row = list(key_value)
-        else:
-            out_row = [key_value]
-        for f, i in zip(variablefields, variableindices):
-            for variable in variables[f]:
-                # collect all values for the current variable
-                vals = [r[valueindex] for r in group if r[i] == variable]
-                if len(vals) == 0:
-                    val = missing
-                elif len(vals) == 1:
-                    val = vals[0]
-                else:
-                    if variable in reducers:
-                        redu = reducers[variable]
-                    else:
-                        redu = list  # list all values
-                    val = redu(vals)
-                out_row.append(val)
-        yield tuple(out_row)
+    for key_value, collected in groups:
+        yield _outrow(key_value, collected)
 
 
 def transpose(table):
@@ -502,6 +521,14 @@ def pivot(table, f1, f2, f3, aggfun, missing=None,
         | 'girl' |    19 |   24 |   9 |
         +--------+-------+------+-----+
 
+    If `presorted` is True, it is assumed that the data are already sorted by
+    `f1` then `f2`. Otherwise, the data are sorted, see also the discussion of
+    the `buffersize`, `tempdir` and `cache` arguments under the
+    :func:`petl.transform.sorts.sort` function. The sorted data are scanned
+    once, and aggregated groups are held in memory, or spilled to temporary
+    files once more than `buffersize` groups are held, until all output
+    fields are known.
+
     See also :func:`petl.transform.reshape.recast`.
 
     """
@@ -526,38 +553,47 @@ class PivotView(Table):
         self.f1, self.f2, self.f3 = f1, f2, f3
         self.aggfun = aggfun
         self.missing = missing
+        self.buffersize = buffersize
+        self.tempdir = tempdir
 
     def __iter__(self):
         return iterpivot(self.source, self.f1, self.f2, self.f3, self.aggfun,
-                         self.missing)
-
-
-def iterpivot(source, f1, f2, f3, aggfun, missing):
+                         self.missing, self.buffersize, self.tempdir)
 
-    # first pass - collect fields
-    f2vals = set(itervalues(source, f2))  # TODO only make one pass
-    f2vals = list(f2vals)
-    f2vals.sort()
-    outhdr = [f1]
-    outhdr.extend(f2vals)
-    yield tuple(outhdr)
 
-    # second pass - generate output
+def iterpivot(source, f1, f2, f3, aggfun, missing, buffersize=None,
+              tempdir=None):
     it = iter(source)
     try:
         hdr = next(it)
     except StopIteration:
         hdr = []
-    flds = list(map(text_type, hdr))
-    f1i = flds.index(f1)
-    f2i = flds.index(f2)
-    f3i = flds.index(f3)
+    f1i, f2i, f3i = [asindices(hdr, f)[0] for f in (f1, f2, f3)]
+
+    # single pass - aggregate each group and collect f2 values as we go,
+    # holding group results (or spilling them to disk) until the output
+    # fields are known
+    f2vals = set()
+    groups = _SpillBuffer(buffersize=buffersize, tempdir=tempdir)
     for v1, v1rows in itertools.groupby(it, key=operator.itemgetter(f1i)):
-        outrow = [v1] + [missing] * len(f2vals)
+        aggvals = []
         for v2, v12rows in itertools.groupby(v1rows,
                                              key=operator.itemgetter(f2i)):
-            aggval = aggfun([row[f3i] for row in v12rows])
-            outrow[1 + f2vals.index(v2)] = aggval
+            aggvals.append((v2, aggfun([row[f3i] for row in v12rows])))
+            f2vals.add(v2)
+        groups.append((v1, aggvals))
+
+    f2vals = sorted(f2vals)
+    outhdr = [f1]
+    outhdr.extend(f2vals)
+    yield tuple(outhdr)
+
+    # generate output, positioning values via a dict lookup
+    positions = dict((v2, i) for i, v2 in enumerate(f2vals, 1))
+    for v1, aggvals in groups:
+        outrow = [v1] + [missing] * len(f2vals)
+        for v2, aggval in aggvals:
+            outrow[positions[v2]] = aggval
         yield tuple(outrow)
 
 
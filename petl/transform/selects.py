@@ -2,12 +2,17 @@ from __future__ import absolute_import, print_function, division
 
 
 import operator
+from collections import OrderedDict
 from petl.compat import next, string_types, callable, text_type
 from petl.comparison import Comparable
 
 
+import petl.config as config
 from petl.errors import ArgumentError
-from petl.util.base import asindices, expr, Table, values, Record
+from petl.util.base import asindices, expr, Table, values, \
+    _rowexpr, _recordclass, _sourceheader, _sourcetypes, iterbatches, \
+    _unbatched, _asnumeric, _vectorcall, _columnrecord, _itertuples
+from petl.transform.sorts import _SpillBuffer, _spilllargest
 
 
 def select(table, *args, **kwargs):
@@ -60,11 +65,21 @@ def select(table, *args, **kwargs):
     The ``trusted`` keyword argument can be used to specify whether the
     expression is trusted. See `:func:`petl.util.base.expr` for details.
 
+    If `vectorized=True` is given and :mod:`numpy` is installed, rows are
+    selected in batches (see :func:`petl.util.base.iterbatches`), and the
+    condition is evaluated once per batch on whole columns, with numeric
+    columns given as numpy arrays, e.g., ``etl.select(table, 'bar', lambda c:
+    c > 5, vectorized=True)`` or ``etl.select(table, '{bar} > {baz}',
+    vectorized=True)``. The condition should return a boolean array with one
+    value per row. Otherwise, e.g., if a field is not all numbers or the rows
+    are uneven, the condition is evaluated one row at a time as usual.
+
     """
 
     missing = kwargs.get('missing', None)
     complement = kwargs.get('complement', False)
     trusted = kwargs.get('trusted', True)
+    vectorized = kwargs.get('vectorized', False)
 
     if len(args) == 0:
         raise ArgumentError('missing positional argument')
@@ -75,13 +90,13 @@ def select(table, *args, **kwargs):
         else:
             assert callable(where), 'second argument must be string or callable'
         return RowSelectView(table, where, missing=missing,
-                             complement=complement)
+                             complement=complement, vectorized=vectorized)
     else:
         field = args[0]
         where = args[1]
         assert callable(where), 'third argument must be callable'
         return FieldSelectView(table, field, where, complement=complement,
-                               missing=missing)
+                               missing=missing, vectorized=vectorized)
 
 
 Table.select = select
@@ -89,36 +104,69 @@ Table.select = select
 
 class RowSelectView(Table):
 
-    def __init__(self, source, where, missing=None, complement=False):
+    _tuplerows = True
+
+    def __init__(self, source, where, missing=None, complement=False,
+                 vectorized=False):
         self.source = source
         self.where = where
         self.missing = missing
         self.complement = complement
+        self.vectorized = vectorized
+
+    def _staticheader(self):
+        return _sourceheader(self.source)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.source)
+
+    def _iterbatches(self, size):
+        return _iterrowselectbatches(self.source, self.where, self.missing,
+                                     self.complement, size, self.vectorized)
 
     def __iter__(self):
+        if self.vectorized:
+            return _unbatched(self._iterbatches(config.batchsize))
         return iterrowselect(self.source, self.where, self.missing,
                              self.complement)
 
 
 class FieldSelectView(Table):
 
-    def __init__(self, source, field, where, complement=False, missing=None):
+    _tuplerows = True
+
+    def __init__(self, source, field, where, complement=False, missing=None,
+                 vectorized=False):
         self.source = source
         self.field = field
         self.where = where
         self.complement = complement
         self.missing = missing
+        self.vectorized = vectorized
+
+    def _staticheader(self):
+        return _sourceheader(self.source)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.source)
+
+    def _iterbatches(self, size):
+        return _iterfieldselectbatches(self.source, self.field, self.where,
+                                       self.complement, self.missing, size,
+                                       self.vectorized)
 
     def __iter__(self):
+        if self.vectorized:
+            return _unbatched(self._iterbatches(config.batchsize))
         return iterfieldselect(self.source, self.field, self.where,
                                self.complement, self.missing)
 
 
 def iterfieldselect(source, field, where, complement, missing):
-    it = iter(source)
+    it = _itertuples(source)
     try:
         hdr = next(it)
-        yield tuple(hdr)
+        yield hdr
     except StopIteration:
         hdr = []  # will raise FieldSelectionError below
     indices = asindices(hdr, field)
@@ -129,21 +177,99 @@ def iterfieldselect(source, field, where, complement, missing):
         except IndexError:
             v = missing
         if bool(where(v)) != complement:  # XOR
-            yield tuple(row)
+            yield row
 
 
 def iterrowselect(source, where, missing, complement):
-    it = iter(source)
+    it = _itertuples(source)
     try:
         hdr = next(it)
     except StopIteration:
         return  # will yield nothing
     flds = list(map(text_type, hdr))
-    yield tuple(hdr)
-    it = (Record(row, flds, missing=missing) for row in it)
+    yield hdr
+    rowwhere = _rowexpr(where, hdr, missing)
+    if rowwhere is not None:
+        # expression compiled against the header, no need for records
+        for row in it:
+            if bool(rowwhere(row)) != complement:  # XOR
+                yield row
+        return
+    record = _recordclass(flds, missing)
     for row in it:
-        if bool(where(row)) != complement:  # XOR
-            yield tuple(row)  # need to convert back to tuple?
+        if bool(where(record(row))) != complement:  # XOR
+            yield row
+
+
+def _iterfieldselectbatches(source, field, where, complement, missing, size,
+                            vectorized=False):
+    it = iterbatches(source, size)
+    try:
+        hdr = next(it)
+        yield tuple(hdr)
+    except StopIteration:
+        hdr = []  # will raise FieldSelectionError below
+    indices = asindices(hdr, field)
+    getv = operator.itemgetter(*indices)
+    if vectorized and len(indices) == 1:
+        import numpy as np
+    else:
+        vectorized = False
+    for batch in it:
+        if vectorized and min(map(len, batch)) > indices[0]:
+            a = _asnumeric(np, list(map(getv, batch)))
+            mask = (None if a is None
+                    else _vectorcall(np, where, a, len(batch), kind='b'))
+            if mask is not None:
+                batch = [tuple(row) for row, m in zip(batch, mask)
+                         if m != complement]
+                if batch:
+                    yield batch
+                continue
+        try:
+            vals = list(map(getv, batch))
+        except IndexError:
+            # some rows are short, fall back to checking each row
+            vals = [getv(row) if len(row) > max(indices) else missing
+                    for row in batch]
+        batch = [tuple(row) for row, v in zip(batch, vals)
+                 if bool(where(v)) != complement]  # XOR
+        if batch:
+            yield batch
+
+
+def _iterrowselectbatches(source, where, missing, complement, size,
+                          vectorized=False):
+    it = iterbatches(source, size)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        return  # will yield nothing
+    yield tuple(hdr)
+    flds = list(map(text_type, hdr))
+    test = _rowexpr(where, hdr, missing)
+    if test is None:
+        record = _recordclass(flds, missing)
+
+        def test(row):
+            return where(record(row))
+    if vectorized:
+        import numpy as np
+    for batch in it:
+        if vectorized:
+            rec = _columnrecord(np, flds, batch)
+            mask = (None if rec is None
+                    else _vectorcall(np, where, rec, len(batch), kind='b'))
+            if mask is not None:
+                batch = [tuple(row) for row, m in zip(batch, mask)
+                         if m != complement]
+                if batch:
+                    yield batch
+                continue
+        batch = [tuple(row) for row in batch
+                 if bool(test(row)) != complement]  # XOR
+        if batch:
+            yield batch
 
 
 def rowlenselect(table, n, complement=False):
@@ -160,13 +286,55 @@ def selectop(table, field, value, op, complement=False):
     """Select rows where the function `op` applied to the given field and
     the given value returns `True`."""
 
-    return select(table, field, lambda v: op(v, value),
+    return select(table, field, _Comparison(op, value),
                   complement=complement)
 
 
 Table.selectop = selectop
 
 
+class _Comparison(object):
+    # predicate comparing a value with a fixed operand, which can be
+    # inspected by the optimizer in petl.transform.plan
+
+    def __init__(self, op, value):
+        self.op = op
+        self.value = value
+
+    def __call__(self, v):
+        return self.op(v, self.value)
+
+    def __repr__(self):
+        return '%s(%r)' % (getattr(self.op, '__name__', self.op),
+                           _inner(self.value))
+
+
+class _Range(object):
+    # predicate testing a value lies within a range, which can be inspected
+    # by the optimizer in petl.transform.plan
+
+    def __init__(self, minv, maxv, minop, maxop, wrap=False):
+        self.minv = minv
+        self.maxv = maxv
+        self.minop = minop
+        self.maxop = maxop
+        self.wrap = wrap
+
+    def __call__(self, v):
+        if self.wrap:
+            v = Comparable(v)
+        return self.minop(self.minv, v) and self.maxop(v, self.maxv)
+
+    def __repr__(self):
+        return 'range(%r, %r)' % (_inner(self.minv), _inner(self.maxv))
+
+
+def _inner(value):
+    if isinstance(value, Comparable):
+        return value.inner
+    return value
+
+
 def selecteq(table, field, value, complement=False):
     """Select rows where the given field equals the given value."""
 
@@ -296,7 +464,7 @@ def selectrangeopenleft(table, field, minv, maxv, complement=False):
 
     minv = Comparable(minv)
     maxv = Comparable(maxv)
-    return select(table, field, lambda v: minv <= v < maxv,
+    return select(table, field, _Range(minv, maxv, operator.le, operator.lt),
                   complement=complement)
 
 
@@ -309,7 +477,7 @@ def selectrangeopenright(table, field, minv, maxv, complement=False):
 
     minv = Comparable(minv)
     maxv = Comparable(maxv)
-    return select(table, field, lambda v: minv < v <= maxv,
+    return select(table, field, _Range(minv, maxv, operator.lt, operator.le),
                   complement=complement)
 
 
@@ -322,7 +490,7 @@ def selectrangeopen(table, field, minv, maxv, complement=False):
 
     minv = Comparable(minv)
     maxv = Comparable(maxv)
-    return select(table, field, lambda v: minv <= v <= maxv,
+    return select(table, field, _Range(minv, maxv, operator.le, operator.le),
                   complement=complement)
 
 
@@ -335,7 +503,8 @@ def selectrangeclosed(table, field, minv, maxv, complement=False):
 
     minv = Comparable(minv)
     maxv = Comparable(maxv)
-    return select(table, field, lambda v: minv < Comparable(v) < maxv,
+    return select(table, field,
+                  _Range(minv, maxv, operator.lt, operator.lt, wrap=True),
                   complement=complement)
 
 
@@ -425,6 +594,9 @@ class SelectUsingContextView(Table):
         self.table = table
         self.query = query
 
+    def _staticheader(self):
+        return _sourceheader(self.table)
+
     def __iter__(self):
         return iterselectusingcontext(self.table, self.query)
 
@@ -437,7 +609,8 @@ def iterselectusingcontext(table, query):
         return  # will yield nothing
     flds = list(map(text_type, hdr))
     yield hdr
-    it = (Record(row, flds) for row in it)
+    record = _recordclass(flds)
+    it = (record(row) for row in it)
     prv = None
     cur = next(it)
     for nxt in it:
@@ -450,7 +623,7 @@ def iterselectusingcontext(table, query):
         yield cur
 
 
-def facet(table, key):
+def facet(table, key, onepass=False, buffersize=None, tempdir=None):
     """
     Return a dictionary mapping field values to tables. E.g.::
 
@@ -503,10 +676,31 @@ def facet(table, key):
         | 'b' |   3 | False |
         +-----+-----+-------+
 
+    By default, each facet is a view selecting rows from `table`, so
+    iterating over all facets scans the table once per facet. If `onepass` is
+    True, the table is instead scanned once, when this function is called,
+    and each row is routed to a buffer for its facet; the facets then replay
+    rows from these buffers. Once more than `buffersize` rows are held in
+    memory (see also :func:`petl.transform.sorts.sort`), all buffers are
+    written to temporary files (in `tempdir`).
+
     See also :func:`petl.util.materialise.facetcolumns`.
 
     """
 
+    if onepass:
+        def labeller(hdr):
+            indices = asindices(hdr, key)
+            if len(indices) == 1:
+                i = indices[0]
+                return lambda row: row[i] if i < len(row) else None
+            return lambda row: tuple(row[i] if i < len(row) else None
+                                     for i in indices)
+        splitter = _Splitter(table, labeller, buffersize=buffersize,
+                             tempdir=tempdir)
+        splitter.run()
+        return dict((v, splitter.table(v)) for v in splitter.labels())
+
     fct = dict()
     for v in set(values(table, key)):
         fct[v] = selecteq(table, key, v)
@@ -552,8 +746,24 @@ def biselect(table, *args, **kwargs):
 
     .. versionadded:: 1.1.0
 
+    By default, the source table is scanned once for each of the two tables.
+    If `onepass=True` is given as a keyword argument, the source table is
+    instead scanned once, when either table is first iterated, and rows are
+    routed into buffers from which both tables are replayed, as described
+    for :func:`petl.transform.selects.facet` (see also the `buffersize` and
+    `tempdir` keyword arguments).
+
     """
 
+    onepass = kwargs.pop('onepass', False)
+    buffersize = kwargs.pop('buffersize', None)
+    tempdir = kwargs.pop('tempdir', None)
+    if onepass:
+        labeller = _selectlabeller(args, kwargs)
+        splitter = _Splitter(table, labeller, buffersize=buffersize,
+                             tempdir=tempdir)
+        return splitter.table(True), splitter.table(False)
+
     # override complement kwarg
     kwargs['complement'] = False
     t1 = select(table, *args, **kwargs)
@@ -563,3 +773,104 @@ def biselect(table, *args, **kwargs):
 
 
 Table.biselect = biselect
+
+
+def _selectlabeller(args, kwargs):
+    # label rows as selected or not, as for select()
+    missing = kwargs.get('missing', None)
+    trusted = kwargs.get('trusted', True)
+    if len(args) == 0:
+        raise ArgumentError('missing positional argument')
+    elif len(args) == 1:
+        where = args[0]
+        if isinstance(where, string_types):
+            where = expr(where, trusted=trusted)
+        else:
+            assert callable(where), 'second argument must be string or callable'
+
+        def labeller(hdr):
+            record = _recordclass(list(map(text_type, hdr)), missing)
+            return lambda row: bool(where(record(row)))
+    else:
+        field = args[0]
+        where = args[1]
+        assert callable(where), 'third argument must be callable'
+
+        def labeller(hdr):
+            getv = operator.itemgetter(*asindices(hdr, field))
+
+            def label(row):
+                try:
+                    v = getv(row)
+                except IndexError:
+                    v = missing
+                return bool(where(v))
+            return label
+    return labeller
+
+
+class _Splitter(object):
+    # route each row of the source to a buffer for its label in a single
+    # pass, spilling the largest buffers to disk once more than buffersize
+    # rows are held in memory
+
+    def __init__(self, source, labeller, buffersize=None, tempdir=None):
+        self.source = source
+        self.labeller = labeller
+        if buffersize is None:
+            buffersize = config.sort_buffersize
+        self.buffersize = buffersize
+        self.tempdir = tempdir
+        self.hdr = None
+        self.buffers = None
+
+    def run(self):
+        if self.buffers is not None:
+            return
+        it = iter(self.source)
+        try:
+            hdr = next(it)
+        except StopIteration:
+            hdr = None
+        buffers = OrderedDict()
+        if hdr is not None:
+            getlabel = self.labeller(hdr)
+            held = 0
+            for row in it:
+                label = getlabel(row)
+                buf = buffers.get(label)
+                if buf is None:
+                    buf = buffers[label] = _SpillBuffer(
+                        buffersize=self.buffersize, tempdir=self.tempdir
+                    )
+                buf.append(tuple(row))
+                held += 1
+                if self.buffersize is not None and held > self.buffersize:
+                    held = _spilllargest(buffers.values(),
+                                         self.buffersize // 2)
+        self.hdr = hdr
+        self.buffers = buffers
+
+    def labels(self):
+        self.run()
+        return list(self.buffers.keys())
+
+    def table(self, label):
+        return SplitView(self, label)
+
+
+class SplitView(Table):
+
+    def __init__(self, splitter, label):
+        self.splitter = splitter
+        self.label = label
+
+    def __iter__(self):
+        self.splitter.run()
+        if self.splitter.hdr is None:
+            return
+        yield tuple(self.splitter.hdr)
+        buf = self.splitter.buffers.get(self.label)
+        if buf is not None:
+            for row in buf:
+                yield row
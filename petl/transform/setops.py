@@ -1,10 +1,12 @@
 from __future__ import absolute_import, print_function, division
 
+import itertools
 from collections import Counter
-from petl.compat import next
+from petl.compat import next, text_type
 from petl.comparison import Comparable
-from petl.util.base import header, Table
-from petl.transform.sorts import sort
+from petl.util.base import header, Table, asindices, _derivedheader
+from petl.util.hashing import rowdigest
+from petl.transform.sorts import sort, _hashpartitions, _checkstrategy
 from petl.transform.basics import cut
 
 
@@ -116,6 +118,9 @@ class ComplementView(Table):
                           cache=cache)
         self.strict = strict
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('a', 'b'))
+
     def __iter__(self):
         return itercomplement(self.a, self.b, self.strict)
 
@@ -401,6 +406,9 @@ class IntersectionView(Table):
             self.b = sort(b, buffersize=buffersize, tempdir=tempdir,
                           cache=cache)
 
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('a', 'b'))
+
     def __iter__(self):
         return iterintersection(self.a, self.b)
 
@@ -427,7 +435,8 @@ def iterintersection(a, b):
         pass
 
 
-def hashcomplement(a, b, strict=False):
+def hashcomplement(a, b, strict=False, buffersize=None, tempdir=None,
+                   digest=False):
     """
     Alternative implementation of :func:`petl.transform.setops.complement`,
     where the complement is executed by constructing an in-memory set for all
@@ -442,9 +451,22 @@ def hashcomplement(a, b, strict=False):
     If `strict` is `True` then strict set-like behaviour is used, i.e., 
     only rows in `a` not found in `b` are returned.
 
+    If `buffersize` is given, at most that many distinct rows from `b` are
+    held in memory. Any other rows from `b`, and rows from `a` which may match
+    them, are hash partitioned into temporary files (in `tempdir`), and the
+    complement is then computed for each pair of partitions in turn, so
+    neither table needs to fit in memory. Rows from `a` decided in memory are
+    output first in their original order, followed by rows from each
+    partition.
+
+    If `digest` is True, rows are compared via digests computed by
+    :func:`petl.util.hashing.rowdigest` rather than by value, so only a
+    compact digest is held for each distinct row from `b`.
+
     """
 
-    return HashComplementView(a, b, strict=strict)
+    return HashComplementView(a, b, strict=strict, buffersize=buffersize,
+                              tempdir=tempdir, digest=digest)
 
 
 Table.hashcomplement = hashcomplement
@@ -452,34 +474,39 @@ Table.hashcomplement = hashcomplement
 
 class HashComplementView(Table):
 
-    def __init__(self, a, b, strict=False):
+    def __init__(self, a, b, strict=False, buffersize=None, tempdir=None,
+                 digest=False):
         self.a = a
         self.b = b
         self.strict = strict
+        self.buffersize = buffersize
+        self.tempdir = tempdir
+        self.digest = digest
+
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('a', 'b'))
 
     def __iter__(self):
-        return iterhashcomplement(self.a, self.b, self.strict)
+        return iterhashcomplement(self.a, self.b, self.strict,
+                                  self.buffersize, self.tempdir, self.digest)
 
 
-def iterhashcomplement(a, b, strict):
+def iterhashcomplement(a, b, strict, buffersize=None, tempdir=None,
+                       digest=False):
     ita = iter(a)
     ahdr = next(ita)
     yield tuple(ahdr)
     itb = iter(b)
     next(itb)  # discard b header, assume same as a
 
-    # N.B., need to account for possibility of duplicate rows
-    bcnt = Counter(tuple(row) for row in itb)
-    for ar in ita:
-        t = tuple(ar)
-        if bcnt[t] > 0:
-            if not strict:
-                bcnt[t] -= 1
-        else:
-            yield t
+    getkey = rowdigest if digest else tuple
+    bkeys = (getkey(row) for row in itb)
+    for t in _iterhashsetop(ita, bkeys, getkey, False, strict, buffersize,
+                            tempdir):
+        yield t
 
 
-def hashintersection(a, b):
+def hashintersection(a, b, buffersize=None, tempdir=None, digest=False):
     """
     Alternative implementation of
     :func:`petl.transform.setops.intersection`, where the intersection
@@ -489,9 +516,15 @@ def hashintersection(a, b):
     May be faster and/or more resource efficient where the right table is small
     and the left table is large.
 
+    If `buffersize` is given, both tables are hash partitioned to temporary
+    files once more than that many distinct rows from `b` are held in memory,
+    and if `digest` is True, rows are compared via digests, as described for
+    :func:`petl.transform.setops.hashcomplement`.
+
     """
 
-    return HashIntersectionView(a, b)
+    return HashIntersectionView(a, b, buffersize=buffersize, tempdir=tempdir,
+                                digest=digest)
 
 
 Table.hashintersection = hashintersection
@@ -499,25 +532,327 @@ Table.hashintersection = hashintersection
 
 class HashIntersectionView(Table):
 
-    def __init__(self, a, b):
+    def __init__(self, a, b, buffersize=None, tempdir=None, digest=False):
         self.a = a
         self.b = b
+        self.buffersize = buffersize
+        self.tempdir = tempdir
+        self.digest = digest
+
+    def _staticheader(self):
+        return _derivedheader(self, attrs=('a', 'b'))
 
     def __iter__(self):
-        return iterhashintersection(self.a, self.b)
+        return iterhashintersection(self.a, self.b, self.buffersize,
+                                    self.tempdir, self.digest)
 
 
-def iterhashintersection(a, b):
+def iterhashintersection(a, b, buffersize=None, tempdir=None, digest=False):
     ita = iter(a)
     ahdr = next(ita)
     yield tuple(ahdr)
     itb = iter(b)
     next(itb)  # discard b header, assume same as a
 
+    getkey = rowdigest if digest else tuple
+    bkeys = (getkey(row) for row in itb)
+    for t in _iterhashsetop(ita, bkeys, getkey, True, False, buffersize,
+                            tempdir):
+        yield t
+
+
+def _iterhashsetop(ita, bkeys, getkey, intersect, strict, buffersize, tempdir,
+                   partitions=16, depth=0):
+    if buffersize is not None and buffersize < 1:
+        buffersize = 1
+
     # N.B., need to account for possibility of duplicate rows
-    bcnt = Counter(tuple(row) for row in itb)
+    bcnt = Counter()
+    bspill = None
+    for k in bkeys:
+        if k not in bcnt and buffersize is not None \
+                and len(bcnt) >= buffersize:
+            # all copies of a row are either counted or partitioned
+            if bspill is None:
+                bspill = _hashpartitions(buffersize, tempdir, partitions)
+            bspill[hash((depth, k)) % partitions].append(k)
+        else:
+            bcnt[k] += 1
+
+    aspill = None
+    if bspill is not None:
+        aspill = _hashpartitions(buffersize, tempdir, partitions)
     for ar in ita:
         t = tuple(ar)
-        if bcnt[t] > 0:
+        k = getkey(t)
+        if k in bcnt:
+            if intersect:
+                if bcnt[k] > 0:
+                    yield t
+                    bcnt[k] -= 1
+            elif bcnt[k] > 0:
+                if not strict:
+                    bcnt[k] -= 1
+            else:
+                yield t
+        elif aspill is not None:
+            # may match a partitioned row from b
+            aspill[hash((depth, k)) % partitions].append(t)
+        elif not intersect:
             yield t
-            bcnt[t] -= 1
+    del bcnt
+
+    if bspill is not None:
+        for i in range(partitions):
+            apart, aspill[i] = aspill[i], None
+            bpart, bspill[i] = bspill[i], None
+            for t in _iterhashsetop(iter(apart), iter(bpart), getkey,
+                                    intersect, strict, buffersize, tempdir,
+                                    partitions=partitions, depth=depth+1):
+                yield t
+
+
+def keydiff(old, new, key, compare=None, presorted=False, buffersize=None,
+            tempdir=None, cache=True, strategy='sort', field='change',
+            missing=None):
+    """
+    Find inserted, updated, deleted and unchanged rows between two snapshots
+    of a table, matching rows by `key`. E.g.::
+
+        >>> import petl as etl
+        >>> old = [['id', 'name', 'score'],
+        ...        [1, 'Ann', 10],
+        ...        [2, 'Bob', 20],
+        ...        [3, 'Cat', 30]]
+        >>> new = [['id', 'name', 'score'],
+        ...        [1, 'Ann', 10],
+        ...        [3, 'Cat', 35],
+        ...        [4, 'Dan', 40]]
+        >>> etl.keydiff(old, new, 'id')
+        +-------------+----+-------+-------+
+        | change      | id | name  | score |
+        +=============+====+=======+=======+
+        | 'unchanged' |  1 | 'Ann' |    10 |
+        +-------------+----+-------+-------+
+        | 'delete'    |  2 | 'Bob' |    20 |
+        +-------------+----+-------+-------+
+        | 'update'    |  3 | 'Cat' |    35 |
+        +-------------+----+-------+-------+
+        | 'insert'    |  4 | 'Dan' |    40 |
+        +-------------+----+-------+-------+
+
+        >>> # only compare some fields
+        ... etl.keydiff(old, new, 'id', compare='name').selectne('change',
+        ...                                                      'unchanged')
+        +----------+----+-------+-------+
+        | change   | id | name  | score |
+        +==========+====+=======+=======+
+        | 'delete' |  2 | 'Bob' |    20 |
+        +----------+----+-------+-------+
+        | 'insert' |  4 | 'Dan' |    40 |
+        +----------+----+-------+-------+
+
+    The output table has the fields of `new`, preceded by a field named by
+    the `field` argument giving the type of change. Deleted rows are output
+    with values from `old`, matched to the fields of `new` by name; all other
+    rows are output with values from `new`. A row is updated if any of the
+    `compare` fields differ, by default all fields of `new` other than the
+    key. If a key occurs more than once, rows for that key are paired in the
+    order they appear.
+
+    By default, both tables are sorted by `key` and merged in a single pass,
+    and rows are output in key order. If `presorted` is True, it is assumed
+    that the data are already sorted by the given key, and the `buffersize`,
+    `tempdir` and `cache` arguments are ignored. Otherwise, see also the
+    discussion of these arguments under the
+    :func:`petl.transform.sorts.sort` function.
+
+    If `strategy` is 'hash', the tables are not sorted. Instead, a hash table
+    of key values and digests of the `compare` values for each row of `old`
+    is held in memory, and `new` is streamed against it. Rows are output in
+    the order of `new`, followed by deleted rows in the order of `old`, found
+    by a second pass over `old`. Key values must be hashable.
+
+    """
+
+    _checkstrategy(strategy)
+    return KeyDiffView(old, new, key, compare=compare, presorted=presorted,
+                       buffersize=buffersize, tempdir=tempdir, cache=cache,
+                       strategy=strategy, field=field, missing=missing)
+
+
+Table.keydiff = keydiff
+
+
+class KeyDiffView(Table):
+
+    def __init__(self, old, new, key, compare=None, presorted=False,
+                 buffersize=None, tempdir=None, cache=True, strategy='sort',
+                 field='change', missing=None):
+        self.hashed = strategy == 'hash'
+        if presorted or self.hashed:
+            self.old = old
+            self.new = new
+        else:
+            self.old = sort(old, key, buffersize=buffersize, tempdir=tempdir,
+                            cache=cache)
+            self.new = sort(new, key, buffersize=buffersize, tempdir=tempdir,
+                            cache=cache)
+        self.key = key
+        self.compare = compare
+        self.field = field
+        self.missing = missing
+
+    def __iter__(self):
+        if self.hashed:
+            return iterhashkeydiff(self.old, self.new, self.key, self.compare,
+                                   self.field, self.missing)
+        return iterkeydiff(self.old, self.new, self.key, self.compare,
+                           self.field, self.missing)
+
+
+def _valuesgetter(indices, missing):
+    # N.B., tolerate short rows
+    def getvalues(row):
+        return tuple(row[i] if i < len(row) else missing for i in indices)
+    return getvalues
+
+
+def _keydiffgetters(ohdr, nhdr, key, compare, missing):
+    oflds = list(map(text_type, ohdr))
+    nflds = list(map(text_type, nhdr))
+    okey = _valuesgetter(asindices(ohdr, key), missing)
+    nkey = _valuesgetter(asindices(nhdr, key), missing)
+    if compare is None:
+        kflds = set(nflds[i] for i in asindices(nhdr, key))
+        compare = [f for f in nflds if f not in kflds and f in oflds]
+    ocmp = _valuesgetter(asindices(ohdr, compare), missing)
+    ncmp = _valuesgetter(asindices(nhdr, compare), missing)
+    # project old rows onto the fields of new
+    oindices = [oflds.index(f) if f in oflds else None for f in nflds]
+
+    def oproject(row):
+        return tuple(row[i] if i is not None and i < len(row) else missing
+                     for i in oindices)
+    nproject = _valuesgetter(range(len(nflds)), missing)
+    return okey, nkey, ocmp, ncmp, oproject, nproject
+
+
+def iterkeydiff(old, new, key, compare, field, missing):
+    ito = iter(old)
+    itn = iter(new)
+    try:
+        ohdr = next(ito)
+    except StopIteration:
+        ohdr = []
+    try:
+        nhdr = next(itn)
+    except StopIteration:
+        nhdr = []
+    yield (field,) + tuple(nhdr)
+
+    okey, nkey, ocmp, ncmp, oproject, nproject = \
+        _keydiffgetters(ohdr, nhdr, key, compare, missing)
+
+    # merge groups of rows with the same key
+    ogroups = itertools.groupby(ito, key=okey)
+    ngroups = itertools.groupby(itn, key=nkey)
+    ok, og = next(ogroups, (None, None))
+    nk, ng = next(ngroups, (None, None))
+    while og is not None or ng is not None:
+        if ng is None or (og is not None and ok != nk
+                          and Comparable(ok) < Comparable(nk)):
+            for orow in og:
+                yield ('delete',) + oproject(orow)
+            ok, og = next(ogroups, (None, None))
+        elif og is None or ok != nk:
+            for nrow in ng:
+                yield ('insert',) + nproject(nrow)
+            nk, ng = next(ngroups, (None, None))
+        else:
+            orows = list(og)
+            nrows = list(ng)
+            for orow, nrow in zip(orows, nrows):
+                change = 'unchanged' if ocmp(orow) == ncmp(nrow) else 'update'
+                yield (change,) + nproject(nrow)
+            for orow in orows[len(nrows):]:
+                yield ('delete',) + oproject(orow)
+            for nrow in nrows[len(orows):]:
+                yield ('insert',) + nproject(nrow)
+            ok, og = next(ogroups, (None, None))
+            nk, ng = next(ngroups, (None, None))
+
+
+def iterhashkeydiff(old, new, key, compare, field, missing):
+    ito = iter(old)
+    itn = iter(new)
+    try:
+        ohdr = next(ito)
+    except StopIteration:
+        ohdr = []
+    try:
+        nhdr = next(itn)
+    except StopIteration:
+        nhdr = []
+    yield (field,) + tuple(nhdr)
+
+    okey, nkey, ocmp, ncmp, oproject, nproject = \
+        _keydiffgetters(ohdr, nhdr, key, compare, missing)
+
+    # hold the digest of the compare values of each row of old, by key; keys
+    # repeated in old hold a list, starting with the number of rows matched
+    digests = dict()
+    for orow in ito:
+        k = okey(orow)
+        d = rowdigest(ocmp(orow))
+        held = digests.get(k)
+        if held is None:
+            digests[k] = d
+        elif isinstance(held, list):
+            held.append(d)
+        else:
+            digests[k] = [0, held, d]
+
+    # stream new against old
+    for nrow in itn:
+        k = nkey(nrow)
+        held = digests.get(k)
+        if held is None:
+            d = None
+        elif isinstance(held, list):
+            i = held[0] + 1
+            if i < len(held):
+                held[0] = i
+                d = held[i]
+            else:
+                d = None
+        else:
+            del digests[k]
+            d = held
+        if d is None:
+            yield ('insert',) + nproject(nrow)
+        else:
+            change = 'unchanged' if d == rowdigest(ncmp(nrow)) else 'update'
+            yield (change,) + nproject(nrow)
+
+    # rows of old not matched by a row of new have been deleted, i.e., all
+    # but the number of rows matched for each key
+    deleted = dict()
+    for k, held in digests.items():
+        if not isinstance(held, list):
+            deleted[k] = 0
+        elif held[0] < len(held) - 1:
+            deleted[k] = held[0]
+    del digests
+    if deleted:
+        ito = iter(old)
+        next(ito, None)  # skip header
+        for orow in ito:
+            k = okey(orow)
+            skip = deleted.get(k)
+            if skip is None:
+                continue
+            if skip > 0:
+                deleted[k] = skip - 1
+            else:
+                yield ('delete',) + oproject(orow)
@@ -12,8 +12,10 @@ from petl.compat import pickle, next, text_type
 
 
 import petl.config as config
-from petl.comparison import comparable_itemgetter
-from petl.util.base import Table, asindices
+from petl.errors import ArgumentError
+from petl.comparison import comparable_itemgetter, _typed_itemgetter
+from petl.util.base import Table, asindices, _sourceheader, _derivedheader, \
+    _sourcetypes, _itertuples
 
 
 logger = logging.getLogger(__name__)
@@ -219,6 +221,9 @@ def _mergesorted(key=None, reverse=False, *iterables):
 
 
 class SortView(Table):
+
+    _tuplerows = True
+
     def __init__(self, source, key=None, reverse=False, buffersize=None,
                  tempdir=None, cache=True):
         self.source = source
@@ -242,6 +247,12 @@ class SortView(Table):
         self._filecache = None
         self._getkey = None
 
+    def _staticheader(self):
+        return _sourceheader(self.source)
+
+    def _fieldtypes(self):
+        return _sourcetypes(self.source)
+
     def __iter__(self):
         source = self.source
         key = self.key
@@ -257,7 +268,7 @@ class SortView(Table):
         debug('iterate from memory cache')
         yield tuple(self._hdrcache)
         for row in self._memcache:
-            yield tuple(row)
+            yield row
 
     def _iterfromfilecache(self):
         # create a reference to the filecache here, so cleanup happens in the
@@ -270,7 +281,7 @@ class SortView(Table):
         rows = _mergesorted(self._getkey, self.reverse, *chunkiters)
         try:
             for row in rows:
-                yield tuple(row)
+                yield row
         finally:
             debug('attempt cleanup from generator')
             # N.B., need to ensure that any open files are closed **before**
@@ -284,7 +295,9 @@ class SortView(Table):
     def _iternocache(self, source, key, reverse):
         debug('iterate without cache')
         self.clearcache()
-        it = iter(source)
+        # rows are held as tuples, in memory or pickled to chunk files, so can
+        # be yielded as they are
+        it = _itertuples(source)
 
         try:
             hdr = next(it)
@@ -299,10 +312,9 @@ class SortView(Table):
             indices = asindices(hdr, key)
         else:
             indices = range(len(hdr))
-        # now use field indices to construct a _getkey function
-        getkey = comparable_itemgetter(*indices)
-
-        # TODO support native comparison
+        # now use field indices to construct a _getkey function, comparing
+        # natively if the types of the key fields are known
+        getkey = _typed_itemgetter(_sourcetypes(source), *indices)
 
         # initialise the first chunk
         rows = list(itertools.islice(it, 0, self.buffersize))
@@ -320,7 +332,7 @@ class SortView(Table):
                 self._getkey = getkey
 
             for row in rows:
-                yield tuple(row)
+                yield row
 
         else:
             # no, table is too big, need to sort in chunks
@@ -356,7 +368,7 @@ class SortView(Table):
 
             chunkiters = [_iterchunk(f.name) for f in chunkfiles]
             for row in _mergesorted(getkey, reverse, *chunkiters):
-                yield tuple(row)
+                yield row
 
 
 class _NamedTempFileDeleteOnGC(object):
@@ -385,6 +397,181 @@ class _NamedTempFileDeleteOnGC(object):
         return self.name
 
 
+class _SpillBuffer(object):
+    """Append-only buffer of picklable items, which are appended to a single
+    temporary file each time more than `buffersize` items are held in memory.
+    Iterating yields all items in the order they were appended."""
+
+    def __init__(self, buffersize=None, tempdir=None):
+        if buffersize is None:
+            buffersize = config.sort_buffersize
+        self.buffersize = buffersize
+        self.tempdir = tempdir
+        self._spillfile = None
+        self._spilled = 0
+        self._items = []
+        self._n = 0
+
+    def append(self, item):
+        self._items.append(item)
+        self._n += 1
+        if self.buffersize is not None and \
+                len(self._items) >= self.buffersize:
+            self.spill()
+
+    def held(self):
+        # number of items held in memory
+        return len(self._items)
+
+    def spill(self):
+        if not self._items:
+            return
+        if self._spillfile is None:
+            with NamedTemporaryFile(dir=self.tempdir, delete=False,
+                                    mode='wb') as f:
+                self._spillfile = _NamedTempFileDeleteOnGC(f.name)
+        debug('spilling %s items to %s' % (len(self._items),
+                                           self._spillfile.name))
+        with open(self._spillfile.name, 'ab') as f:
+            for item in self._items:
+                pickle.dump(item, f, protocol=-1)
+        self._spilled += len(self._items)
+        self._items = []
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        # hold a reference to the file while iterating, and only read the
+        # items spilled so far, in case more are spilled in the meantime
+        spillfile, spilled = self._spillfile, self._spilled
+        items = list(self._items)
+        if spillfile is not None:
+            it = _iterchunk(spillfile.name)
+            try:
+                for item in itertools.islice(it, spilled):
+                    yield item
+            finally:
+                it.close()
+        for item in items:
+            yield item
+
+
+def _spilllargest(buffers, limit):
+    # spill the largest of the given buffers until at most `limit` items are
+    # held in memory, returning the number of items still held
+    buffers = sorted(buffers, key=_SpillBuffer.held, reverse=True)
+    held = sum(buf.held() for buf in buffers)
+    for buf in buffers:
+        if held <= limit:
+            break
+        held -= buf.held()
+        buf.spill()
+    return held
+
+
+def _checkstrategy(strategy):
+    if strategy not in ('sort', 'hash'):
+        raise ArgumentError("expected strategy is 'sort' or 'hash', found %r"
+                            % strategy)
+
+
+_nostate = object()
+
+
+# fewest items held in memory for each partition before it is written to disk
+_minchunksize = 64
+
+
+def _hashpartitions(buffersize, tempdir, partitions):
+    debug('hash table full, partitioning to disk')
+    # hold about `buffersize` spilled items in memory across all partitions,
+    # but don't write to disk a few items at a time
+    chunksize = max(_minchunksize, buffersize // partitions)
+    return [_SpillBuffer(buffersize=chunksize, tempdir=tempdir)
+            for _ in range(partitions)]
+
+
+def _iterhashgroups(it, getkey, initial, update, buffersize=None,
+                    tempdir=None, partitions=16, depth=0):
+    """Group items from `it` by `getkey` using a hash table of states,
+    yielding (key, state) pairs. States are created via `initial()` and
+    updated via ``state = update(state, item)``.
+
+    Once `buffersize` groups are held in memory, items for keys not already
+    held are hash partitioned to temporary files, and each partition is
+    then grouped in turn (recursively, with a different hash). Keys held in
+    memory are yielded first, in order of first appearance."""
+
+    if buffersize is None:
+        buffersize = config.sort_buffersize
+    if buffersize is not None and buffersize < 1:
+        buffersize = 1
+    states = dict()
+    spill = None
+    for item in it:
+        k = getkey(item)
+        state = states.get(k, _nostate)
+        if state is _nostate:
+            if buffersize is not None and len(states) >= buffersize:
+                if spill is None:
+                    spill = _hashpartitions(buffersize, tempdir, partitions)
+                spill[hash((depth, k)) % partitions].append(item)
+                continue
+            state = initial()
+        states[k] = update(state, item)
+    for kv in states.items():
+        yield kv
+    del states
+    if spill is not None:
+        for i in range(partitions):
+            part, spill[i] = spill[i], None
+            for kv in _iterhashgroups(iter(part), getkey, initial, update,
+                                      buffersize=buffersize, tempdir=tempdir,
+                                      partitions=partitions, depth=depth+1):
+                yield kv
+
+
+def _iterhashdistinct(it, getkey, buffersize=None, tempdir=None,
+                      partitions=16, depth=0):
+    """Yield the first item from `it` for each distinct value of `getkey`,
+    using a hash set of keys.
+
+    Once `buffersize` keys are held in memory, items for keys not already
+    held are hash partitioned to temporary files, and each partition is
+    then processed in turn (recursively, with a different hash). Items are
+    yielded in order of appearance within the items held in memory and then
+    within each partition."""
+
+    if buffersize is None:
+        buffersize = config.sort_buffersize
+    if buffersize is not None and buffersize < 1:
+        buffersize = 1
+    seen = set()
+    spill = None
+    for item in it:
+        k = getkey(item)
+        if k in seen:
+            continue
+        if buffersize is not None and len(seen) >= buffersize:
+            if spill is None:
+                spill = _hashpartitions(buffersize, tempdir, partitions)
+            spill[hash((depth, k)) % partitions].append(item)
+            continue
+        seen.add(k)
+        yield item
+    del seen
+    if spill is not None:
+        for i in range(partitions):
+            part, spill[i] = spill[i], None
+            for item in _iterhashdistinct(iter(part), getkey,
+                                          buffersize=buffersize,
+                                          tempdir=tempdir,
+                                          partitions=partitions,
+                                          depth=depth+1):
+                yield item
+
+
 def mergesort(*tables, **kwargs):
     """
     Combine multiple input tables into one sorted output table. E.g.::
@@ -475,6 +662,9 @@ class MergeSortView(Table):
         self.header = header
         self.reverse = reverse
 
+    def _staticheader(self):
+        return _derivedheader(self, listattr='tables')
+
     def __iter__(self):
         return itermergesort(self.tables, self.key, self.header, self.missing,
                              self.reverse)
@@ -583,7 +773,8 @@ def issorted(table, key=None, reverse=False, strict=False):
                 return False
             prev = curr
     else:
-        getkey = comparable_itemgetter(*asindices(flds, key))
+        getkey = _typed_itemgetter(_sourcetypes(table),
+                                   *asindices(flds, key))
         prev = next(it)
         prevkey = getkey(prev)
         for curr in it:
@@ -6,7 +6,7 @@ import operator
 from petl.compat import text_type
 
 
-from petl.util.base import Table, asindices, Record
+from petl.util.base import Table, asindices, _recordclass
 
 
 def validate(table, constraints=None, header=None):
@@ -141,6 +141,7 @@ def iterproblems(table, constraints, expected_header):
 
     # generate problems
     expected_len = len(flds)
+    record = _recordclass(flds)
     for i, row in enumerate(it):
         row = tuple(row)
 
@@ -153,7 +154,7 @@ def iterproblems(table, constraints, expected_header):
             yield ('__len__', i+1, None, l, type(e).__name__)
 
         # user defined constraints
-        row = Record(row, flds)
+        row = record(row)
         for constraint in local_constraints:
             name = constraint.get('name', None)
             field = constraint.get('field', None)
@@ -0,0 +1,399 @@
+from __future__ import absolute_import, print_function, division
+
+
+import copy
+import itertools
+from collections import deque
+from petl.compat import next
+
+
+from petl.errors import ArgumentError
+from petl.comparison import comparable_itemgetter
+from petl.util.base import Table, asindices
+from petl.transform.sorts import sort
+from petl.transform.basics import stack
+
+
+def window(table, functions, partition=None, order=None, reverse=False,
+           presorted=False, buffersize=None, tempdir=None, cache=True,
+           missing=None):
+    """
+    Add fields computed by window functions evaluated over partitions of the
+    table. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['region', 'day', 'sales'],
+        ...           ['east', 2, 20],
+        ...           ['west', 1, 5],
+        ...           ['east', 1, 10],
+        ...           ['east', 3, 20],
+        ...           ['west', 2, 7]]
+        >>> from collections import OrderedDict
+        >>> functions = OrderedDict()
+        >>> functions['n'] = etl.rownumber()
+        >>> functions['prev'] = etl.lag('sales')
+        >>> functions['total'] = etl.cumsum('sales')
+        >>> functions['rank'] = etl.rank()
+        >>> table2 = etl.window(table1, functions, partition='region',
+        ...                     order='sales')
+        >>> table2.lookall()
+        +--------+-----+-------+---+------+-------+------+
+        | region | day | sales | n | prev | total | rank |
+        +========+=====+=======+===+======+=======+======+
+        | 'east' |   1 |    10 | 1 | None |    10 |    1 |
+        +--------+-----+-------+---+------+-------+------+
+        | 'east' |   2 |    20 | 2 |   10 |    30 |    2 |
+        +--------+-----+-------+---+------+-------+------+
+        | 'east' |   3 |    20 | 3 |   20 |    50 |    2 |
+        +--------+-----+-------+---+------+-------+------+
+        | 'west' |   1 |     5 | 1 | None |     5 |    1 |
+        +--------+-----+-------+---+------+-------+------+
+        | 'west' |   2 |     7 | 2 |    5 |    12 |    2 |
+        +--------+-----+-------+---+------+-------+------+
+
+        >>> # moving averages over the current and preceding rows
+        ... table3 = etl.window(table1, [('avg', etl.movingavg('sales', 2))],
+        ...                     partition='region', order='day')
+        >>> table3.lookall()
+        +--------+-----+-------+------+
+        | region | day | sales | avg  |
+        +========+=====+=======+======+
+        | 'east' |   1 |    10 | 10.0 |
+        +--------+-----+-------+------+
+        | 'east' |   2 |    20 | 15.0 |
+        +--------+-----+-------+------+
+        | 'east' |   3 |    20 | 20.0 |
+        +--------+-----+-------+------+
+        | 'west' |   1 |     5 |  5.0 |
+        +--------+-----+-------+------+
+        | 'west' |   2 |     7 |  6.0 |
+        +--------+-----+-------+------+
+
+    The `functions` argument maps output field names to window functions,
+    either as a dictionary or as a list of (field, function) pairs. Available
+    window functions are :func:`rownumber`, :func:`rank`, :func:`denserank`,
+    :func:`lag`, :func:`lead`, :func:`cumsum`, :func:`cumcount`,
+    :func:`movingsum`, :func:`movingavg`, :func:`movingmin` and
+    :func:`movingmax`.
+
+    Rows are sorted by the `partition` fields followed by the `order` fields
+    (via :func:`petl.transform.sorts.sort`) unless `presorted` is True, in
+    which case the `buffersize`, `tempdir` and `cache` arguments are ignored.
+    The table is then evaluated in a single pass, and memory use is bounded by
+    the largest window frame rather than by the size of each partition.
+
+    """
+
+    return WindowView(table, functions, partition=partition, order=order,
+                      reverse=reverse, presorted=presorted,
+                      buffersize=buffersize, tempdir=tempdir, cache=cache,
+                      missing=missing)
+
+
+Table.window = window
+
+
+def _askey(key):
+    if key is None:
+        return ()
+    if isinstance(key, (list, tuple)):
+        return tuple(key)
+    return key,
+
+
+class WindowView(Table):
+
+    def __init__(self, source, functions, partition=None, order=None,
+                 reverse=False, presorted=False, buffersize=None, tempdir=None,
+                 cache=True, missing=None):
+        # ensure rows are all the same length
+        source = stack(source, missing=missing)
+        sortkey = _askey(partition) + _askey(order)
+        if presorted or not sortkey:
+            self.source = source
+        else:
+            self.source = sort(source, key=sortkey, reverse=reverse,
+                               buffersize=buffersize, tempdir=tempdir,
+                               cache=cache)
+        if isinstance(functions, dict):
+            functions = list(functions.items())
+        elif not isinstance(functions, (list, tuple)):
+            raise ArgumentError('expected functions is list, tuple or dict, '
+                                'found %r' % functions)
+        self.functions = functions
+        self.partition = partition
+        self.order = order
+
+    def __iter__(self):
+        return iterwindow(self.source, self.functions, self.partition,
+                          self.order)
+
+
+def iterwindow(source, functions, partition, order):
+    it = iter(source)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        hdr = []
+
+    outhdr = list(hdr)
+    outhdr.extend(f for f, _ in functions)
+    yield tuple(outhdr)
+
+    # bind a fresh copy of each function, so the view can be iterated again
+    evaluators = [wf.bind(hdr) for _, wf in functions]
+    lookahead = max([wf.lookahead for wf in evaluators] + [0])
+
+    if partition is None:
+        partitions = [(None, it)]
+    else:
+        getpartition = comparable_itemgetter(*asindices(hdr, partition))
+        partitions = itertools.groupby(it, key=getpartition)
+    if order is None:
+        def getorder(row):
+            return None
+    else:
+        getorder = comparable_itemgetter(*asindices(hdr, order))
+
+    def _evaluate(row, ahead):
+        orderkey = getorder(row)
+        return tuple(row) + tuple(wf.step(row, orderkey, ahead)
+                                  for wf in evaluators)
+
+    for _, rows in partitions:
+        for wf in evaluators:
+            wf.reset()
+        # only buffer as many rows as needed to look ahead
+        ahead = deque()
+        for row in rows:
+            ahead.append(row)
+            if len(ahead) > lookahead:
+                yield _evaluate(ahead.popleft(), ahead)
+        while ahead:
+            yield _evaluate(ahead.popleft(), ahead)
+
+
+class WindowFunction(object):
+    """
+    Base class for window functions. Subclasses implement :meth:`reset`,
+    called at the start of each partition, and :meth:`step`, called once for
+    each row in order with the row, its order key and a sequence of up to
+    `lookahead` following rows in the same partition.
+
+    """
+
+    field = None
+    lookahead = 0
+
+    def bind(self, hdr):
+        bound = copy.copy(self)
+        if bound.field is not None:
+            bound.index = asindices(hdr, bound.field)[0]
+        return bound
+
+    def reset(self):
+        pass
+
+    def step(self, row, orderkey, ahead):
+        raise NotImplementedError
+
+
+class _RowNumber(WindowFunction):
+
+    def reset(self):
+        self.n = 0
+
+    def step(self, row, orderkey, ahead):
+        self.n += 1
+        return self.n
+
+
+def rownumber():
+    """Window function numbering rows within each partition, starting from
+    1. See :func:`window`."""
+
+    return _RowNumber()
+
+
+class _Rank(WindowFunction):
+
+    def __init__(self, dense):
+        self.dense = dense
+
+    def reset(self):
+        self.n = 0
+        self.rank = 0
+        self.prev = None
+
+    def step(self, row, orderkey, ahead):
+        self.n += 1
+        if self.n == 1 or orderkey != self.prev:
+            self.rank = self.rank + 1 if self.dense else self.n
+            self.prev = orderkey
+        return self.rank
+
+
+def rank():
+    """Window function ranking rows within each partition by the `order`
+    fields, with gaps after ties. See :func:`window`."""
+
+    return _Rank(dense=False)
+
+
+def denserank():
+    """Window function ranking rows within each partition by the `order`
+    fields, without gaps after ties. See :func:`window`."""
+
+    return _Rank(dense=True)
+
+
+class _Lag(WindowFunction):
+
+    def __init__(self, field, n, default):
+        if n < 1:
+            raise ArgumentError('lag offset must be at least 1')
+        self.field = field
+        self.n = n
+        self.default = default
+
+    def reset(self):
+        self.previous = deque(maxlen=self.n)
+
+    def step(self, row, orderkey, ahead):
+        if len(self.previous) == self.n:
+            v = self.previous[0]
+        else:
+            v = self.default
+        self.previous.append(row[self.index])
+        return v
+
+
+def lag(field, n=1, default=None):
+    """Window function returning the value of `field` from `n` rows before
+    the current row in the same partition, or `default`. See
+    :func:`window`."""
+
+    return _Lag(field, n, default)
+
+
+class _Lead(WindowFunction):
+
+    def __init__(self, field, n, default):
+        if n < 1:
+            raise ArgumentError('lead offset must be at least 1')
+        self.field = field
+        self.lookahead = n
+        self.default = default
+
+    def step(self, row, orderkey, ahead):
+        if len(ahead) >= self.lookahead:
+            return ahead[self.lookahead - 1][self.index]
+        return self.default
+
+
+def lead(field, n=1, default=None):
+    """Window function returning the value of `field` from `n` rows after
+    the current row in the same partition, or `default`. See
+    :func:`window`."""
+
+    return _Lead(field, n, default)
+
+
+class _CumSum(WindowFunction):
+
+    def __init__(self, field):
+        self.field = field
+
+    def reset(self):
+        self.total = 0
+
+    def step(self, row, orderkey, ahead):
+        v = row[self.index]
+        if v is not None:
+            self.total += v
+        return self.total
+
+
+def cumsum(field):
+    """Window function returning the running total of `field` within each
+    partition. `None` values are ignored. See :func:`window`."""
+
+    return _CumSum(field)
+
+
+class _CumCount(WindowFunction):
+
+    def __init__(self, field):
+        self.field = field
+
+    def reset(self):
+        self.n = 0
+
+    def step(self, row, orderkey, ahead):
+        if self.field is None or row[self.index] is not None:
+            self.n += 1
+        return self.n
+
+
+def cumcount(field=None):
+    """Window function returning the running count of rows within each
+    partition, or of non-`None` values if `field` is given. See
+    :func:`window`."""
+
+    return _CumCount(field)
+
+
+class _Moving(WindowFunction):
+
+    def __init__(self, field, size, aggregate):
+        if size < 1:
+            raise ArgumentError('window size must be at least 1')
+        self.field = field
+        self.size = size
+        self.aggregate = aggregate
+
+    def reset(self):
+        self.frame = deque(maxlen=self.size)
+
+    def step(self, row, orderkey, ahead):
+        self.frame.append(row[self.index])
+        vals = [v for v in self.frame if v is not None]
+        if not vals:
+            return None
+        return self.aggregate(vals)
+
+
+def _mean(vals):
+    return sum(vals) / float(len(vals))
+
+
+def movingsum(field, size):
+    """Window function returning the sum of `field` over a frame of the
+    current row and up to `size` - 1 preceding rows in the same partition.
+    `None` values are ignored. See :func:`window`."""
+
+    return _Moving(field, size, sum)
+
+
+def movingavg(field, size):
+    """Window function returning the mean of `field` over a frame of the
+    current row and up to `size` - 1 preceding rows in the same partition.
+    `None` values are ignored. See :func:`window`."""
+
+    return _Moving(field, size, _mean)
+
+
+def movingmin(field, size):
+    """Window function returning the minimum of `field` over a frame of the
+    current row and up to `size` - 1 preceding rows in the same partition.
+    `None` values are ignored. See :func:`window`."""
+
+    return _Moving(field, size, min)
+
+
+def movingmax(field, size):
+    """Window function returning the maximum of `field` over a frame of the
+    current row and up to `size` - 1 preceding rows in the same partition.
+    `None` values are ignored. See :func:`window`."""
+
+    return _Moving(field, size, max)
@@ -2,7 +2,8 @@ from __future__ import absolute_import, print_function, division
 
 
 from petl.util.base import Table, Record, values, header, data, \
-    fieldnames, records, dicts, namedtuples, expr, rowgroupby, empty, wrap
+    fieldnames, fieldtypes, records, dicts, namedtuples, expr, rowgroupby, \
+    empty, wrap, iterbatches
 
 from petl.util.lookups import lookup, lookupone, dictlookup, dictlookupone, \
     recordlookup, recordlookupone
@@ -16,14 +17,20 @@ from petl.util.random import randomtable, dummytable
 
 from petl.util.counting import parsecounter, parsecounts, typecounter, \
     typecounts, valuecount, valuecounter, valuecounts, stringpatterncounter, \
-    stringpatterns, rowlengths, nrows
+    stringpatterns, rowlengths, nrows, approxcountdistinct, approxdistinct, \
+    HyperLogLog, HeavyHitters
+
+from petl.util.profiling import profile
+
+from petl.util.hashing import rowdigest, rowdigester
 
 from petl.util.materialise import listoflists, listoftuples, tupleoflists, \
     tupleoftuples, columns, facetcolumns
 
 from petl.util.timing import progress, log_progress, clock
 
-from petl.util.statistics import limits, stats
+from petl.util.statistics import limits, stats, quantiles, approxquantiles, \
+    histogram, KLLSketch
 
 from petl.util.misc import typeset, diffheaders, diffvalues, nthword, strjoin, \
     coalesce
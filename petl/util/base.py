@@ -2,6 +2,7 @@ from __future__ import absolute_import, division, print_function
 
 import re
 import sys
+import copy
 from itertools import islice, chain, cycle, product,\
     permutations, combinations, takewhile, dropwhile, \
     starmap, groupby, tee
@@ -12,6 +13,7 @@ from petl.compat import imap, izip, izip_longest, ifilter, ifilterfalse, \
     reduce, next, string_types, text_type, PY3
 
 
+import petl.config as config
 from petl.errors import FieldSelectionError
 from petl.comparison import comparable_itemgetter
 
@@ -25,6 +27,11 @@ class IterContainer(object):
         return False
 
     def __len__(self):
+        if _isoneshot(self):
+            # counting rows would use up the only iteration allowed (list()
+            # asks for a length first, and tolerates TypeError)
+            raise TypeError('the length of a table which can only be '
+                            'iterated once is not known')
         return sum(1 for _ in self)
 
     def __getitem__(self, item):
@@ -335,8 +342,18 @@ def header(table):
     Note that the header row will always be returned as a tuple, regardless
     of what the underlying data are.
 
+    Where the header of a table can be derived from the header of its source
+    (e.g., for most transformations), it is obtained without iterating any
+    data rows, so getting the header of a long pipeline is cheap even if it
+    includes a sort.
+
     """
 
+    gethdr = getattr(table, '_staticheader', None)
+    if gethdr is not None:
+        hdr = gethdr()
+        if hdr is not None:
+            return tuple(hdr)
     it = iter(table)
     return tuple(next(it))
 
@@ -344,6 +361,42 @@ def header(table):
 Table.header = header
 
 
+# Views may implement an optional ``_staticheader()`` method, returning their
+# header without iterating any data rows, or None if the header cannot be
+# known without iterating the view. The helpers below cover the common cases.
+
+
+def _sourceheader(table):
+    # header of a source table, or None if the table is empty
+    try:
+        return header(table)
+    except StopIteration:
+        return None
+
+
+def _derivedheader(view, attrs=None, listattr=None):
+    # header of a view which depends only on the headers of its sources,
+    # held in the given attributes (or as a list of tables in `listattr`),
+    # obtained by running a copy of the view over the source headers alone
+    if attrs is None:
+        attrs = ('source',) if listattr is None else ()
+    view = copy.copy(view)
+    for attr in attrs:
+        hdr = _sourceheader(getattr(view, attr))
+        if hdr is None:
+            return None
+        setattr(view, attr, [hdr])
+    if listattr is not None:
+        hdrs = [_sourceheader(t) for t in getattr(view, listattr)]
+        if any(hdr is None for hdr in hdrs):
+            return None
+        setattr(view, listattr, [[hdr] for hdr in hdrs])
+    try:
+        return next(iter(view))
+    except StopIteration:
+        return None
+
+
 def fieldnames(table):
     """
     Return the string values of the header row. If the header row
@@ -364,6 +417,101 @@ def fieldnames(table):
 Table.fieldnames = fieldnames
 
 
+def fieldtypes(table):
+    """
+    Return the type of the values in each field of the given table, where
+    known without inspecting the data, otherwise None. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar'], ['a', '1'], ['b', '2']]
+        >>> etl.fieldtypes(table1)
+        (None, None)
+        >>> table2 = etl.convert(table1, 'bar', float, failonerror=True)
+        >>> etl.fieldtypes(table2)
+        (None, <class 'float'>)
+
+    A type is only reported for a field where every value is an instance of
+    that type (in particular, not None). Types are set by sources which
+    declare them, e.g., :func:`petl.io.numpy.fromarray`,
+    :func:`petl.io.pytables.fromhdf5` and :func:`petl.io.avro.fromavro`, and
+    by :func:`petl.transform.conversions.convert` where the converter is
+    itself a type and conversion errors are raised (or replaced by a value
+    of the same type). Types are carried through transformations which
+    preserve values, such as cuts, renames, selections, sorts and joins.
+
+    Types are not checked against the data. Where they are known, sorting
+    compares key values natively rather than via
+    :class:`petl.comparison.Comparable`, and :func:`petl.io.numpy.toarray`
+    builds the dtype of numeric fields without sampling rows.
+
+    """
+
+    types = _sourcetypes(table)
+    if types is None:
+        return (None,) * len(header(table))
+    return tuple(types)
+
+
+Table.fieldtypes = fieldtypes
+
+
+# Like _staticheader(), views may implement an optional ``_fieldtypes()``
+# method, returning a sequence with the type of each field (or None if not
+# known), or None if no type is known.
+
+
+def _sourcetypes(table):
+    gettypes = getattr(table, '_fieldtypes', None)
+    if gettypes is None:
+        return None
+    return gettypes()
+
+
+def _selecttypes(types, indices):
+    # types of the fields at the given indices, or None if none is known
+    if types is None:
+        return None
+    types = [types[i] if i < len(types) else None for i in indices]
+    if all(t is None for t in types):
+        return None
+    return types
+
+
+# Views which always yield every row, including the header, as a plain tuple
+# set ``_tuplerows = True`` (views passing rows through as they are may make it
+# a property depending on their source), so views consuming them need not
+# copy rows into tuples again.
+
+
+def _itertuples(table):
+    # iterate over the rows of a table as tuples, converting rows only if the
+    # table does not already guarantee tuples
+    it = iter(table)
+    if getattr(table, '_tuplerows', False):
+        return it
+    return imap(tuple, it)
+
+
+# Containers whose rows can only be iterated once (e.g., the tables given to
+# fanout() consumers) set ``_oneshot = True``. Views over them are found by
+# looking through their attributes, as for plan().
+
+
+def _isoneshot(container):
+    if getattr(container, '_oneshot', False):
+        return True
+    for value in getattr(container, '__dict__', {}).values():
+        if isinstance(value, IterContainer):
+            if _isoneshot(value):
+                return True
+        elif isinstance(value, (list, tuple)) and value \
+                and isinstance(value[0], IterContainer):
+            if any(_isoneshot(t) for t in value
+                   if isinstance(t, IterContainer)):
+                return True
+    return False
+
+
 def data(table, *sliceargs):
     """
     Return a container supporting iteration over data rows in a given table
@@ -557,36 +705,46 @@ def asnamedtuple(nt, row, missing=None):
 
 class Record(tuple):
 
-    def __new__(cls, row, flds, missing=None):
-        t = super(Record, cls).__new__(cls, row)
-        return t
+    # N.B., the fields, the index of each field and the missing value are
+    # held on a subclass shared by all records with the same header, see
+    # _recordclass(), so records carry no per-instance state
+    __slots__ = ()
+    flds = ()
+    missing = None
+    _indices = {}
 
-    def __init__(self, row, flds, missing=None):
-        self.flds = flds
-        self.missing = missing
+    def __new__(cls, row, flds=None, missing=None):
+        if cls is Record:
+            cls = _recordclass(flds, missing)
+        return tuple.__new__(cls, row)
 
     def __getitem__(self, f):
         if isinstance(f, int):
             idx = f
-        elif f in self.flds:
-            idx = self.flds.index(f)
         else:
-            raise KeyError('item ' + repr(f) +
-                                ' not in fields ' + repr(self.flds))
+            try:
+                idx = self._indices[f]
+            except (KeyError, TypeError):
+                raise KeyError('item ' + repr(f) +
+                               ' not in fields ' + repr(self.flds))
         try:
-            return super(Record, self).__getitem__(idx)
+            return tuple.__getitem__(self, idx)
         except IndexError:  # handle short rows
             return self.missing
 
     def __getattr__(self, f):
-        if f in self.flds:
-            try:
-                return super(Record, self).__getitem__(self.flds.index(f))
-            except IndexError:  # handle short rows
-                return self.missing
-        else:
+        try:
+            idx = self._indices[f]
+        except KeyError:
             raise AttributeError('item ' + repr(f) +
-                                ' not in fields ' + repr(self.flds))
+                                 ' not in fields ' + repr(self.flds))
+        try:
+            return tuple.__getitem__(self, idx)
+        except IndexError:  # handle short rows
+            return self.missing
+
+    def __reduce__(self):
+        return Record, (tuple(self), list(self.flds), self.missing)
 
     def get(self, key, default=None):
         try:
@@ -595,6 +753,39 @@ class Record(tuple):
             return default
 
 
+_recordclasses = dict()
+
+
+def _recordclass(flds, missing=None):
+    # return a subclass of Record for the given fields and missing value,
+    # cached so that all records of a table share one class, e.g., call
+    # once per header then wrap each row with ``rec = _recordclass(flds)``,
+    # ``rec(row)``
+    flds = tuple(flds)
+    try:
+        # include the types, as e.g. 0, 0.0 and False are equal as keys
+        key = (flds, tuple(map(type, flds)), type(missing), missing)
+        cls = _recordclasses.get(key)
+    except TypeError:  # unhashable missing value
+        key = cls = None
+    if cls is None:
+        indices = dict()
+        for i, f in enumerate(flds):
+            try:
+                indices.setdefault(f, i)  # first occurrence, like list.index
+            except TypeError:
+                pass  # unhashable field, only accessible by position
+        cls = type('Record', (Record,), {'__slots__': (),
+                                         'flds': list(flds),
+                                         'missing': missing,
+                                         '_indices': indices})
+        if key is not None:
+            if len(_recordclasses) >= 1000:
+                _recordclasses.clear()
+            _recordclasses[key] = cls
+    return cls
+
+
 def records(table, *sliceargs, **kwargs):
     """
     Return a container supporting iteration over rows as records, where a
@@ -655,8 +846,163 @@ def iterrecords(table, *sliceargs, **kwargs):
     flds = list(map(text_type, hdr))
     if sliceargs:
         it = islice(it, *sliceargs)
+    record = _recordclass(flds, missing)
     for row in it:
-        yield Record(row, flds, missing=missing)
+        yield record(row)
+
+
+def iterbatches(table, size=None, columns=False, missing=None):
+    """
+    Iterate over a table in batches of rows. The header row is yielded
+    first, followed by lists of at most `size` data rows. E.g.::
+
+        >>> import petl as etl
+        >>> table = [['foo', 'bar'], ['a', 1], ['b', 2], ['c', 3]]
+        >>> for batch in etl.iterbatches(table, 2):
+        ...     print(batch)
+        ...
+        ('foo', 'bar')
+        [['a', 1], ['b', 2]]
+        [['c', 3]]
+        >>> for batch in etl.iterbatches(table, 2, columns=True):
+        ...     print(batch)
+        ...
+        ('foo', 'bar')
+        [['a', 'b'], [1, 2]]
+        [['c'], [3]]
+
+    If `columns` is True, each batch is given as a list of columns, one per
+    field in the header, with values missing from short rows given by
+    `missing`. If `size` is not given, `petl.config.batchsize` is used.
+
+    The data rows hold the same values as when iterating over the table,
+    although rows may be passed through from the source table as they are
+    (e.g., as lists rather than tuples). However,
+    :func:`petl.io.csv.fromcsv` and several transformations, including
+    :func:`petl.transform.basics.cut`, :func:`petl.transform.basics.cutout`,
+    :func:`petl.transform.basics.cat`, :func:`petl.transform.basics.stack`,
+    :func:`petl.transform.basics.addfield`,
+    :func:`petl.transform.selects.select`,
+    :func:`petl.transform.conversions.convert` and the header
+    transformations, process a whole batch of rows at a time, so the cost of
+    passing rows from one transformation to the next is shared across the
+    batch. :func:`petl.io.csv.tocsv` and :func:`petl.io.db.todb` read tables
+    in batches.
+
+    """
+
+    if size is None:
+        size = config.batchsize
+    getbatches = getattr(table, '_iterbatches', None)
+    if getbatches is not None:
+        it = getbatches(size)
+    else:
+        it = _batched(iter(table), size)
+    if columns:
+        return _columnbatches(it, missing)
+    return it
+
+
+Table.iterbatches = iterbatches
+
+
+# Views may implement an optional ``_iterbatches(size)`` method, returning an
+# iterator over the header followed by lists of data rows, as for
+# iterbatches(), usually by transforming the batches of their source.
+
+
+def _batched(it, size):
+    # default batches, over an iterator of rows
+    try:
+        hdr = next(it)
+    except StopIteration:
+        return
+    yield tuple(hdr)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _columnbatches(it, missing):
+    try:
+        hdr = next(it)
+    except StopIteration:
+        return
+    yield hdr
+    n = len(hdr)
+    for batch in it:
+        cols = [list(col)
+                for col in izip_longest(*batch, fillvalue=missing)][:n]
+        cols.extend([missing] * len(batch) for _ in range(n - len(cols)))
+        yield cols
+
+
+def _headerbatches(view, size, attr='source'):
+    # batches of a view which only changes the header of its source
+    it = iterbatches(getattr(view, attr), size)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        for batch in _batched(iter(view), size):
+            yield batch
+        return
+    view = copy.copy(view)
+    setattr(view, attr, [hdr])
+    yield tuple(next(iter(view)))
+    for batch in it:
+        yield batch
+
+
+def _unbatched(batches):
+    # plain rows, from an iterator over batches
+    try:
+        yield next(batches)
+    except StopIteration:
+        return
+    for batch in batches:
+        for row in batch:
+            yield row
+
+
+def _asnumeric(np, values):
+    # values as a numeric array, or None if they are not all numbers
+    try:
+        a = np.asarray(values)
+    except ValueError:
+        return None
+    if a.ndim == 1 and a.dtype.kind in 'iuf':
+        return a
+    return None
+
+
+def _vectorcall(np, f, arg, n, kind=None):
+    # call f on whole columns, returning a list of n values, or None if f does
+    # not give back an array of the same length (and kind), or fails on any
+    # value, including floating point errors such as division by zero
+    try:
+        with np.errstate(all='raise'):
+            out = f(arg)
+    except Exception:
+        return None
+    if (isinstance(out, np.ndarray) and out.shape == (n,) and
+            (kind is None or out.dtype.kind == kind)):
+        return out.tolist()
+    return None
+
+
+def _columnrecord(np, flds, batch):
+    # a record holding whole columns of a batch of rows, with numeric columns
+    # as arrays, or None if the rows are not all as long as the header
+    n = len(flds)
+    if not all(len(row) == n for row in batch):
+        return None
+    cols = []
+    for col in zip(*batch):
+        a = _asnumeric(np, col)
+        cols.append(list(col) if a is None else a)
+    return _recordclass(flds)(cols)
 
 
 _RESTRICTED = None
@@ -683,6 +1029,12 @@ def expr(expression_text, trusted=True):
 
     Note that in further versions of petl, the default value of ``trusted`` 
     will change to ``False``.
+
+    When an expression is passed to :func:`petl.transform.selects.select` or
+    :func:`petl.transform.conversions.convert`, it is compiled again once
+    the header of the table is known, with field references resolved to
+    positions in the row (e.g., ``"rec[0] * rec[1]"``), so rows do not need
+    to be wrapped as records.
     """
 
     global _expr_impl
@@ -703,7 +1055,38 @@ def expr(expression_text, trusted=True):
         _expr_regex = re.compile(r'\{([^}]+)\}')
     strexpr = _expr_regex.sub(_expr_repl, expression_text)
 
-    return _expr_impl(strexpr)
+    fun = _expr_impl(strexpr)
+    # keep the source, so the expression can be recompiled against a header,
+    # see _rowexpr()
+    fun._exprtext = expression_text
+    fun._exprimpl = _expr_impl
+    return fun
+
+
+def _rowexpr(fun, hdr, missing=None):
+    # given a function constructed by expr(), return an equivalent function
+    # operating directly on rows of a table with the given header, with field
+    # references compiled to indices, or None if not possible
+    expression_text = getattr(fun, '_exprtext', None)
+    if expression_text is None:
+        return None
+    flds = list(map(text_type, hdr))
+    names = _expr_regex.findall(expression_text)
+    if not all(f in flds for f in names):
+        return None  # leave it to the record to raise KeyError
+
+    def _expr_repl(matchobj):
+        return 'rec[%d]' % flds.index(matchobj.group(1))
+
+    rowfun = fun._exprimpl(_expr_regex.sub(_expr_repl, expression_text))
+    n = max(flds.index(f) for f in names) + 1 if names else 0
+    record = _recordclass(flds, missing)
+
+    def _evaluate(row):
+        if len(row) >= n:
+            return rowfun(row)
+        return fun(record(row))  # short row
+    return _evaluate
 
 
 class PetlAstEval(object):
@@ -793,7 +1176,8 @@ def rowgroupby(table, key, value=None):
         hdr = []
     flds = list(map(text_type, hdr))
     # wrap rows as records
-    it = (Record(row, flds) for row in it)
+    record = _recordclass(flds)
+    it = (record(row) for row in it)
 
     # determine key function
     if callable(key):
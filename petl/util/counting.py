@@ -1,11 +1,15 @@
 from __future__ import absolute_import, print_function, division
 
 
+import hashlib
+import math
+import struct
 from collections import Counter
 from petl.compat import string_types, maketrans
 
 
 from petl.util.base import values, Table, data, wrap
+from petl.util.hashing import _serialize
 
 
 def nrows(table):
@@ -467,3 +471,280 @@ def rowlengths(table):
 
 
 Table.rowlengths = rowlengths
+
+
+def approxcountdistinct(table, field, error=0.01, missing=None):
+    """
+    Estimate the number of distinct values under the given field using a
+    HyperLogLog sketch. Memory use is bounded by the requested relative
+    `error` rather than by the number of distinct values. E.g.::
+
+        >>> import petl as etl
+        >>> table = [['foo', 'bar'],
+        ...          ['a', 1],
+        ...          ['b', 2],
+        ...          ['b', 7],
+        ...          ['c', 2]]
+        >>> etl.approxcountdistinct(table, 'foo')
+        3
+        >>> etl.approxcountdistinct(table, ('foo', 'bar'))
+        4
+
+    The `field` argument can be a single field name or index (starting from
+    zero) or a tuple of field names and/or indexes.
+
+    For small numbers of distinct values the estimate is usually exact. For
+    large numbers of distinct values the estimate is typically within
+    `error` of the true value. See also :class:`HyperLogLog` if partial
+    sketches need to be combined.
+
+    """
+
+    sketch = HyperLogLog(error=error)
+    sketch.update(values(table, field, missing=missing))
+    return sketch.count()
+
+
+Table.approxcountdistinct = approxcountdistinct
+
+
+def approxdistinct(error=0.01, sketch=False):
+    """
+    Return a function to estimate the number of distinct values in a
+    sequence using a HyperLogLog sketch. Intended for use with
+    :func:`petl.transform.reductions.aggregate`. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['campaign', 'visitor'],
+        ...           ['a', 'x'],
+        ...           ['a', 'y'],
+        ...           ['a', 'x'],
+        ...           ['b', 'z']]
+        >>> etl.aggregate(table1, 'campaign', etl.approxdistinct(), 'visitor')
+        +----------+-------+
+        | campaign | value |
+        +==========+=======+
+        | 'a'      |     2 |
+        +----------+-------+
+        | 'b'      |     1 |
+        +----------+-------+
+
+    If `sketch` is True the :class:`HyperLogLog` sketch itself is returned
+    instead of the estimate, so partial results computed over separate
+    files or processes can be merged later.
+
+    A sketch is created for each group, but is held sparsely (see
+    :class:`HyperLogLog`), so small groups cost little memory or time.
+
+    """
+
+    def _approxdistinct(vals):
+        hll = HyperLogLog(error=error)
+        hll.update(vals)
+        if sketch:
+            return hll
+        return hll.count()
+
+    return _approxdistinct
+
+
+def _hash64(v):
+    # stable across processes, interpreter runs and Python versions, unlike
+    # hash(), and equal for values which are serialized the same by rowdigest
+    # (e.g., 1 and 1.0)
+    return struct.unpack('>Q', hashlib.sha1(_serialize(v)).digest()[:8])[0]
+
+
+class HyperLogLog(object):
+    """
+    Mergeable and serializable sketch for estimating the number of distinct
+    values in a stream. E.g.::
+
+        >>> from petl.util.counting import HyperLogLog
+        >>> h1 = HyperLogLog()
+        >>> h1.update(['a', 'b', 'c'])
+        >>> h2 = HyperLogLog.frombytes(HyperLogLog().tobytes())
+        >>> h2.update(['c', 'd'])
+        >>> h1.merge(h2).count()
+        4
+
+    The `error` argument is the target relative standard error, which
+    determines the number of registers used (``p`` bits of precision, between
+    4 and 18). Sketches can only be merged if they have the same precision.
+
+    While few distinct values have been seen, only the registers which are
+    set are held, so a sketch for a small group of values is small and quick
+    to count. Once more than 1/64 of the registers are set, all ``2 ** p``
+    registers are held in a byte array (16 KB for the default `error`).
+
+    Values are hashed via the serialization used by
+    :func:`petl.util.hashing.rowdigest`, so e.g. `1` and `1.0` are counted as
+    the same value.
+
+    """
+
+    def __init__(self, error=0.01, p=None):
+        if p is None:
+            p = int(math.ceil(math.log((1.04 / error) ** 2, 2)))
+            p = min(max(p, 4), 18)
+        self.p = p
+        self.m = 1 << p
+        # non-zero registers by index, until the dense registers are smaller
+        self._sparse = dict()
+        self._dense = None
+
+    def add(self, value):
+        x = _hash64(value)
+        idx = x >> (64 - self.p)
+        w = x & ((1 << (64 - self.p)) - 1)
+        rho = (64 - self.p) - w.bit_length() + 1
+        self._set(idx, rho)
+
+    def _set(self, idx, rho):
+        if self._dense is not None:
+            if rho > self._dense[idx]:
+                self._dense[idx] = rho
+        elif rho > self._sparse.get(idx, 0):
+            self._sparse[idx] = rho
+            if len(self._sparse) > self.m // 64:
+                self._dense = self._registers()
+                self._sparse = None
+
+    def _registers(self):
+        if self._dense is not None:
+            return bytearray(self._dense)
+        regs = bytearray(self.m)
+        for idx, rho in self._sparse.items():
+            regs[idx] = rho
+        return regs
+
+    def update(self, values):
+        for v in values:
+            self.add(v)
+
+    def merge(self, other):
+        """Merge `other` into this sketch in place and return this sketch."""
+        if other.p != self.p:
+            raise ValueError('cannot merge sketches with different precision: '
+                             '%s, %s' % (self.p, other.p))
+        if other._dense is None:
+            for idx, rho in other._sparse.items():
+                self._set(idx, rho)
+            return self
+        if self._dense is None:
+            self._dense = self._registers()
+            self._sparse = None
+        regs = self._dense
+        for i, r in enumerate(other._dense):
+            if r > regs[i]:
+                regs[i] = r
+        return self
+
+    def __ior__(self, other):
+        return self.merge(other)
+
+    def count(self):
+        m = self.m
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        elif m == 64:
+            alpha = 0.709
+        elif m == 32:
+            alpha = 0.697
+        else:
+            alpha = 0.673
+        if self._dense is not None:
+            regs = self._dense
+            zeros = regs.count(0)
+            total = sum(2.0 ** -r for r in regs)
+        else:
+            zeros = m - len(self._sparse)
+            total = zeros + sum(2.0 ** -r for r in self._sparse.values())
+        estimate = alpha * m * m / total
+        if estimate <= 2.5 * m and zeros:
+            # small range correction, use linear counting
+            estimate = m * math.log(float(m) / zeros)
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
+
+    def tobytes(self):
+        """Serialize the sketch as a byte string."""
+        return struct.pack('>B', self.p) + bytes(self._registers())
+
+    @classmethod
+    def frombytes(cls, b):
+        """Restore a sketch serialized via :meth:`tobytes`."""
+        b = bytearray(b)
+        hll = cls(p=b[0])
+        if len(b) != hll.m + 1:
+            raise ValueError('invalid HyperLogLog serialization')
+        for idx, rho in enumerate(b[1:]):
+            if rho:
+                hll._set(idx, rho)
+        return hll
+
+    def __repr__(self):
+        return 'HyperLogLog(p=%s, count=%s)' % (self.p, self.count())
+
+
+class HeavyHitters(object):
+    """
+    Mergeable sketch for finding the most frequent values in a stream, using
+    the Misra-Gries algorithm. At most `capacity` counters are kept. E.g.::
+
+        >>> from petl.util.counting import HeavyHitters
+        >>> hh = HeavyHitters(capacity=10)
+        >>> hh.update('abracadabra')
+        >>> hh.most_common(2)
+        [('a', 5), ('b', 2)]
+
+    Counts are exact while no more than `capacity` distinct values have been
+    seen, otherwise they are lower bounds, underestimating true counts by at
+    most ``n / (capacity + 1)`` for a stream of `n` values.
+
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counters = dict()
+        self.n = 0
+
+    def add(self, value):
+        self.n += 1
+        counters = self.counters
+        if value in counters:
+            counters[value] += 1
+        elif len(counters) < self.capacity:
+            counters[value] = 1
+        else:
+            # decrement all counters, dropping any that reach zero
+            for k in list(counters):
+                if counters[k] == 1:
+                    del counters[k]
+                else:
+                    counters[k] -= 1
+
+    def update(self, values):
+        for v in values:
+            self.add(v)
+
+    def merge(self, other):
+        """Merge `other` into this sketch in place and return this sketch."""
+        counters = Counter(self.counters)
+        counters.update(other.counters)
+        self.n += other.n
+        if len(counters) > self.capacity:
+            # subtract the (capacity + 1)th largest count
+            offset = sorted(counters.values(), reverse=True)[self.capacity]
+            counters = dict((k, c - offset) for k, c in counters.items()
+                            if c > offset)
+        self.counters = dict(counters)
+        return self
+
+    def most_common(self, n=None):
+        return Counter(self.counters).most_common(n)
+
+    def __len__(self):
+        return self.n
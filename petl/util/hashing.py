@@ -0,0 +1,181 @@
+from __future__ import absolute_import, print_function, division
+
+
+import hashlib
+import struct
+from fractions import Fraction
+from datetime import datetime, date, time
+from petl.compat import text_type, binary_type, integer_types
+
+
+from petl.util.base import asindices
+
+
+def rowdigest(row, algorithm='blake2b'):
+    """
+    Return a digest of the values in `row` (any sequence of values), as a
+    :class:`bytes` object. E.g.::
+
+        >>> import petl as etl
+        >>> from decimal import Decimal
+        >>> d = etl.rowdigest(('a', 1, None))
+        >>> len(d)
+        16
+        >>> d == etl.rowdigest(['a', 1.0, None])
+        True
+        >>> d == etl.rowdigest(('a', Decimal('1'), None))
+        True
+        >>> d == etl.rowdigest(('a', '1', None))
+        False
+
+    Values are serialized in a canonical, type-tagged binary form before
+    hashing, so digests do not depend on the Python version or on `repr`,
+    and values which compare equal under the relaxed comparison used for
+    sorting (see :class:`petl.comparison.Comparable`) have the same
+    serialization: numbers of different types with the same value (e.g.,
+    `1`, `1.0`, `True` and `Decimal('1')`) are serialized the same, as are
+    lists and tuples with the same items. `None`, numbers, byte strings, text
+    strings, sequences, dates and times are each tagged with a different
+    type, and any other value is serialized via its type name and `repr`.
+
+    The `algorithm` may be any algorithm supported by :mod:`hashlib`. For
+    'blake2b' and 'blake2s', 128-bit digests are computed. Where blake2 is
+    not available (before Python 3.6), these fall back to the first 128 bits
+    of a 'sha1' digest, so digests are only comparable between Pythons which
+    both have (or both lack) blake2.
+
+    """
+
+    h = _hasher(algorithm)
+    h.update(_serialize(row))
+    return h.digest()
+
+
+def rowdigester(fields=None, algorithm='blake2b'):
+    """
+    Return a function which computes a digest (see :func:`rowdigest`) of the
+    values in a row, for use as a compact replacement for full-row keys.
+    E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar', 'baz'],
+        ...           ['a', 1, True],
+        ...           ['b', 2, False],
+        ...           ['a', 1.0, False]]
+        >>> table2 = etl.aggregate(table1, etl.rowdigester(['foo', 'bar']),
+        ...                        len, strategy='hash')
+        >>> list(table2.values('value'))
+        [2, 1]
+
+    If `fields` is given, the function must be called with records (as for
+    functions passed to :func:`petl.transform.basics.addfield` or used as
+    keys), and only the values of the given fields are digested.
+
+    """
+
+    if fields is None:
+        return lambda row: rowdigest(row, algorithm=algorithm)
+    if not isinstance(fields, (list, tuple)):
+        fields = fields,
+
+    def _digest(rec):
+        return rowdigest([rec[f] for f in fields], algorithm=algorithm)
+    return _digest
+
+
+_algorithms = getattr(hashlib, 'algorithms_available', ())
+
+
+def _hasher(algorithm):
+    if algorithm in ('blake2b', 'blake2s'):
+        if algorithm in _algorithms:
+            return hashlib.new(algorithm, digest_size=16)
+        # blake2 is not available before Python 3.6
+        return _TruncatedHasher(hashlib.sha1(), 16)
+    return hashlib.new(algorithm)
+
+
+class _TruncatedHasher(object):
+
+    def __init__(self, hasher, size):
+        self.hasher = hasher
+        self.size = size
+
+    def update(self, data):
+        self.hasher.update(data)
+
+    def digest(self):
+        return self.hasher.digest()[:self.size]
+
+
+def _digestgetter(hdr, fields, algorithm='blake2b'):
+    # return a function digesting the values of the given fields of a row,
+    # tolerating short rows
+    if fields is None:
+        return lambda row: rowdigest(row, algorithm=algorithm)
+    indices = asindices(hdr, fields)
+
+    def _digest(row):
+        return rowdigest([row[i] if i < len(row) else None for i in indices],
+                         algorithm=algorithm)
+    return _digest
+
+
+_pack = struct.Struct('>Q').pack
+
+
+def _serialize(v):
+    out = []
+    _write(v, out.append)
+    return b''.join(out)
+
+
+def _write(v, write):
+    if v is None:
+        write(b'N')
+    elif isinstance(v, (bool,) + integer_types):
+        _writetext(b'I', text_type(int(v)), write)
+    elif isinstance(v, float):
+        if v.is_integer():
+            _writetext(b'I', text_type(int(v)), write)
+        elif v != v or v in (float('inf'), float('-inf')):
+            _writetext(b'F', text_type(repr(v)), write)
+        else:
+            n, d = v.as_integer_ratio()
+            _writetext(b'Q', u'%s/%s' % (n, d), write)
+    elif isinstance(v, binary_type):
+        write(b'B')
+        write(_pack(len(v)))
+        write(v)
+    elif isinstance(v, text_type):
+        _writetext(b'S', v, write)
+    elif isinstance(v, (list, tuple)):
+        write(b'T')
+        write(_pack(len(v)))
+        for x in v:
+            _write(x, write)
+    elif isinstance(v, datetime):
+        _writetext(b'D', v.isoformat(), write)
+    elif isinstance(v, date):
+        _writetext(b'd', v.isoformat(), write)
+    elif isinstance(v, time):
+        _writetext(b't', v.isoformat(), write)
+    else:
+        try:
+            # e.g., Decimal, Fraction
+            f = Fraction(v)
+        except (TypeError, ValueError, OverflowError):
+            _writetext(b'O', u'%s:%r' % (type(v).__name__, v), write)
+        else:
+            if f.denominator == 1:
+                _writetext(b'I', text_type(f.numerator), write)
+            else:
+                _writetext(b'Q', u'%s/%s' % (f.numerator, f.denominator),
+                           write)
+
+
+def _writetext(tag, s, write):
+    b = s.encode('utf-8')
+    write(tag)
+    write(_pack(len(b)))
+    write(b)
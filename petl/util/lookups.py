@@ -6,7 +6,8 @@ from petl.compat import text_type
 
 
 from petl.errors import DuplicateKeyError
-from petl.util.base import Table, asindices, asdict, Record, rowgetter
+from petl.util.base import Table, asindices, asdict, rowgetter, \
+    _recordclass
 
 
 def _setup_lookup(table, key, value):
@@ -348,9 +349,10 @@ def recordlookup(table, key, dictionary=None):
     keyindices = asindices(hdr, key)
     assert len(keyindices) > 0, 'no key selected'
     getkey = operator.itemgetter(*keyindices)
+    record = _recordclass(flds)
     for row in it:
         k = getkey(row)
-        rec = Record(row, flds)
+        rec = record(row)
         if k in dictionary:
             # work properly with shelve
             l = dictionary[k]
@@ -383,12 +385,13 @@ def recordlookupone(table, key, dictionary=None, strict=False):
     keyindices = asindices(hdr, key)
     assert len(keyindices) > 0, 'no key selected'
     getkey = operator.itemgetter(*keyindices)
+    record = _recordclass(flds)
     for row in it:
         k = getkey(row)
         if strict and k in dictionary:
             raise DuplicateKeyError(k)
         elif k not in dictionary:
-            d = Record(row, flds)
+            d = record(row)
             dictionary[k] = d
     return dictionary
 
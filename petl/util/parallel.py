@@ -0,0 +1,109 @@
+from __future__ import absolute_import, print_function, division
+
+
+import copy
+import multiprocessing
+from collections import deque
+from itertools import islice
+from petl.compat import next, queue, PY2
+
+
+import petl.config as config
+from petl.util.base import iterbatches
+
+
+# Views supporting a pool of worker processes hold `workers`, `chunksize` and
+# `ordered` attributes. When `workers` is set, the view is iterated via
+# _iterparallel(), which sends chunks of source rows to the workers, each of
+# which runs a copy of the view (without workers) over the header and a chunk.
+
+
+def _iterparallel(view, attr='source'):
+    size = view.chunksize or config.batchsize
+    it = iterbatches(getattr(view, attr), size)
+    try:
+        hdr = next(it)
+    except StopIteration:
+        hdr = None
+    task = copy.copy(view)
+    task.workers = None
+    if hdr is None:
+        # nothing to send to the workers
+        for row in task:
+            yield row
+        return
+    setattr(task, attr, [hdr])
+    yield tuple(next(iter(task)))
+
+    # the task view is given to each worker once, when the pool starts
+    setattr(task, attr, None)
+    pool = multiprocessing.Pool(view.workers, _initworker, (task, hdr, attr))
+    try:
+        if view.ordered:
+            chunks = _iterordered(pool, it, view.workers * 2)
+        else:
+            chunks = _iterunordered(pool, it, view.workers * 2)
+        for rows in chunks:
+            for row in rows:
+                yield row
+        pool.close()
+    finally:
+        # also stops the workers if iteration is abandoned, or on error
+        pool.terminate()
+        pool.join()
+
+
+def _iterordered(pool, it, window):
+    # keep at most `window` chunks in flight, yielding results in order
+    pending = deque()
+    for batch in it:
+        pending.append(pool.apply_async(_runworker, (batch,)))
+        if len(pending) >= window:
+            yield _result(pending.popleft().get())
+    while pending:
+        yield _result(pending.popleft().get())
+
+
+def _iterunordered(pool, it, window):
+    # keep at most `window` chunks in flight, yielding results as they come
+    done = queue.Queue()
+    kwargs = dict(callback=done.put)
+    if not PY2:
+        # e.g., if results cannot be pickled
+        kwargs['error_callback'] = lambda e: done.put((None, e))
+    inflight = 0
+    for batch in it:
+        pool.apply_async(_runworker, (batch,), **kwargs)
+        inflight += 1
+        if inflight >= window:
+            yield _result(done.get())
+            inflight -= 1
+    while inflight:
+        yield _result(done.get())
+        inflight -= 1
+
+
+def _result(result):
+    rows, error = result
+    if error is not None:
+        raise error
+    return rows
+
+
+_task = None
+
+
+def _initworker(view, hdr, attr):
+    global _task
+    _task = view, hdr, attr
+
+
+def _runworker(batch):
+    view, hdr, attr = _task
+    view = copy.copy(view)
+    setattr(view, attr, [hdr] + list(batch))
+    try:
+        return list(islice(view, 1, None)), None
+    except Exception as e:
+        # errors are passed back, to be raised by the consumer
+        return None, e
@@ -0,0 +1,304 @@
+from __future__ import absolute_import, print_function, division
+
+
+import random
+from collections import Counter, OrderedDict
+from itertools import islice
+from petl.compat import text_type
+
+
+from petl.comparison import Comparable
+from petl.util.base import Table, asindices
+from petl.util.counting import HyperLogLog, HeavyHitters
+from petl.util.statistics import _stats
+
+
+# as used by stringpatterncounter, but as a mapping of ordinals, which
+# unicode.translate requires on Python 2
+_patterntrans = dict(zip(
+    map(ord, 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'),
+    map(ord, 'AAAAAAAAAAAAAAAAAAAAAAAAAAaaaaaaaaaaaaaaaaaaaaaaaaaa9999999999')
+))
+
+
+def profile(table, fields=None, topn=20, error=0.01, sample=None, seed=None,
+            processes=None, chunksize=10000, missing=None):
+    """
+    Profile the values in each field of the table in a single pass. E.g.::
+
+        >>> import petl as etl
+        >>> table = [['foo', 'bar'],
+        ...          ['A', 1],
+        ...          ['B', '2'],
+        ...          ['B', None],
+        ...          ['C', 4.5]]
+        >>> p = etl.profile(table, topn=2)
+        >>> p.cut('field', 'count', 'nulls', 'distinct', 'min', 'max', 'mean')
+        +-------+-------+-------+----------+-----+-----+------+
+        | field | count | nulls | distinct | min | max | mean |
+        +=======+=======+=======+==========+=====+=====+======+
+        | 'foo' |     4 |     0 |        3 | 'A' | 'C' | None |
+        +-------+-------+-------+----------+-----+-----+------+
+        | 'bar' |     4 |     1 |        3 |   1 | '2' |  2.5 |
+        +-------+-------+-------+----------+-----+-----+------+
+
+        >>> p.values('top')[0]
+        [('B', 2), ('A', 1)]
+        >>> p.profiles['bar'].stats()
+        stats(count=3, errors=0, sum=7.5, min=1.0, max=4.5, mean=2.5, pvariance=2.1666666666666665, pstdev=1.4719601443879744)
+
+    The result is a table with one row per profiled field, and fields
+    'field', 'count', 'nulls', 'distinct', 'types', 'min', 'max', 'mean',
+    'pstdev', 'top' and 'patterns'. Each field is profiled with:
+
+    * counts of values by Python type and of `None` values;
+    * minimum and maximum values, compared as for
+      :func:`petl.transform.sorts.sort`;
+    * numeric statistics as for :func:`petl.util.statistics.stats`;
+    * an estimate of the number of distinct non-`None` values, via a
+      :class:`petl.util.counting.HyperLogLog` sketch with relative `error`;
+    * the `topn` most frequent values and string patterns (as for
+      :func:`petl.util.counting.stringpatterns`), via a
+      :class:`petl.util.counting.HeavyHitters` sketch.
+
+    Memory use is bounded regardless of the number of rows. If `sample` is
+    given, only that fraction of rows (chosen at random, using `seed`) is
+    profiled.
+
+    If `processes` is greater than 1, rows are sent in chunks of `chunksize`
+    to a pool of worker processes, each building a partial profile, and the
+    partial profiles are merged at the end. Profiles can also be computed
+    separately (e.g., for several files with the same fields) and combined
+    via :meth:`TableProfile.merge`.
+
+    """
+
+    return TableProfile(table, fields=fields, topn=topn, error=error,
+                        sample=sample, seed=seed, processes=processes,
+                        chunksize=chunksize, missing=missing)
+
+
+Table.profile = profile
+
+
+class ColumnProfile(object):
+    """Mergeable profile of the values in a single field. See
+    :func:`profile`."""
+
+    def __init__(self, topn=20, error=0.01):
+        self.topn = topn
+        self.count = 0
+        self.nulls = 0
+        self.types = Counter()
+        self.min = None
+        self.max = None
+        # numeric statistics, merged via Chan et al.'s parallel algorithm
+        self.ncount = 0
+        self.nerrors = 0
+        self.nsum = 0
+        self.nmin = None
+        self.nmax = None
+        self.nmean = 0.
+        self.nm2 = 0.
+        self.distinct = HyperLogLog(error=error)
+        capacity = max(topn * 10, 100)
+        self.top = HeavyHitters(capacity=capacity)
+        self.patterns = HeavyHitters(capacity=capacity)
+
+    def add(self, v):
+        self.count += 1
+        self.types[v.__class__.__name__] += 1
+        try:
+            self.top.add(v)
+        except TypeError:
+            self.top.add(repr(v))  # unhashable
+        if v is None:
+            self.nulls += 1
+            return
+        self.distinct.add(v)
+        self.patterns.add(text_type(v).translate(_patterntrans))
+        c = Comparable(v)
+        if self.min is None or c < self.min:
+            self.min = c
+        if self.max is None or c > self.max:
+            self.max = c
+        try:
+            x = float(v)
+        except (ValueError, TypeError):
+            self.nerrors += 1
+        else:
+            self.ncount += 1
+            self.nsum += x
+            if self.nmin is None or x < self.nmin:
+                self.nmin = x
+            if self.nmax is None or x > self.nmax:
+                self.nmax = x
+            delta = x - self.nmean
+            self.nmean += delta / self.ncount
+            self.nm2 += delta * (x - self.nmean)
+
+    def merge(self, other):
+        """Merge `other` into this profile in place and return this
+        profile."""
+        self.count += other.count
+        self.nulls += other.nulls
+        self.types.update(other.types)
+        for c in other.min, other.max:
+            if c is None:
+                continue
+            if self.min is None or c < self.min:
+                self.min = c
+            if self.max is None or c > self.max:
+                self.max = c
+        n = self.ncount + other.ncount
+        if n:
+            delta = other.nmean - self.nmean
+            self.nmean += delta * other.ncount / n
+            self.nm2 += other.nm2 + \
+                delta * delta * self.ncount * other.ncount / n
+        self.ncount = n
+        self.nerrors += other.nerrors
+        self.nsum += other.nsum
+        for x in other.nmin, other.nmax:
+            if x is None:
+                continue
+            if self.nmin is None or x < self.nmin:
+                self.nmin = x
+            if self.nmax is None or x > self.nmax:
+                self.nmax = x
+        self.distinct.merge(other.distinct)
+        self.top.merge(other.top)
+        self.patterns.merge(other.patterns)
+        return self
+
+    def stats(self):
+        """Return numeric statistics as for
+        :func:`petl.util.statistics.stats`."""
+        if self.ncount:
+            var = self.nm2 / self.ncount
+            mean = self.nmean
+        else:
+            var = mean = 0
+        return _stats(self.ncount, self.nerrors, self.nsum, self.nmin,
+                      self.nmax, mean, var, var**.5)
+
+    def row(self, field):
+        if self.ncount:
+            stats = self.stats()
+            mean, pstdev = stats.mean, stats.pstdev
+        else:
+            mean = pstdev = None
+        return (field, self.count, self.nulls, self.distinct.count(),
+                self.types.most_common(),
+                None if self.min is None else self.min.inner,
+                None if self.max is None else self.max.inner,
+                mean, pstdev,
+                self.top.most_common(self.topn),
+                self.patterns.most_common(self.topn))
+
+
+def _profilerows(flds, indices, rows, topn, error, missing):
+    profiles = [ColumnProfile(topn=topn, error=error) for _ in flds]
+    pairs = list(zip(indices, profiles))
+    for row in rows:
+        for i, p in pairs:
+            try:
+                v = row[i]
+            except IndexError:
+                v = missing
+            p.add(v)
+    return profiles
+
+
+def _profilechunk(args):
+    # runs in a worker process
+    return _profilerows(*args)
+
+
+def _chunks(it, chunksize):
+    while True:
+        chunk = list(islice(it, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+class TableProfile(Table):
+    """Table of per-field profiles, computed on first use. See
+    :func:`profile`."""
+
+    def __init__(self, source, fields=None, topn=20, error=0.01, sample=None,
+                 seed=None, processes=None, chunksize=10000, missing=None):
+        self.source = source
+        self.fields = fields
+        self.topn = topn
+        self.error = error
+        self.sample = sample
+        self.seed = seed
+        self.processes = processes
+        self.chunksize = chunksize
+        self.missing = missing
+        self._profiles = None
+
+    @property
+    def profiles(self):
+        """An ordered dictionary mapping field names to
+        :class:`ColumnProfile` objects."""
+        if self._profiles is None:
+            self._profiles = self._compute()
+        return self._profiles
+
+    def _compute(self):
+        it = iter(self.source)
+        try:
+            hdr = next(it)
+        except StopIteration:
+            hdr = []
+        if self.fields is None:
+            indices = list(range(len(hdr)))
+        else:
+            indices = asindices(hdr, self.fields)
+        flds = [text_type(hdr[i]) for i in indices]
+
+        if self.sample is not None:
+            rnd = random.Random(self.seed)
+            fraction = self.sample
+            it = (row for row in it if rnd.random() < fraction)
+
+        if self.processes is not None and self.processes > 1:
+            import multiprocessing
+            profiles = [ColumnProfile(topn=self.topn, error=self.error)
+                        for _ in flds]
+            tasks = ((flds, indices, chunk, self.topn, self.error,
+                      self.missing)
+                     for chunk in _chunks(it, self.chunksize))
+            pool = multiprocessing.Pool(self.processes)
+            try:
+                for partial in pool.imap_unordered(_profilechunk, tasks):
+                    for p, q in zip(profiles, partial):
+                        p.merge(q)
+            finally:
+                pool.terminate()
+                pool.join()
+        else:
+            profiles = _profilerows(flds, indices, it, self.topn,
+                                    self.error, self.missing)
+        return OrderedDict(zip(flds, profiles))
+
+    def merge(self, other):
+        """Merge the profiles of `other` into this profile, e.g., to combine
+        profiles of several tables with the same fields. Returns this
+        profile."""
+        profiles = self.profiles
+        for f, p in other.profiles.items():
+            if f in profiles:
+                profiles[f].merge(p)
+            else:
+                profiles[f] = p
+        return self
+
+    def __iter__(self):
+        yield ('field', 'count', 'nulls', 'distinct', 'types', 'min', 'max',
+               'mean', 'pstdev', 'top', 'patterns')
+        for f, p in self.profiles.items():
+            yield p.row(f)
@@ -1,9 +1,14 @@
 from __future__ import absolute_import, print_function, division
 
 
+import bisect
+import math
+import random
 from collections import namedtuple
 
 
+from petl.compat import xrange
+from petl.errors import ArgumentError
 from petl.util.base import values, Table
 
 
@@ -96,3 +101,313 @@ def onlinestats(xi, n, mean=0, variance=0):
     mean = (((n - 1)*meanprv) + xi)/n
     variance = (((n - 1)*varianceprv) + ((xi - meanprv)*(xi - mean)))/n
     return mean, variance
+
+
+class KLLSketch(object):
+    """
+    Mergeable sketch for approximate quantiles over a stream of values, using
+    the KLL algorithm (Karnin, Lang and Liberty). Memory is bounded by the
+    accuracy parameter `k` rather than by the number of values. E.g.::
+
+        >>> from petl.util.statistics import KLLSketch
+        >>> s1 = KLLSketch()
+        >>> s1.update(range(0, 50))
+        >>> s2 = KLLSketch()
+        >>> s2.update(range(50, 101))
+        >>> s1.merge(s2).quantile(.5)
+        50
+
+    Larger values of `k` give more accurate results at the cost of memory.
+    While fewer than roughly `k` values have been added the results are
+    exact. Sketches can be pickled to combine partial results computed in
+    separate processes.
+
+    """
+
+    def __init__(self, k=200, seed=42):
+        self.k = k
+        self.n = 0
+        self.compactors = [[]]
+        self._random = random.Random(seed)
+        self._maxsize = self._capacity(0)
+
+    def _capacity(self, h):
+        depth = len(self.compactors) - h - 1
+        return int(math.ceil(self.k * (2. / 3) ** depth)) + 1
+
+    def _grow(self):
+        self.compactors.append([])
+        self._maxsize = sum(self._capacity(h)
+                            for h in range(len(self.compactors)))
+
+    def _size(self):
+        return sum(len(c) for c in self.compactors)
+
+    def _compress(self):
+        while self._size() >= self._maxsize:
+            for h, compactor in enumerate(self.compactors):
+                if len(compactor) >= self._capacity(h):
+                    if h + 1 >= len(self.compactors):
+                        self._grow()
+                    compactor.sort()
+                    # keep the odd item out at this level
+                    last = compactor.pop() if len(compactor) % 2 else None
+                    offset = self._random.randint(0, 1)
+                    self.compactors[h + 1].extend(compactor[offset::2])
+                    del compactor[:]
+                    if last is not None:
+                        compactor.append(last)
+                    break
+
+    def add(self, value):
+        self.compactors[0].append(value)
+        self.n += 1
+        if len(self.compactors[0]) >= self._maxsize:
+            self._compress()
+
+    def update(self, values):
+        for v in values:
+            self.add(v)
+
+    def merge(self, other):
+        """Merge `other` into this sketch in place and return this sketch."""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for h, compactor in enumerate(other.compactors):
+            self.compactors[h].extend(compactor)
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _weighted(self):
+        items = [(v, 2 ** h) for h, compactor in enumerate(self.compactors)
+                 for v in compactor]
+        items.sort(key=lambda item: item[0])
+        return items
+
+    def quantile(self, q):
+        """Return the approximate value at quantile `q` (between 0 and 1)."""
+        return self.quantiles((q,))[0]
+
+    def quantiles(self, qs):
+        """Return a tuple of approximate values at each of the quantiles
+        `qs`."""
+        items = self._weighted()
+        if not items:
+            return tuple(None for _ in qs)
+        cumulative = []
+        total = 0
+        for _, w in items:
+            total += w
+            cumulative.append(total)
+        out = []
+        for q in qs:
+            if not 0 <= q <= 1:
+                raise ArgumentError('quantile must be between 0 and 1, '
+                                    'found %r' % q)
+            i = bisect.bisect_left(cumulative, q * total)
+            out.append(items[min(i, len(items) - 1)][0])
+        return tuple(out)
+
+    def rank(self, value):
+        """Return the approximate number of values less than `value`."""
+        return sum(w for v, w in self._weighted() if v < value)
+
+    def __len__(self):
+        return self.n
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_random'] = self._random.getstate()
+        return state
+
+    def __setstate__(self, state):
+        rnd = random.Random()
+        rnd.setstate(state['_random'])
+        self.__dict__.update(state)
+        self._random = rnd
+
+
+def _numericvalues(table, field):
+    # as for stats(), ignore anything that cannot be converted to float
+    for v in values(table, field):
+        try:
+            yield float(v)
+        except (ValueError, TypeError):
+            pass
+
+
+def quantiles(table, field, qs=(.5, .9, .99), k=200):
+    """
+    Estimate quantiles of the values under the given field in a single pass
+    with bounded memory. Returns a tuple with one value per quantile in
+    `qs`. E.g.::
+
+        >>> import petl as etl
+        >>> table = [['foo', 'bar'],
+        ...          ['a', 1],
+        ...          ['b', '2'],
+        ...          ['c', 3],
+        ...          ['d', 'xyz'],
+        ...          ['e', 10]]
+        >>> etl.quantiles(table, 'bar', qs=(.25, .5, 1))
+        (1.0, 2.0, 10.0)
+
+    As for :func:`petl.util.statistics.stats`, values that cannot be
+    converted to `float` are ignored. The accuracy of the estimates is
+    controlled by `k`, see :class:`KLLSketch`.
+
+    """
+
+    sketch = KLLSketch(k=k)
+    sketch.update(_numericvalues(table, field))
+    return sketch.quantiles(qs)
+
+
+Table.quantiles = quantiles
+
+
+def approxquantiles(qs=.5, k=200, sketch=False):
+    """
+    Return a function to estimate quantiles of a sequence of values.
+    Intended for use with :func:`petl.transform.reductions.aggregate` to
+    compute per-group percentiles. E.g.::
+
+        >>> import petl as etl
+        >>> table1 = [['foo', 'bar'],
+        ...           ['a', 3],
+        ...           ['a', 7],
+        ...           ['a', 1],
+        ...           ['b', 2]]
+        >>> etl.aggregate(table1, 'foo', etl.approxquantiles(.5), 'bar')
+        +-----+-------+
+        | foo | value |
+        +=====+=======+
+        | 'a' |     3 |
+        +-----+-------+
+        | 'b' |     2 |
+        +-----+-------+
+
+    If `qs` is a sequence, a tuple of values is returned. If `sketch` is True
+    the :class:`KLLSketch` itself is returned, so partial results can be
+    merged later.
+
+    """
+
+    def _approxquantiles(vals):
+        s = KLLSketch(k=k)
+        s.update(vals)
+        if sketch:
+            return s
+        if isinstance(qs, (list, tuple)):
+            return s.quantiles(qs)
+        return s.quantile(qs)
+
+    return _approxquantiles
+
+
+def histogram(table, field, bins=10, range=None, k=200):
+    """
+    Count values under the given field falling into each of a set of bins, in
+    a single pass. Returns a table with one row per bin. E.g.::
+
+        >>> import petl as etl
+        >>> table = [['foo', 'bar'],
+        ...          ['a', 1],
+        ...          ['b', 2.5],
+        ...          ['c', 4],
+        ...          ['d', 'xyz'],
+        ...          ['e', 7]]
+        >>> etl.histogram(table, 'bar', bins=[0, 2, 4, 8])
+        +-------+-------+-------+
+        | lower | upper | count |
+        +=======+=======+=======+
+        |     0 |     2 |     1 |
+        +-------+-------+-------+
+        |     2 |     4 |     1 |
+        +-------+-------+-------+
+        |     4 |     8 |     2 |
+        +-------+-------+-------+
+
+        >>> etl.histogram(table, 'bar', bins=3, range=(0, 9))
+        +-------+-------+-------+
+        | lower | upper | count |
+        +=======+=======+=======+
+        |   0.0 |   3.0 |     2 |
+        +-------+-------+-------+
+        |   3.0 |   6.0 |     1 |
+        +-------+-------+-------+
+        |   6.0 |   9.0 |     1 |
+        +-------+-------+-------+
+
+    If `bins` is a sequence it gives the bin edges. If `bins` is an int it
+    gives the number of equal-width bins over `range`. Bins are half-open,
+    except for the last bin which also includes its upper edge. Values outside
+    the bins, or that cannot be converted to `float`, are ignored.
+
+    If `bins` is an int and no `range` is given, the range of the data is
+    not known until the end of the pass, so counts are estimated from a
+    :class:`KLLSketch` with accuracy parameter `k`.
+
+    """
+
+    return HistogramView(table, field, bins=bins, range=range, k=k)
+
+
+Table.histogram = histogram
+
+
+class HistogramView(Table):
+
+    def __init__(self, source, field, bins=10, range=None, k=200):
+        self.source = source
+        self.field = field
+        if isinstance(bins, int) and range is not None:
+            lo, hi = float(range[0]), float(range[1])
+            width = (hi - lo) / bins
+            bins = [lo + i * width for i in xrange(bins)] + [hi]
+        elif not isinstance(bins, int) and len(bins) < 2:
+            raise ArgumentError('at least two bin edges are required')
+        self.bins = bins
+        self.k = k
+
+    def __iter__(self):
+        yield ('lower', 'upper', 'count')
+        if isinstance(self.bins, int):
+            edges, counts = _sketchhistogram(self.source, self.field,
+                                             self.bins, self.k)
+        else:
+            edges = list(self.bins)
+            counts = [0] * (len(edges) - 1)
+            last = len(counts) - 1
+            lo, hi = edges[0], edges[-1]
+            for v in _numericvalues(self.source, self.field):
+                if lo <= v <= hi:
+                    i = min(bisect.bisect_right(edges, v) - 1, last)
+                    counts[i] += 1
+        for i, n in enumerate(counts):
+            yield (edges[i], edges[i + 1], n)
+
+
+def _sketchhistogram(table, field, nbins, k):
+    sketch = KLLSketch(k=k)
+    lo = hi = None
+    for v in _numericvalues(table, field):
+        sketch.add(v)
+        if lo is None or v < lo:
+            lo = v
+        if hi is None or v > hi:
+            hi = v
+    if lo is None:
+        return [], []
+    width = (hi - lo) / nbins
+    edges = [lo + i * width for i in xrange(nbins)] + [hi]
+    counts = [0] * nbins
+    last = nbins - 1
+    for v, w in sketch._weighted():
+        if width:
+            i = min(int((v - lo) / width), last)
+        else:
+            i = 0
+        counts[i] += w
+    return edges, counts